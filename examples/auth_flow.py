@@ -11,7 +11,8 @@ async def main():
     print("Logging in...")
     creds = await BrowserAuth.login(
         group=Group.HINATAZAKA46,
-        headless=False # Set to True for headless mode
+        headless=False, # Set to True for headless mode
+        cache_policy="enabled", # Reuse a still-valid login from the keyring
     )
 
     if creds:
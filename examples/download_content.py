@@ -1,8 +1,6 @@
 import asyncio
 from pathlib import Path
 
-import aiohttp
-
 import pyhako
 from pyhako import Client, Group
 
@@ -12,9 +10,11 @@ async def main():
     # Example token (replace with real one)
     token = "YOUR_ACCESS_TOKEN"
 
-    async with aiohttp.ClientSession() as session:
-        client = Client(Group.NOGIZAKA46, access_token=token)
+    client = Client(Group.NOGIZAKA46, access_token=token)
 
+    # Media downloads reuse pooled keep-alive connections from the shared session
+    session = await pyhako.get_session(client.api_base)
+    try:
         # Mock message object
         message = {
             "id": 12345,
@@ -30,6 +30,8 @@ async def main():
             print(f"Downloaded to: {path}")
         else:
             print("Download failed or no media.")
+    finally:
+        await pyhako.close_sessions()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,7 +1,5 @@
 import asyncio
 
-import aiohttp
-
 import pyhako
 from pyhako import BrowserAuth, Client, Group
 
@@ -15,15 +13,17 @@ async def main():
         return
 
     # 2. Initialize Client
-    async with aiohttp.ClientSession() as session:
-        client = Client(
-            group=Group.HINATAZAKA46,
-            access_token=creds['access_token'],
-            cookies=creds['cookies'],
-            app_id=creds['app_id'],
-            user_agent=creds['user_agent']
-        )
-
+    client = Client(
+        group=Group.HINATAZAKA46,
+        access_token=creds['access_token'],
+        cookies=creds['cookies'],
+        app_id=creds['app_id'],
+        user_agent=creds['user_agent']
+    )
+
+    # Shared session: connections are kept alive and reused across calls
+    session = await pyhako.get_session(client.api_base)
+    try:
         # 3. Fetch Profile
         profile = await client.get_profile(session)
         print(f"Profile: {profile}")
@@ -31,6 +31,8 @@ async def main():
         # 4. Fetch News
         news = await client.get_news(session, count=5)
         print(f"Latest News: {[n['title'] for n in news]}")
+    finally:
+        await pyhako.close_sessions()
 
 if __name__ == "__main__":
     asyncio.run(main())
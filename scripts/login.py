@@ -6,13 +6,14 @@ Usage:
     uv run python scripts/login.py --group hinatazaka46
     uv run python scripts/login.py --group sakurazaka46
     uv run python scripts/login.py --group nogizaka46
+    uv run python scripts/login.py --group hinatazaka46 sakurazaka46 nogizaka46
 """
 
 import argparse
 import asyncio
 
 from pyhako import BrowserAuth, Group
-from pyhako.credentials import TokenManager
+from pyhako.credentials import get_token_manager
 
 
 async def main() -> None:
@@ -21,15 +22,22 @@ async def main() -> None:
         "--group",
         "-g",
         type=str,
-        default="hinatazaka46",
+        nargs="+",
+        default=["hinatazaka46"],
         choices=["hinatazaka46", "sakurazaka46", "nogizaka46"],
-        help="Group to login to (default: hinatazaka46)",
+        help="Group(s) to login to; several groups log in concurrently (default: hinatazaka46)",
     )
     parser.add_argument(
         "--headless",
         action="store_true",
         help="Run browser in headless mode (not recommended for login)",
     )
+    parser.add_argument(
+        "--cache",
+        default="write_only",
+        choices=["enabled", "replay", "write_only", "disabled"],
+        help="Login cache policy: 'enabled' skips the browser while a cached token is valid (default: write_only)",
+    )
     args = parser.parse_args()
 
     group_map = {
@@ -37,34 +45,44 @@ async def main() -> None:
         "sakurazaka46": Group.SAKURAZAKA46,
         "nogizaka46": Group.NOGIZAKA46,
     }
-    group = group_map[args.group]
+    groups = [group_map[name] for name in dict.fromkeys(args.group)]
 
-    print(f"Logging in to {args.group}...")
-    print("A browser window will open. Please complete the login process.")
+    print(f"Logging in to {', '.join(g.value for g in groups)}...")
+    print("A browser window will open for each group. Please complete the login process.")
     print()
 
-    creds = await BrowserAuth.login(group, headless=args.headless)
+    # All logins share one Playwright driver, so their page loads overlap
+    try:
+        results = await asyncio.gather(
+            *(BrowserAuth.login(group, headless=args.headless, cache_policy=args.cache) for group in groups),
+            return_exceptions=True,
+        )
+    finally:
+        await BrowserAuth.close()
 
-    if creds:
+    successful = []
+    for group, creds in zip(groups, results):
         print()
-        print("Login successful!")
+        if isinstance(creds, BaseException):
+            print(f"[{group.value}] Login error: {creds}")
+            continue
+        if not creds:
+            print(f"[{group.value}] Login failed or was cancelled.")
+            continue
+
+        print(f"[{group.value}] Login successful!")
         print(f"  Access token: {creds['access_token'][:20]}...")
         print(f"  Refresh token: {creds['refresh_token'][:20] if creds.get('refresh_token') else 'N/A'}...")
+        # Cookies are needed for token refresh
+        successful.append((group.value, creds["access_token"], creds.get("refresh_token"), creds.get("cookies")))
 
-        # Store credentials using TokenManager
-        token_manager = TokenManager()
-        token_manager.store_tokens(
-            group=group,
-            access_token=creds["access_token"],
-            refresh_token=creds.get("refresh_token"),
-        )
+    if successful:
+        # One batched write once every login has finished
+        get_token_manager().save_sessions(successful)
         print()
         print("Credentials stored in system keyring.")
         print("You can now run integration tests:")
         print("  uv run pytest tests/test_integration.py -m integration -v")
-    else:
-        print("Login failed or was cancelled.")
-
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,11 +1,14 @@
-from .auth import BrowserAuth
+from typing import TYPE_CHECKING, Any
+
 from .client import Client, Group
 from .config import (
     MEDIA_DOWNLOAD_CONCURRENCY_INCREMENTAL,
     MEDIA_DOWNLOAD_CONCURRENCY_INITIAL,
+    MEDIA_DOWNLOAD_WINDOW_INITIAL,
 )
 from .credentials import get_auth_dir, get_user_data_dir
 from .exceptions import ApiError, AuthError, HakoError, RefreshFailedError, SessionExpiredError
+from .http import close_sessions, get_session
 from .logging import configure_logging
 from .manager import SyncManager
 from .utils import (
@@ -15,6 +18,9 @@ from .utils import (
     sanitize_name,
 )
 
+if TYPE_CHECKING:
+    from .auth import BrowserAuth
+
 # Logging should be configured by the application, not the library
 # configure_logging()
 
@@ -32,6 +38,9 @@ __all__ = [
     "get_user_data_dir",
     "get_auth_dir",
     "configure_logging",
+    # Shared HTTP sessions
+    "get_session",
+    "close_sessions",
     # JWT utilities
     "parse_jwt_expiry",
     "get_jwt_remaining_seconds",
@@ -39,4 +48,18 @@ __all__ = [
     # Config exports
     "MEDIA_DOWNLOAD_CONCURRENCY_INITIAL",
     "MEDIA_DOWNLOAD_CONCURRENCY_INCREMENTAL",
+    "MEDIA_DOWNLOAD_WINDOW_INITIAL",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # BrowserAuth pulls in Playwright, which is slow to import and only needed for logins
+    if name == "BrowserAuth":
+        from .auth import BrowserAuth
+
+        return BrowserAuth
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
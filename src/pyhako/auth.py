@@ -1,14 +1,208 @@
 import asyncio
+import atexit
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from collections.abc import Awaitable
+from contextlib import AsyncExitStack, suppress
+from functools import cache
 from pathlib import Path
-from typing import Any, Optional, TypedDict, Union
+from typing import Any, Callable, Optional, TypedDict, Union
 
 import structlog
+from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import async_playwright
 
 from .client import GROUP_CONFIG, Group
+from .credentials import TokenManager, get_token_manager
+from .utils import get_jwt_remaining_seconds
 
 logger = structlog.get_logger()
 
+# (user_data_dir, headless, channel, purpose); login and refresh launch Chromium with
+# different args, so "login"/"refresh" keeps them from picking up each other's browser
+PoolKey = tuple[Optional[str], bool, Optional[str], str]
+
+# Stored tokens with less validity than this are refreshed rather than reused
+MIN_REUSABLE_TOKEN_SECONDS = 300
+
+# BrowserAuth.login(cache_policy=...):
+#   enabled    - return a cached login if still valid, otherwise log in and cache the result
+#   replay     - only return a cached login; never open a browser
+#   write_only - always log in, but cache the result
+#   disabled   - no caching
+CACHE_POLICIES = ("enabled", "replay", "write_only", "disabled")
+
+# Launch configuration shared by every login (the /dev/shm flag is decided at runtime)
+_CHROMIUM_ARGS_PERSISTENT = (
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-infobars',
+    '--disable-gpu',
+    '--disable-software-rasterizer',
+)
+_CHROMIUM_ARGS_EPHEMERAL = (
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox',
+    '--disable-infobars',
+)
+_CHROMIUM_ARGS_REFRESH = (
+    '--disable-blink-features=AutomationControlled',
+    '--disable-gpu',
+)
+_DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0.0.0 Safari/537.36'
+)
+_DEFAULT_VIEWPORT = {'width': 1280, 'height': 800}
+_STEALTH_SCRIPT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
+
+# Extra flags for headless launches: skip background services, crash reporting and
+# first-run work that only slow down startup of a browser nobody looks at.
+# Playwright already runs the lightweight chrome-headless-shell build for headless=True.
+_HEADLESS_ARGS = (
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-breakpad',
+    '--disable-extensions',
+    '--mute-audio',
+    '--no-first-run',
+)
+
+# Cookies + localStorage snapshot kept next to a persistent profile. Refreshes start a
+# throwaway context from it instead of loading the whole profile directory.
+STORAGE_STATE_FILE = "state.json"
+
+# Chromium needs a reasonably sized /dev/shm; Docker's default is only 64MB
+MIN_DEV_SHM_BYTES = 64 * 1024 * 1024
+
+
+@cache
+def _shm_args() -> tuple[str, ...]:
+    """
+    Return ``--disable-dev-shm-usage`` only when /dev/shm is too small for Chromium.
+
+    The flag moves Chromium's shared memory to /tmp on disk, which is much slower
+    than the RAM-backed /dev/shm, so it is only worth it when the latter would
+    make the renderer crash.
+    """
+    try:
+        if shutil.disk_usage("/dev/shm").total >= MIN_DEV_SHM_BYTES:
+            return ()
+    except OSError:
+        # No /dev/shm (macOS, Windows): Chromium does not use it there anyway
+        return ()
+    return ('--disable-dev-shm-usage',)
+
+
+# Authorization header of the web app's API calls: "Bearer <token>" (scheme is case-insensitive)
+_BEARER_RE = re.compile(r"Bearer\s+(\S+)", re.IGNORECASE)
+
+# Requests the token capture never needs: aborting them saves bandwidth, CPU and memory
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+_BLOCKED_HOSTS = ('google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'facebook.net')
+
+
+async def _block_unneeded_requests(page: Any, block_assets: bool) -> None:
+    """
+    Abort tracker requests (and, if ``block_assets``, images/fonts/styles) on ``page``.
+
+    Assets are only blocked for headless pages; an interactive login window must stay usable.
+    """
+    async def handle_route(route: Any) -> None:
+        request = route.request
+        if (block_assets and request.resource_type in _BLOCKED_RESOURCE_TYPES) or any(
+            host in request.url for host in _BLOCKED_HOSTS
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handle_route)
+
+
+_install_lock: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = None
+
+
+def _get_install_lock() -> asyncio.Lock:
+    """Lock serializing browser installs, recreated per event loop (locks are loop-bound)."""
+    global _install_lock
+    loop = asyncio.get_running_loop()
+    if _install_lock is None or _install_lock[0] is not loop:
+        _install_lock = (loop, asyncio.Lock())
+    return _install_lock[1]
+
+
+async def _install_chromium() -> None:
+    """
+    Install Playwright's Chromium without blocking the event loop.
+
+    Runs ``python -m playwright install chromium`` as a subprocess; frozen builds
+    cannot re-invoke themselves with ``-m``, so they run the CLI in a worker thread.
+
+    Raises:
+        RuntimeError: If the installer exits with a non-zero status.
+    """
+    import sys
+
+    if getattr(sys, "frozen", False):
+        await asyncio.to_thread(_install_chromium_sync)
+        return
+
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "playwright", "install", "chromium",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        detail = stderr.decode(errors="replace").strip().splitlines()
+        raise RuntimeError(f"playwright install exited with {proc.returncode}: {detail[-1] if detail else ''}")
+
+
+def _install_chromium_sync() -> None:
+    """Run ``playwright install chromium`` in-process. Blocking; call via ``asyncio.to_thread``."""
+    import sys
+
+    from playwright.__main__ import main
+
+    # In frozen environment, calling subprocess with sys.executable fails
+    # caused by the executable trying to parse '-m' as an argument.
+    # We must call the internal CLI entry point directly.
+    old_argv = sys.argv
+    try:
+        sys.argv = ["playwright", "install", "chromium"]
+        main()
+    except SystemExit:
+        # Playwright CLI calls sys.exit(), which is expected
+        pass
+    finally:
+        sys.argv = old_argv
+
+
+def _write_private_json(path: Path, data: Any) -> None:
+    """Atomically write ``data`` as JSON to ``path``, readable by the owner only from the start."""
+    # mkstemp creates the file 0o600, so cookies are never briefly world-readable
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+class _BrowserLaunchError(Exception):
+    """No headless browser could be started for a refresh (already logged)."""
+
+
 class LoginCredentials(TypedDict):
     access_token: str
     refresh_token: Optional[str]
@@ -16,15 +210,229 @@ class LoginCredentials(TypedDict):
     app_id: str
     user_agent: str
 
+
+class _PlaywrightPool:
+    """
+    Process-wide Playwright driver plus a small LRU of launched browsers.
+
+    Starting the driver and Chromium dominates the cost of every login/refresh,
+    so both are kept warm and reused. Entries are keyed by
+    ``(user_data_dir, headless, channel, purpose)``: a persistent ``BrowserContext`` when a
+    profile directory is used, otherwise a ``Browser`` that hands out fresh
+    contexts. Only headless entries are kept; headed windows are interactive and
+    are closed as soon as the caller is done with them. Entries unused for
+    ``IDLE_TIMEOUT`` seconds are closed in the background.
+
+    Every ``acquire()`` must be paired with one ``release()`` or ``discard()``.
+    Entries still held by a caller are never closed by eviction or the idle
+    reaper, and a launch that needs a profile directory held under another key
+    waits for it to be released.
+    """
+
+    MAX_ENTRIES = 4
+    IDLE_TIMEOUT = 300.0  # seconds; far longer than any single headless login/refresh
+
+    _stack: Optional[AsyncExitStack] = None
+    _playwright: Any = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock: Optional[asyncio.Lock] = None
+    _released: Optional[asyncio.Condition] = None
+    _entries: "OrderedDict[PoolKey, Any]" = OrderedDict()
+    _last_used: dict[PoolKey, float] = {}
+    _in_use: dict[PoolKey, int] = {}  # callers holding each key, pooled or not
+    _idle_timer: Optional[asyncio.TimerHandle] = None
+    _reaper: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    async def _driver(cls) -> Any:
+        # Playwright objects are bound to the loop that started them
+        loop = asyncio.get_running_loop()
+        if cls._playwright is None or cls._loop is not loop:
+            cls.reset()
+            stack = AsyncExitStack()
+            cls._playwright = await stack.enter_async_context(async_playwright())
+            cls._stack = stack
+            cls._loop = loop
+            cls._lock = asyncio.Lock()
+            cls._released = asyncio.Condition(cls._lock)
+        return cls._playwright
+
+    @classmethod
+    async def acquire(cls, key: PoolKey, launch: Callable[[Any], Awaitable[Any]]) -> Any:
+        """Return the browser/context for ``key``, launching it via ``launch(playwright)`` on a miss."""
+        playwright = await cls._driver()
+        assert cls._released is not None
+        async with cls._released:
+            while True:
+                target = cls._entries.get(key)
+                if target is not None:
+                    cls._entries.move_to_end(key)
+                    cls._touch(key)
+                    cls._in_use[key] = cls._in_use.get(key, 0) + 1
+                    return target
+
+                # Chromium locks its profile directory, so only one entry may own it;
+                # wait for a caller still driving it under another key to let go
+                if key[0] is None or not any(k[0] == key[0] for k in cls._in_use):
+                    break
+                await cls._released.wait()
+
+            if key[0] is not None:
+                for other in [k for k in cls._entries if k[0] == key[0]]:
+                    cls._last_used.pop(other, None)
+                    await cls._close(cls._entries.pop(other))
+
+            target = await launch(playwright)
+            cls._in_use[key] = cls._in_use.get(key, 0) + 1
+            if key[1]:
+                cls._entries[key] = target
+                cls._touch(key)
+                # Least recently used first, skipping entries a caller still holds
+                for evicted_key in [k for k in cls._entries if k not in cls._in_use]:
+                    if len(cls._entries) <= cls.MAX_ENTRIES:
+                        break
+                    cls._last_used.pop(evicted_key, None)
+                    await cls._close(cls._entries.pop(evicted_key))
+            return target
+
+    @classmethod
+    async def release(cls, key: PoolKey, target: Any) -> None:
+        """Hand ``target`` back; anything that is not pooled (headed windows) is closed."""
+        if cls._entries.get(key) is not target:
+            await cls._close(target)
+        else:
+            cls._touch(key)
+        await cls._drop_holder(key)
+        cls._schedule_idle_check()
+
+    @classmethod
+    async def discard(cls, key: PoolKey, target: Any) -> None:
+        """Drop ``target`` from the pool (e.g. after the browser crashed) and close it.
+
+        Other callers still holding it close it when they release it.
+        """
+        if cls._entries.get(key) is target:
+            del cls._entries[key]
+            cls._last_used.pop(key, None)
+        if cls._in_use.get(key, 0) <= 1:
+            await cls._close(target)
+        await cls._drop_holder(key)
+
+    @classmethod
+    async def _drop_holder(cls, key: PoolKey) -> None:
+        count = cls._in_use.get(key, 0) - 1
+        if count > 0:
+            cls._in_use[key] = count
+            return
+        cls._in_use.pop(key, None)
+        if key[0] is not None and cls._released is not None:
+            # Wake launches waiting for this profile directory
+            async with cls._released:
+                cls._released.notify_all()
+
+    @classmethod
+    async def evict_idle(cls) -> None:
+        """Close every entry that has not been used for ``IDLE_TIMEOUT`` seconds."""
+        if cls._lock is None or cls._loop is None:
+            return
+        async with cls._lock:
+            now = cls._loop.time()
+            idle = [k for k, t in cls._last_used.items() if now - t >= cls.IDLE_TIMEOUT and k not in cls._in_use]
+            for key in idle:
+                del cls._last_used[key]
+                target = cls._entries.pop(key, None)
+                if target is not None:
+                    logger.debug("Closing idle pooled browser", user_data_dir=key[0])
+                    await cls._close(target)
+        cls._schedule_idle_check()
+
+    @classmethod
+    def _touch(cls, key: PoolKey) -> None:
+        assert cls._loop is not None
+        cls._last_used[key] = cls._loop.time()
+
+    @classmethod
+    def _schedule_idle_check(cls) -> None:
+        # One timer at a time, due when the least recently used free entry goes idle;
+        # held entries are re-checked once released
+        free = [t for k, t in cls._last_used.items() if k not in cls._in_use]
+        if cls._idle_timer is not None or not free or cls._loop is None:
+            return
+        delay = min(free) + cls.IDLE_TIMEOUT - cls._loop.time()
+        cls._idle_timer = cls._loop.call_later(max(0.0, delay), cls._on_idle_timer)
+
+    @classmethod
+    def _on_idle_timer(cls) -> None:
+        cls._idle_timer = None
+        if cls._loop is not None:
+            cls._reaper = cls._loop.create_task(cls.evict_idle())
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close every pooled browser and stop the driver."""
+        if cls._idle_timer is not None:
+            cls._idle_timer.cancel()
+        while cls._entries:
+            _, target = cls._entries.popitem()
+            await cls._close(target)
+        if cls._stack is not None:
+            try:
+                await cls._stack.aclose()
+            except Exception as e:
+                logger.debug("Playwright shutdown error (non-fatal)", error=str(e))
+        cls.reset()
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget all state without closing it (used when the owning loop is gone)."""
+        if cls._idle_timer is not None:
+            cls._idle_timer.cancel()
+        cls._entries = OrderedDict()
+        cls._last_used = {}
+        cls._in_use = {}
+        cls._idle_timer = None
+        cls._reaper = None
+        cls._stack = None
+        cls._playwright = None
+        cls._loop = None
+        cls._lock = None
+        cls._released = None
+
+    @staticmethod
+    async def _close(target: Any) -> None:
+        try:
+            await target.close()
+        except Exception as e:
+            logger.debug("Browser close error (non-fatal)", error=str(e))
+
+    @classmethod
+    def _shutdown_at_exit(cls) -> None:
+        loop = cls._loop
+        if loop is None or loop.is_closed() or loop.is_running():
+            return
+        try:
+            loop.run_until_complete(cls.shutdown())
+        except Exception:
+            pass
+
+
+atexit.register(_PlaywrightPool._shutdown_at_exit)
+
+
 class BrowserAuth:
     """Handles browser-based authentication for Sakamichi Groups Message."""
 
+    # In-process results of refresh_token_headless, keyed by (group, resolved auth_dir)
+    _refresh_cache: dict[tuple[Group, str], LoginCredentials] = {}
+
     @staticmethod
     async def login(
         group: Union[Group, str],
         headless: bool = False,
         user_data_dir: Optional[str] = None,
-        channel: Optional[str] = None
+        channel: Optional[str] = None,
+        cache_policy: str = "disabled",
+        force_fresh: bool = False,
     ) -> Optional[LoginCredentials]:
         """
         Launches browser for login and captures tokens.
@@ -34,12 +442,18 @@ class BrowserAuth:
             headless: Whether to run browser in headless mode.
             user_data_dir: Path to directory for persistent browser session.
             channel: Browser channel (e.g. 'chrome', 'msedge').
+            cache_policy: One of ``CACHE_POLICIES``. With ``"enabled"``, a previous login for the
+                same group/profile/channel whose token is still valid is returned from the keyring
+                without opening a browser. Defaults to ``"disabled"`` (always log in).
+            force_fresh: Clear the service domain's localStorage/sessionStorage before logging in.
+                Always done for a persistent ``user_data_dir``; a fresh context has nothing to clear,
+                so it is skipped there unless requested.
 
         Returns:
             Dictionary containing access token and cookies, or None if failed.
 
         Raises:
-            ValueError: If invalid group provided.
+            ValueError: If invalid group or cache policy provided.
         """
         if isinstance(group, str):
             try:
@@ -48,297 +462,511 @@ class BrowserAuth:
                 raise ValueError(
                     f"Invalid group: {group}. Must be one of {[g.value for g in Group]}"
                 ) from err
+        if cache_policy not in CACHE_POLICIES:
+            raise ValueError(f"Invalid cache_policy: {cache_policy}. Must be one of {list(CACHE_POLICIES)}")
+
+        cache_key = BrowserAuth._cache_key(group, user_data_dir, channel)
+        if cache_policy in ("enabled", "replay"):
+            cached = BrowserAuth._load_cached_login(cache_key)
+            if cached:
+                logger.info("Reusing cached login", group=group.value)
+                return cached
+            if cache_policy == "replay":
+                logger.info("No valid cached login to replay", group=group.value)
+                return None
 
         config = GROUP_CONFIG[group]
         target_url = config["auth_url"]
-        api_host = config["api_base"].replace("https://", "").split("/")[0]
+        # Most responses are page assets; reject them with a single prefix check
+        api_prefix = f"https://{config['api_host']}/"
 
-        async with async_playwright() as p:
-            logger.info(f"Launching browser for {group.value} login...")
+        logger.info("Launching browser for login", group=group.value)
 
-            if user_data_dir:
-                user_data_path = Path(user_data_dir).absolute()
-                user_data_path.mkdir(parents=True, exist_ok=True)
+        user_data_path = Path(user_data_dir).absolute() if user_data_dir else None
+        key: PoolKey = (str(user_data_path) if user_data_path else None, headless, channel, "login")
 
-                context = await p.chromium.launch_persistent_context(
+        headless_args = _HEADLESS_ARGS if headless else ()
+
+        async def launch(p: Any) -> Any:
+            if user_data_path:
+                user_data_path.mkdir(parents=True, exist_ok=True)
+                persistent = await p.chromium.launch_persistent_context(
                     user_data_dir=user_data_path,
                     headless=headless,
                     channel=channel,
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-infobars',
-                        '--disable-gpu',
-                        '--disable-dev-shm-usage',
-                        '--disable-software-rasterizer',
-                    ],
-                    viewport={'width': 1280, 'height': 800},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                    args=[*_CHROMIUM_ARGS_PERSISTENT, *_shm_args(), *headless_args],
+                    viewport=_DEFAULT_VIEWPORT,
+                    user_agent=_DEFAULT_USER_AGENT,
                 )
-                page = context.pages[0] if context.pages else await context.new_page()
+                # Once per context: it outlives this call when pooled
+                await persistent.add_init_script(_STEALTH_SCRIPT)
+                return persistent
+            return await p.chromium.launch(
+                headless=headless,
+                channel=channel,
+                args=[*_CHROMIUM_ARGS_EPHEMERAL, *headless_args],
+            )
+
+        target = await _PlaywrightPool.acquire(key, launch)
+        try:
+            if user_data_path:
+                context = target
+                # A pooled context may serve concurrent logins, so each gets its own page;
+                # an unpooled (headed) window reuses the tab it opened with
+                page = context.pages[0] if not headless and context.pages else await context.new_page()
             else:
-                browser = await p.chromium.launch(
-                    headless=headless,
-                    channel=channel,
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--no-sandbox',
-                        '--disable-infobars',
-                    ]
-                )
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    viewport={'width': 1280, 'height': 800}
+                # Fresh context per login so sessions never leak between calls
+                context = await target.new_context(
+                    user_agent=_DEFAULT_USER_AGENT,
+                    viewport=_DEFAULT_VIEWPORT,
                 )
+                await context.add_init_script(_STEALTH_SCRIPT)
                 page = await context.new_page()
+        except Exception:
+            # A pooled browser may have died since it was last used
+            await _PlaywrightPool.discard(key, target)
+            raise
 
-            # Stealth script
-            await context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined});")
+        # Token capture container
+        captured_data: dict[str, Any] = {}
+        token_event = asyncio.Event()
+
+        async def handle_response(response):
+            if token_event.is_set(): return
+
+            request = response.request
+            if request.url.startswith(api_prefix) and response.status == 200:
+                # Case-insensitive lookups on the actual sent headers (one driver call per request)
+                auth = await request.header_value('authorization')
+                match = _BEARER_RE.match(auth) if auth else None
+                if not match: return
+
+                token = match.group(1)
+                app_id = await request.header_value('x-talk-app-id')
+                user_agent = await request.header_value('user-agent')
+                if token_event.is_set(): return  # another response won while we awaited
+
+                captured_data['access_token'] = token
+                captured_data['x-talk-app-id'] = app_id
+                captured_data['user-agent'] = user_agent
+
+                token_event.set()
+                # Nothing left to capture; stop paying for every remaining response
+                page.remove_listener("response", handle_response)
+
+        page.on("response", handle_response)
+        await _block_unneeded_requests(page, block_assets=headless)
+
+        try:
+            # DESIGN DECISION: Trust the persistent browser context for OAuth session management.
+            #
+            # Previous implementation tried to selectively clear cookies, but this caused issues:
+            # - Google cookies may be set on regional domains (e.g., .google.com.tw)
+            # - Selective clearing can miss edge cases and break OAuth session persistence
+            # - OAuth providers (Google/Apple/LINE) manage their own session state
+            #
+            # Industry best practice: Don't interfere with OAuth provider cookies.
+            # The persistent context (user_data_dir) preserves all browser state including:
+            # - OAuth session cookies (Google SID, HSID, Apple auth, LINE session)
+            # - Account chooser state (allows "select account" instead of re-login)
+            #
+            # We only clear the SERVICE domain's localStorage/sessionStorage to ensure
+            # the web app starts fresh without stale application state. A brand-new
+            # context has no such state, so the extra navigation is skipped there.
+
+            if force_fresh or user_data_path:
+                # Best effort with a tight bound: only browser-side failures (timeouts, redirects
+                # destroying the page) are skipped; anything else surfaces below
+                try:
+                    await page.goto(target_url, wait_until="commit", timeout=2000)
+                    await page.evaluate("window.localStorage.clear(); window.sessionStorage.clear();")
+                    logger.debug("Service domain localStorage/sessionStorage cleared")
+                except PlaywrightError as clear_err:
+                    logger.debug("Storage clear skipped (non-fatal)", error=str(clear_err))
+
+            # The response handler captures the token on its own; don't wait for trackers/images
+            await page.goto(target_url, wait_until="domcontentloaded", timeout=60000)
+            logger.debug("Navigated to auth URL", url=target_url)
+        except Exception as e:
+            logger.warning("Navigation error (ignoring)", error=str(e))
+
+        try:
+            # Wait for token capture (timeout 5 mins for interactive, 30s for headless/cached)
+            timeout = 300 if not headless else 45
+            await asyncio.wait_for(token_event.wait(), timeout=timeout)
+            # Capture domain-specific cookies (Web Session) for token refresh.
+            # Scoping by URL lets the browser filter out Google/Analytics cookies for us.
+            cookies_list = await context.cookies(urls=[target_url, config["api_base"]])
+            relevant_cookies = {c['name']: c['value'] for c in cookies_list}
+
+            captured_data['cookies'] = relevant_cookies
+            logger.debug("Captured session cookies", count=len(relevant_cookies))
+
+            if user_data_path:
+                await BrowserAuth._save_storage_state(context, user_data_path)
+
+            creds: LoginCredentials = {
+                "access_token": captured_data['access_token'],
+                "refresh_token": None,
+                "cookies": captured_data['cookies'],
+                "app_id": captured_data.get('x-talk-app-id', ''),
+                "user_agent": captured_data.get('user-agent', '')
+            }
+            if cache_policy in ("enabled", "write_only"):
+                BrowserAuth._store_cached_login(cache_key, creds)
+            return creds
+
+        except asyncio.TimeoutError:
+            logger.error("Login timed out.")
+        except Exception as e:
+            logger.error("Login error", error=str(e))
+        finally:
+            # One close per login: an ephemeral context takes its page down with it,
+            # while a persistent context outlives the call and only drops the page
+            with suppress(Exception):
+                if user_data_path:
+                    await page.close()
+                else:
+                    await context.close()
+            await _PlaywrightPool.release(key, target)
 
-            # Token capture container
-            captured_data: dict[str, Any] = {}
-            token_future: asyncio.Future[None] = asyncio.Future()
+        return None
 
-            async def handle_response(response):
-                if token_future.done(): return
+    @staticmethod
+    def _cache_key(group: Group, user_data_dir: Optional[str], channel: Optional[str]) -> str:
+        """Keyring entry name for a cached login of this group/profile/channel."""
+        profile = str(Path(user_data_dir).absolute()) if user_data_dir else ""
+        digest = hashlib.sha256(f"{group.value}|{profile}|{channel or ''}".encode()).hexdigest()
+        return f"login-{digest}"
 
-                request = response.request
-                if api_host in request.url and response.status == 200:
-                    headers = request.headers
-                    auth = headers.get('authorization') or headers.get('Authorization')
+    @staticmethod
+    def _load_cached_login(cache_key: str) -> Optional[LoginCredentials]:
+        """Return a cached login whose access token is still comfortably valid."""
+        try:
+            cached = get_token_manager().store.load(cache_key)
+        except Exception as e:
+            logger.debug("Login cache unavailable (non-fatal)", error=str(e))
+            return None
 
-                    if auth and 'Bearer' in auth:
-                        token = auth.split('Bearer ')[1]
-                        if token:
-                            captured_data['access_token'] = token
-                            captured_data['x-talk-app-id'] = headers.get('x-talk-app-id') or headers.get('X-Talk-App-ID')
-                            captured_data['user-agent'] = headers.get('user-agent') or headers.get('User-Agent')
+        if not cached or not cached.get('access_token'):
+            return None
+        remaining = get_jwt_remaining_seconds(cached['access_token'])
+        if remaining is None or remaining <= MIN_REUSABLE_TOKEN_SECONDS:
+            return None
 
+        return {
+            "access_token": cached['access_token'],
+            "refresh_token": cached.get('refresh_token'),
+            "cookies": cached.get('cookies') or {},
+            "app_id": cached.get('app_id', ''),
+            "user_agent": cached.get('user_agent', ''),
+        }
 
-                            if not token_future.done():
-                                token_future.set_result(True)
+    @staticmethod
+    def _store_cached_login(cache_key: str, creds: LoginCredentials) -> None:
+        try:
+            get_token_manager().store.save(cache_key, dict(creds))
+        except Exception as e:
+            logger.warning("Failed to cache login (non-fatal)", error=str(e))
 
-            page.on("response", handle_response)
+    @staticmethod
+    async def _save_storage_state(context: Any, profile_dir: Path) -> None:
+        """Snapshot the context's cookies/localStorage to ``STORAGE_STATE_FILE`` (owner-only)."""
+        try:
+            state = await context.storage_state()
+            await asyncio.to_thread(_write_private_json, profile_dir / STORAGE_STATE_FILE, state)
+        except Exception as e:
+            logger.debug("Could not save storage state (non-fatal)", error=str(e))
 
-            try:
-                # DESIGN DECISION: Trust the persistent browser context for OAuth session management.
-                #
-                # Previous implementation tried to selectively clear cookies, but this caused issues:
-                # - Google cookies may be set on regional domains (e.g., .google.com.tw)
-                # - Selective clearing can miss edge cases and break OAuth session persistence
-                # - OAuth providers (Google/Apple/LINE) manage their own session state
-                #
-                # Industry best practice: Don't interfere with OAuth provider cookies.
-                # The persistent context (user_data_dir) preserves all browser state including:
-                # - OAuth session cookies (Google SID, HSID, Apple auth, LINE session)
-                # - Account chooser state (allows "select account" instead of re-login)
-                #
-                # We only clear the SERVICE domain's localStorage/sessionStorage to ensure
-                # the web app starts fresh without stale application state.
+    @staticmethod
+    def _load_reusable_session(
+        group: Group,
+        token_manager: TokenManager,
+        stale_token: Optional[str],
+    ) -> Optional[LoginCredentials]:
+        """Return stored credentials whose access token is still comfortably valid."""
+        try:
+            # Skip the in-process cache: another process may have refreshed the token already
+            session = token_manager.load_session(group.value, fresh=True)
+        except Exception as e:
+            logger.debug("Could not read stored session (non-fatal)", error=str(e))
+            return None
 
-                try:
-                    await page.goto(target_url, wait_until="commit", timeout=5000)
-                    await page.evaluate("window.localStorage.clear(); window.sessionStorage.clear();")
-                    logger.debug("Service domain localStorage/sessionStorage cleared")
-                except Exception as clear_err:
-                    logger.debug(f"Storage clear attempt (non-fatal): {clear_err}")
+        token = session.get('access_token') if session else None
+        if not token or token == stale_token:
+            return None
 
-                await page.goto(target_url, timeout=60000)
-                logger.debug(f"Navigated to auth URL: {target_url}")
-            except Exception as e:
-                logger.warning(f"Navigation error (ignoring): {e}")
+        remaining = get_jwt_remaining_seconds(token)
+        if remaining is None or remaining <= MIN_REUSABLE_TOKEN_SECONDS:
+            return None
 
-            try:
-                # Wait for token capture (timeout 5 mins for interactive, 30s for headless/cached)
-                timeout = 300 if not headless else 45
-                await asyncio.wait_for(token_future, timeout=timeout)
-                # Capture domain-specific cookies (Web Session) for token refresh
-                cookies_list = await context.cookies()
-                target_domain = group.value  # e.g. 'hinatazaka46', 'nogizaka46'
-                # Filter to keep only cookies relevant to the service (ignore Google/Analytics)
-                relevant_cookies = {}
-
-                logger.debug("--- Capturing Cookies ---")
-                for c in cookies_list:
-                    if c['name'] == 'session':
-                        logger.debug("Found session cookie", domain=c.get('domain'), path=c.get('path'))
-
-                    if target_domain in c.get('domain', ''):
-                        relevant_cookies[c['name']] = c['value']
-
-                captured_data['cookies'] = relevant_cookies
-                logger.debug(f"Captured {len(relevant_cookies)} session cookies.")
-
-                logger.info("Closing browser...")
-                await page.close()
-                await context.close()
-                if not user_data_dir:
-                    await browser.close()
-
-                return {
-                    "access_token": captured_data['access_token'],
-                    "refresh_token": None,
-                    "cookies": captured_data['cookies'],
-                    "app_id": captured_data.get('x-talk-app-id', ''),
-                    "user_agent": captured_data.get('user-agent', '')
-                }
+        return {
+            "access_token": token,
+            "refresh_token": session.get('refresh_token'),
+            "cookies": session.get('cookies') or {},
+            "app_id": "",
+            "user_agent": "",
+        }
 
-            except asyncio.TimeoutError:
-                logger.error("Login timed out.")
-            except Exception as e:
-                logger.error(f"Login error: {e}")
-            finally:
-                try:
-                    if user_data_dir:
-                        await context.close()
-                    else:
-                        await browser.close()
-                except Exception:
-                    pass
+    @staticmethod
+    def invalidate_refresh(group: Group, auth_dir: Union[str, Path]) -> None:
+        """
+        Forget the token ``refresh_token_headless`` last obtained for ``group``/``auth_dir``.
 
-            return None
+        Call this when the API rejects that token (e.g. HTTP 401) so the next refresh
+        launches the browser instead of returning it again.
+        """
+        BrowserAuth._refresh_cache.pop((group, str(Path(auth_dir).resolve())), None)
+
+    @staticmethod
+    async def close() -> None:
+        """
+        Shut down the shared Playwright driver and any browsers kept warm between calls.
+
+        Optional: pooled browsers are also closed at interpreter exit.
+        """
+        await _PlaywrightPool.shutdown()
 
     @staticmethod
     async def refresh_token_headless(
         group: Group,
         auth_dir: Union[str, Path],
-        auto_install: bool = True
+        auto_install: bool = True,
+        token_manager: Optional[TokenManager] = None,
+        stale_token: Optional[str] = None,
     ) -> Optional[LoginCredentials]:
         """
         Refreshes access token via headless browser using persistent context.
 
+        When ``auth_dir`` holds a ``STORAGE_STATE_FILE`` snapshot (written after each
+        successful login/refresh), a throwaway context is started from it instead of
+        loading the full profile. The profile itself is used when no snapshot exists, or
+        once as a retry when the snapshot fails, which then deletes the stale snapshot.
+
+        If ``token_manager`` holds a token for the group that is still valid for more than
+        ``MIN_REUSABLE_TOKEN_SECONDS`` (e.g. another process refreshed it meanwhile), it is
+        returned directly without launching a browser. Likewise, a token this process already
+        refreshed for the same ``group``/``auth_dir`` is reused while it stays valid for that
+        long (see ``invalidate_refresh()``).
+
         Args:
             group: Target group for authentication.
-            auth_dir: Path to persistent browser context directory.
+            auth_dir: Path to persistent browser context directory (and its storage_state snapshot).
             auto_install: If True, automatically install Playwright chromium if missing.
+            token_manager: Optional credential store to check for a still-valid token first.
+            stale_token: Token known to be rejected by the API; never reused from storage.
         """
+        if token_manager is not None:
+            cached = BrowserAuth._load_reusable_session(group, token_manager, stale_token)
+            if cached:
+                logger.info("Stored token still valid, skipping headless refresh")
+                return cached
+
         auth_dir = Path(auth_dir)
         if not auth_dir.exists():
-            logger.error(f"Auth directory {auth_dir} does not exist.")
+            logger.error("Auth directory does not exist", auth_dir=str(auth_dir))
+            return None
+
+        cache_key = (group, str(auth_dir.resolve()))
+        recent = BrowserAuth._refresh_cache.get(cache_key)
+        if recent and recent['access_token'] != stale_token:
+            remaining = get_jwt_remaining_seconds(recent['access_token'])
+            if remaining is not None and remaining > MIN_REUSABLE_TOKEN_SECONDS:
+                logger.info("Recently refreshed token still valid, skipping headless refresh")
+                return recent.copy()
+
+        state_path = auth_dir / STORAGE_STATE_FILE
+        creds: Optional[LoginCredentials] = None
+        try:
+            if state_path.is_file():
+                creds = await BrowserAuth._refresh_in_browser(group, auth_dir, True, auto_install)
+                if creds is None:
+                    # A stale snapshot would fail every later refresh too: drop it and let the
+                    # profile-backed retry write a fresh one
+                    logger.info("Storage state refresh failed, retrying with the browser profile")
+                    with suppress(OSError):
+                        state_path.unlink()
+            if creds is None:
+                creds = await BrowserAuth._refresh_in_browser(group, auth_dir, False, auto_install)
+        except _BrowserLaunchError:
             return None
+        if creds is None:
+            return None
+
+        BrowserAuth._refresh_cache[cache_key] = creds
+        return creds.copy()
+
+    @staticmethod
+    async def _refresh_in_browser(
+        group: Group,
+        auth_dir: Path,
+        use_state: bool,
+        auto_install: bool,
+    ) -> Optional[LoginCredentials]:
+        """
+        One headless refresh attempt, from the storage_state snapshot or the persistent profile.
 
+        Returns None when the page never produced a token; raises ``_BrowserLaunchError``
+        when no browser could be started at all, since retrying would not help.
+        """
         # Extract config
         config = GROUP_CONFIG[group]
-        api_host = config["api_base"]
+        api_base = config["api_base"]
         auth_url = config["auth_url"]
+        api_prefix = f"https://{config['api_host']}/"
 
         captured_data: dict[str, Any] = {}
-        token_future: asyncio.Future[None] = asyncio.Future()
-
-        async with async_playwright() as p:
-            try:
-                # Launch persistent context
-                context = await p.chromium.launch_persistent_context(
-                    user_data_dir=str(auth_dir),
-                    headless=True,
-                    args=["--disable-blink-features=AutomationControlled"]
-                )
-            except Exception as e:
-                if "Executable doesn't exist" in str(e) and auto_install:
-                    # UX: Explain why we are downloading
-                    logger.info("Downloading headless browser for auto-refresh (One-time setup)...")
-                    # Force Playwright to look in global cache, not frozen bundle
-                    import os
-                    os.environ["PLAYWRIGHT_BROWSERS_PATH"] = "0"
+        token_event = asyncio.Event()
+
+        launch_args = [*_CHROMIUM_ARGS_REFRESH, *_shm_args(), *_HEADLESS_ARGS]
+
+        # The storage_state snapshot starts a fresh context in a plain browser, much
+        # faster than loading the full profile
+        state_path = auth_dir / STORAGE_STATE_FILE
+        key: PoolKey = (None if use_state else str(auth_dir.absolute()), True, None, "refresh")
+
+        async def launch(p: Any) -> Any:
+            if use_state:
+                return await p.chromium.launch(headless=True, args=launch_args)
+            return await p.chromium.launch_persistent_context(
+                user_data_dir=str(auth_dir),
+                headless=True,
+                args=launch_args,
+            )
+
+        async def open_page(target: Any) -> tuple[Any, Any]:
+            if use_state:
+                context = await target.new_context(storage_state=str(state_path))
+                return context, await context.new_page()
+            # Own page per call: concurrent refreshes may share the pooled context
+            return target, await target.new_page()
+
+        try:
+            # Launch (or reuse) the browser / persistent context
+            target = await _PlaywrightPool.acquire(key, launch)
+        except Exception as e:
+            if "Executable doesn't exist" in str(e) and auto_install:
+                # UX: Explain why we are downloading
+                logger.info("Downloading headless browser for auto-refresh (One-time setup)...")
+                # Force Playwright to look in global cache, not frozen bundle
+                os.environ["PLAYWRIGHT_BROWSERS_PATH"] = "0"
 
+                try:
                     try:
-                        import sys
-
-                        from playwright.__main__ import main
-
-                        # In frozen environment, calling subprocess with sys.executable fails
-                        # caused by the executable trying to parse '-m' as an argument.
-                        # We must call the internal CLI entry point directly.
-                        old_argv = sys.argv
-                        try:
-                            sys.argv = ["playwright", "install", "chromium"]
-                            main()
-                        except SystemExit:
-                            # Playwright CLI calls sys.exit(), which is expected
-                            pass
-                        except Exception as inner_e:
-                            logger.error(f"Failed to install Playwright browser: {inner_e}")
-                            return None
-                        finally:
-                            sys.argv = old_argv
-                        logger.info("Playwright chromium installed successfully. Retrying...")
-
-                        # Retry launch after installation
-                        context = await p.chromium.launch_persistent_context(
-                            user_data_dir=str(auth_dir),
-                            headless=True,
-                            args=["--disable-blink-features=AutomationControlled"]
-                        )
-                    except Exception as install_error:
-                        logger.error(f"Failed to auto-install Playwright browser: {install_error}")
-                        return None
-                else:
-                    logger.error(f"Failed to launch headless browser: {e}")
-                    return None
+                        # One installer at a time, never blocking the event loop
+                        async with _get_install_lock():
+                            await _install_chromium()
+                    except Exception as inner_e:
+                        logger.error("Failed to install Playwright browser", error=str(inner_e))
+                        raise _BrowserLaunchError from inner_e
+                    logger.info("Playwright chromium installed successfully. Retrying...")
+
+                    # Retry launch after installation
+                    target = await _PlaywrightPool.acquire(key, launch)
+                except _BrowserLaunchError:
+                    raise
+                except Exception as install_error:
+                    logger.error("Failed to auto-install Playwright browser", error=str(install_error))
+                    raise _BrowserLaunchError from install_error
+            else:
+                logger.error("Failed to launch headless browser", error=str(e))
+                raise _BrowserLaunchError from e
 
+        context = None
+        page = None
+        try:
             try:
-                page = context.pages[0] if context.pages else await context.new_page()
+                context, page = await open_page(target)
+            except Exception:
+                # A pooled browser/context may have died since it was last used
+                await _PlaywrightPool.discard(key, target)
+                target = None
+                target = await _PlaywrightPool.acquire(key, launch)
+                context, page = await open_page(target)
+
+            # NOTE: Do NOT clear cookies or localStorage here!
+            # The headless refresh relies on the existing browser session state
+            # (service cookies + localStorage token) to load the web app.
+            # The web app will then make API calls with the token, which we capture.
+            # Clearing state would break the session and show login page instead.
 
-                # NOTE: Do NOT clear cookies or localStorage here!
-                # The headless refresh relies on the existing browser session state
-                # (service cookies + localStorage token) to load the web app.
-                # The web app will then make API calls with the token, which we capture.
-                # Clearing state would break the session and show login page instead.
-
-                async def handle_response(response):
-                    if token_future.done(): return
-
-                    # Match API host (robust check)
-                    if api_host.replace("https://", "").split("/")[0] in response.request.url and response.status == 200:
-                        headers = response.request.headers
-                        auth = headers.get('authorization') or headers.get('Authorization')
-                        if auth and 'Bearer' in auth:
-                            token = auth.split('Bearer ')[1]
-                            captured_data['access_token'] = token
-                            captured_data['x-talk-app-id'] = headers.get('x-talk-app-id') or headers.get('X-Talk-App-ID')
-                            captured_data['user-agent'] = headers.get('user-agent') or headers.get('User-Agent')
+            async def handle_response(response):
+                if token_event.is_set(): return
 
-                            logger.debug(
-                                "Headless refresh captured token",
-                                capture_url=str(response.request.url),
-                            )
+                # Match API host; most responses are page assets and exit here
+                request = response.request
+                if request.url.startswith(api_prefix) and response.status == 200:
+                    auth = await request.header_value('authorization')
+                    match = _BEARER_RE.match(auth) if auth else None
+                    if not match: return
 
-                            if not token_future.done():
-                                token_future.set_result(True)
+                    token = match.group(1)
+                    app_id = await request.header_value('x-talk-app-id')
+                    user_agent = await request.header_value('user-agent')
+                    if token_event.is_set(): return  # another response won while we awaited
 
-                page.on("response", handle_response)
+                    captured_data['access_token'] = token
+                    captured_data['x-talk-app-id'] = app_id
+                    captured_data['user-agent'] = user_agent
 
-                logger.info(f"Navigating to {auth_url} for silent refresh...")
-                await page.goto(auth_url, timeout=45000, wait_until="networkidle")
+                    logger.debug(
+                        "Headless refresh captured token",
+                        capture_url=str(request.url),
+                    )
 
-                try:
-                    await asyncio.wait_for(token_future, timeout=45)
-                except asyncio.TimeoutError:
-                    logger.warning("Headless refresh timed out.")
-                    return None
-
-                # Capture updated cookies
-                cookies_list = await context.cookies()
-                target_domain = group.value
-                relevant_cookies = {}
-                for c in cookies_list:
-                   if target_domain in c.get('domain', ''):
-                        relevant_cookies[c['name']] = c['value']
-
-                return {
-                    "access_token": captured_data['access_token'],
-                    "refresh_token": None,
-                    "cookies": relevant_cookies,
-                    "app_id": captured_data.get('x-talk-app-id', ''),
-                    "user_agent": captured_data.get('user-agent', '')
-                }
+                    token_event.set()
+                    page.remove_listener("response", handle_response)
 
-            except Exception as e:
-                logger.error(f"Headless refresh failed: {e}")
+            page.on("response", handle_response)
+            await _block_unneeded_requests(page, block_assets=True)
+
+            logger.info("Navigating for silent refresh", url=auth_url)
+            # Race the navigation against the token capture: the first authenticated API call
+            # is all we need, and it can land before goto() itself returns
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 45
+            goto_task = asyncio.ensure_future(page.goto(auth_url, timeout=45000, wait_until="commit"))
+            token_wait = asyncio.ensure_future(token_event.wait())
+            try:
+                await asyncio.wait({goto_task, token_wait}, timeout=45, return_when=asyncio.FIRST_COMPLETED)
+                if not token_event.is_set():
+                    if goto_task.done():
+                        goto_task.result()  # navigation failed outright: don't sit out the timeout
+                    await asyncio.wait_for(token_event.wait(), timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                logger.warning("Headless refresh timed out.")
                 return None
             finally:
-                try:
-                    await context.close()
-                except Exception:
-                    pass
+                token_wait.cancel()
+                if not goto_task.done():
+                    goto_task.cancel()
+                elif not goto_task.cancelled():
+                    goto_task.exception()  # retrieved; a late navigation error is irrelevant once we have the token
+
+            # Capture updated cookies
+            cookies_list = await context.cookies(urls=[auth_url, api_base])
+            relevant_cookies = {c['name']: c['value'] for c in cookies_list}
+
+            # Keep the snapshot current (and create it after a profile-based refresh)
+            await BrowserAuth._save_storage_state(context, auth_dir)
+
+            return {
+                "access_token": captured_data['access_token'],
+                "refresh_token": None,
+                "cookies": relevant_cookies,
+                "app_id": captured_data.get('x-talk-app-id', ''),
+                "user_agent": captured_data.get('user-agent', '')
+            }
+
+        except Exception as e:
+            logger.error("Headless refresh failed", error=str(e))
+            return None
+        finally:
+            # Keep the browser warm for the next refresh; pages and state contexts are per-call
+            with suppress(Exception):
+                if use_state and context is not None:
+                    await context.close()  # closes the page too
+                elif page is not None:
+                    await page.close()
+            if target is not None:
+                await _PlaywrightPool.release(key, target)
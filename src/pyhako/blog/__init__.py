@@ -15,13 +15,14 @@ Example usage:
     ...         print(entry.title)
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 import aiohttp
 
 from pyhako.client import Group
 
 from .base import BaseBlogScraper, BlogEntry, BlogGoneError, MemberInfo
+from .cache import BlogCache
 from .config import (
     DOWNLOAD_CONCURRENCY_INCREMENTAL,
     DOWNLOAD_CONCURRENCY_INITIAL,
@@ -43,6 +44,7 @@ __all__ = [
     "BlogEntry",
     "BlogGoneError",
     "BaseBlogScraper",
+    "BlogCache",
     "HinatazakaBlogScraper",
     "MemberInfo",
     "NogizakaBlogScraper",
@@ -60,7 +62,18 @@ __all__ = [
 ]
 
 
-def get_scraper(group: Group, session: aiohttp.ClientSession) -> BaseBlogScraper:
+_SCRAPERS: dict[Group, type[BaseBlogScraper]] = {
+    Group.HINATAZAKA46: HinatazakaBlogScraper,
+    Group.NOGIZAKA46: NogizakaBlogScraper,
+    Group.SAKURAZAKA46: SakurazakaBlogScraper,
+}
+
+
+def get_scraper(
+    group: Group,
+    session: Optional[aiohttp.ClientSession] = None,
+    cache: Optional[BlogCache] = None,
+) -> BaseBlogScraper:
     """Get the appropriate blog scraper for a group.
 
     Factory function that returns the correct scraper implementation
@@ -68,7 +81,9 @@ def get_scraper(group: Group, session: aiohttp.ClientSession) -> BaseBlogScraper
 
     Args:
         group: The target Sakamichi group.
-        session: An active aiohttp ClientSession for making requests.
+        session: An active aiohttp ClientSession for making requests. If omitted,
+            the scraper opens its own and must be closed with ``await scraper.close()``.
+        cache: Optional ``BlogCache`` to reuse member lists and skip already seen blogs across runs.
 
     Returns:
         A BaseBlogScraper subclass instance for the specified group.
@@ -80,11 +95,8 @@ def get_scraper(group: Group, session: aiohttp.ClientSession) -> BaseBlogScraper
         >>> scraper = get_scraper(Group.NOGIZAKA46, session)
         >>> members = await scraper.get_members()
     """
-    if group == Group.HINATAZAKA46:
-        return HinatazakaBlogScraper(session)
-    elif group == Group.NOGIZAKA46:
-        return NogizakaBlogScraper(session)
-    elif group == Group.SAKURAZAKA46:
-        return SakurazakaBlogScraper(session)
-    else:
-        raise ValueError(f"Unsupported group: {group}")
+    try:
+        scraper_cls = _SCRAPERS[group]
+    except KeyError:
+        raise ValueError(f"Unsupported group: {group}") from None
+    return scraper_cls(session, cache=cache)
@@ -2,12 +2,40 @@
 
 from __future__ import annotations
 
+import asyncio
+import re
+import sys
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterator
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any
 
 import aiohttp
+import structlog
+from lxml import etree
+from lxml import html as lxml_html
+
+from ..http import RateLimiter, create_connector, get_with_backoff
+from .cache import BlogCache
+from .config import DETAIL_CONCURRENCY, MAX_PAGES_SAFETY_CAP, REQUEST_RATE, RETRY_STATUSES
+
+logger = structlog.get_logger(__name__)
+
+# BeautifulSoup tree builder: libxml2-backed lxml is several times faster than the
+# pure-Python html.parser
+HTML_PARSER = "lxml"
+
+# Optional (pip install pyhako[speedups]): lexbor-backed parser for pulling image URLs
+# out of HTML fragments without building a BeautifulSoup tree
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# dataclass(slots=True) needs Python 3.10+; on 3.9 entries simply keep their __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class BlogGoneError(Exception):
@@ -33,10 +61,63 @@ class MemberInfo:
     thumbnail_url: str
 
 
-@dataclass
+# Match src="..." or href="..." with either double or single quotes
+_URL_ATTR_RE = re.compile(r'(src|href)=(["\'])([^"\']+)\2')
+
+_IMG_TAG_RE = re.compile(r"<img", re.IGNORECASE)
+
+
+def extract_img_srcs(html: str) -> list[str]:
+    """Return the non-empty ``src`` of every ``<img>`` in ``html``, in document order.
+
+    Uses selectolax when installed and falls back to BeautifulSoup otherwise.
+    """
+    # Many posts are text-only; a C-level scan is far cheaper than building a parse tree
+    if not _IMG_TAG_RE.search(html):
+        return []
+    if LexborHTMLParser is not None:
+        return [src for node in LexborHTMLParser(html).css("img") if (src := node.attributes.get("src"))]
+
+    from bs4 import BeautifulSoup
+
+    return [src for img in BeautifulSoup(html, HTML_PARSER).select("img") if (src := img.get("src"))]
+
+
+# Visible text nodes, skipping script/style bodies as BeautifulSoup's get_text() does
+_TEXT_XPATH = etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+
+
+def xpath_has_class(name: str) -> str:
+    """Return an XPath predicate matching elements whose class list contains ``name`` (CSS ``.name``)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def parse_html_tree(html: str) -> lxml_html.HtmlElement:
+    """Parse a whole HTML page with lxml; empty input gives an empty document."""
+    return lxml_html.document_fromstring(html if html.strip() else "<html></html>")
+
+
+def element_text(elem: lxml_html.HtmlElement) -> str:
+    """Return the element's text with each piece stripped, like ``get_text(strip=True)``."""
+    return "".join(text.strip() for text in _TEXT_XPATH(elem))
+
+
+def element_strings(elem: lxml_html.HtmlElement) -> list[str]:
+    """Return the element's non-blank text pieces, stripped, like ``stripped_strings``."""
+    return [stripped for text in _TEXT_XPATH(elem) if (stripped := text.strip())]
+
+
+def element_html(elem: lxml_html.HtmlElement) -> str:
+    """Serialize just ``elem`` (without its trailing text) as HTML."""
+    return lxml_html.tostring(elem, encoding="unicode", with_tail=False)
+
+
+@dataclass(**_SLOTS)
 class BlogEntry:
     """Represents a single blog post from any group's official site.
 
+    Slotted (on Python 3.10+) to keep large scrape results compact.
+
     Attributes:
         id: Unique identifier for the blog post.
         title: Title of the blog post.
@@ -71,13 +152,45 @@ class BaseBlogScraper(ABC):
 
     base_url: str = ""
 
-    def __init__(self, session: aiohttp.ClientSession):
+    def __init__(self, session: aiohttp.ClientSession | None = None, cache: BlogCache | None = None):
         """Initialize the scraper with an aiohttp session.
 
         Args:
-            session: An active aiohttp ClientSession for making requests.
+            session: An active aiohttp ClientSession for making requests. If omitted,
+                the scraper opens its own keep-alive session on first use; call
+                ``close()`` once when done with it.
+            cache: Optional persistent cache. With one, ``get_members()`` reuses a
+                recent member list and ``get_blogs()`` only yields blogs newer than
+                those a previous completed run yielded.
         """
-        self.session = session
+        self.cache = cache
+        self._session = session
+        self._owns_session = session is None
+        self._base_slash = f"{self.base_url}/"
+        self._limiter = RateLimiter(REQUEST_RATE)
+        # Members whose running get_blogs() skipped a blog it failed to fetch
+        self._skipped_members: set[str] = set()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The session used for requests, created on first access if none was given."""
+        if self._session is None or (self._owns_session and self._session.closed):
+            # Pooled connector: detail fetches reuse the same TCP/TLS connections
+            self._session = aiohttp.ClientSession(connector=create_connector())
+        return self._session
+
+    @asynccontextmanager
+    async def _get(self, url: str, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """``session.get()`` paced by this scraper's REQUEST_RATE limiter, backing off on RETRY_STATUSES."""
+        await self._limiter.acquire()
+        async with get_with_backoff(self.session, url, RETRY_STATUSES, **kwargs) as resp:
+            yield resp
+
+    async def close(self) -> None:
+        """Close the session this scraper opened itself; a caller-provided session is left open."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
 
     def normalize_url(self, url: str) -> str:
         """Normalize a URL to be absolute.
@@ -90,15 +203,14 @@ class BaseBlogScraper(ABC):
         Returns:
             Absolute URL string.
         """
-        if not url:
-            return ""
-        if url.startswith("//"):
-            return f"https:{url}"
-        if url.startswith("/"):
-            return f"{self.base_url}{url}"
-        if not url.startswith("http"):
-            return f"{self.base_url}/{url}"
-        return url
+        # Called for every src/href in blog content; slice compares are cheaper than startswith()
+        if url[:1] == "/":
+            if url[1:2] == "/":
+                return "https:" + url
+            return self.base_url + url
+        if not url or url[:4] == "http":
+            return url
+        return self._base_slash + url
 
     def normalize_html_urls(self, html: str) -> str:
         """Normalize all URLs within HTML content to be absolute.
@@ -113,8 +225,6 @@ class BaseBlogScraper(ABC):
         Returns:
             HTML with all URLs normalized to absolute URLs.
         """
-        import re
-
         def replace_url(match: re.Match) -> str:
             attr = match.group(1)  # 'src' or 'href'
             quote = match.group(2)  # '"' or "'"
@@ -122,9 +232,7 @@ class BaseBlogScraper(ABC):
             normalized = self.normalize_url(url)
             return f'{attr}={quote}{normalized}{quote}'
 
-        # Match src="..." or href="..." with either double or single quotes
-        pattern = r'(src|href)=(["\'])([^"\']+)\2'
-        return re.sub(pattern, replace_url, html)
+        return _URL_ATTR_RE.sub(replace_url, html)
 
     @abstractmethod
     async def get_members(self) -> dict[str, str]:
@@ -180,6 +288,55 @@ class BaseBlogScraper(ABC):
         """
         pass
 
+    async def get_blogs_multi(
+        self,
+        member_ids: Sequence[str],
+        since_date: datetime | None = None,
+        concurrency: int = 4,
+    ) -> AsyncGenerator[BlogEntry, None]:
+        """Yield full blog entries for several members, listing up to ``concurrency`` at once.
+
+        Entries are interleaved across members as they arrive, but each member's entries
+        keep ``get_blogs()`` order. If any member's listing fails, the others are
+        cancelled and the error is raised here.
+
+        Args:
+            member_ids: Members whose blogs to fetch.
+            since_date: Passed to ``get_blogs()`` for every member.
+            concurrency: Maximum number of members listed at the same time.
+
+        Yields:
+            BlogEntry objects with full content.
+        """
+        pending = iter(member_ids)
+        # Bounded so fast listings wait for the consumer instead of piling up in memory
+        queue: asyncio.Queue[BlogEntry | Exception | None] = asyncio.Queue(maxsize=concurrency * 8)
+
+        async def worker() -> None:
+            try:
+                for member_id in pending:
+                    async for entry in self.get_blogs(member_id, since_date):
+                        await queue.put(entry)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(concurrency, len(member_ids)))]
+        try:
+            running = len(workers)
+            while running:
+                item = await queue.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in workers:
+                task.cancel()
+
     @abstractmethod
     async def get_blog_detail(self, blog_id: str, member_id: str | None = None) -> BlogEntry:
         """Fetch the full content of a specific blog post.
@@ -201,6 +358,91 @@ class BaseBlogScraper(ABC):
         """
         pass
 
+    async def _iter_blog_details(self, blog_ids: list[str], member_id: str) -> AsyncGenerator[BlogEntry, None]:
+        """Fetch full details for several blogs concurrently, yielding them in list order.
+
+        Up to DETAIL_CONCURRENCY detail pages are in flight at once, still paced by the
+        scraper's request rate limit. Posts whose detail page raises ValueError are logged and skipped. Closing the
+        generator early (e.g. on reaching ``since_date``) cancels the pending fetches.
+
+        Args:
+            blog_ids: Blog IDs in the order entries should be yielded.
+            member_id: Member ID to stamp on each entry.
+
+        Yields:
+            BlogEntry objects with full content.
+        """
+        sem = asyncio.Semaphore(DETAIL_CONCURRENCY)
+
+        async def fetch(blog_id: str) -> BlogEntry:
+            async with sem:
+                return await self.get_blog_detail(blog_id)
+
+        tasks = [asyncio.ensure_future(fetch(blog_id)) for blog_id in blog_ids]
+        try:
+            for blog_id, task in zip(blog_ids, tasks):
+                try:
+                    entry = await task
+                except ValueError as e:
+                    logger.warning("blog_detail_fetch_failed", blog_id=blog_id, error=str(e))
+                    self._skipped_members.add(member_id)
+                    continue
+                entry.member_id = member_id
+                yield entry
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark as retrieved; the caller only awaited up to here
+
+    def _cached_members(self) -> dict[str, str] | None:
+        """Return the cached member list for this site, if a cache holds a fresh one."""
+        return self.cache.get_members(self.base_url) if self.cache else None
+
+    async def _remember_members(self, members: dict[str, str]) -> None:
+        """Store a freshly fetched, non-empty member list in the cache."""
+        if self.cache and members:
+            await asyncio.to_thread(self.cache.set_members, self.base_url, members)
+
+    def _track_last_seen(self, member_id: str, entries: AsyncGenerator[BlogEntry, None]) -> AsyncIterator[BlogEntry]:
+        """Cut ``entries`` off at the member's last seen blog when a cache is set."""
+        if self.cache is None:
+            return entries
+        return self._iter_until_last_seen(self.cache, member_id, entries)
+
+    async def _iter_until_last_seen(
+        self,
+        cache: BlogCache,
+        member_id: str,
+        entries: AsyncGenerator[BlogEntry, None],
+    ) -> AsyncGenerator[BlogEntry, None]:
+        """Yield ``entries`` until the cached last seen blog, then move the mark to the newest.
+
+        The mark stays put if any blog or list page was skipped because it failed to
+        fetch, so the next run reaches (and retries) it instead of stopping above it.
+        """
+        last_seen = cache.get_last_seen(self.base_url, member_id)
+        self._skipped_members.discard(member_id)
+        newest: str | None = None
+        try:
+            async for entry in entries:
+                if entry.id == last_seen:
+                    break
+                if newest is None:
+                    newest = entry.id
+                yield entry
+        finally:
+            await entries.aclose()
+
+        # Only reached when the caller consumed everything; an abandoned
+        # iteration must not advance the mark past blogs it never saw
+        if member_id in self._skipped_members:
+            self._skipped_members.discard(member_id)
+            logger.info("blog_last_seen_kept", member_id=member_id, reason="skipped blogs will be retried")
+        elif newest is not None:
+            await asyncio.to_thread(cache.set_last_seen, self.base_url, member_id, newest)
+
     async def get_blog_detail_metadata(self, blog_id: str) -> tuple[str | None, datetime | None, str | None]:
         """Fetch authoritative metadata from a blog detail page.
 
@@ -222,3 +464,74 @@ class BaseBlogScraper(ABC):
             return thumbnail, entry.published_at, entry.title
         except Exception:
             return None, None, None
+
+
+class HtmlBlogScraper(BaseBlogScraper):
+    """Base class for scrapers that list a member's blogs on paginated HTML pages.
+
+    Subclasses parse one list page in ``_parse_blog_list_page()``; ``get_blogs()``
+    can then delegate to ``_iter_listed_blogs()``.
+    """
+
+    @abstractmethod
+    def _parse_blog_list_page(
+        self,
+        html: str,
+        seen_ids: set[str],
+        since_date: datetime | None,
+    ) -> tuple[list[str], bool] | None:
+        """Pick the not-yet-seen blog IDs off one page of a member's HTML blog list.
+
+        Adds the returned IDs to ``seen_ids``.
+
+        Returns:
+            None if the page lists no blogs at all, otherwise the new IDs in page
+            order and whether paging should stop after them.
+        """
+        pass
+
+    async def _iter_listed_blogs(
+        self,
+        list_url: str,
+        member_id: str,
+        since_date: datetime | None,
+    ) -> AsyncGenerator[BlogEntry, None]:
+        """Walk a member's paginated HTML blog list, yielding full entries newest first.
+
+        Shared ``get_blogs()`` loop: each page is parsed by
+        ``_parse_blog_list_page()`` and its details fetched via ``_iter_blog_details()``.
+        Stops at the first entry older than ``since_date``.
+        """
+        seen_ids: set[str] = set()
+
+        for page in range(MAX_PAGES_SAFETY_CAP):
+            params = {"ima": "0000", "ct": member_id, "page": page}
+            async with self._get(list_url, params=params) as resp:
+                if resp.status != 200:
+                    logger.warning(
+                        "blog_list_fetch_failed",
+                        status=resp.status,
+                        member_id=member_id,
+                        page=page,
+                    )
+                    self._skipped_members.add(member_id)
+                    return
+                html = await resp.text()
+
+            parsed = self._parse_blog_list_page(html, seen_ids, since_date)
+            if parsed is None:
+                return
+            blog_ids, last_page = parsed
+
+            # Fetch full blog details for the page concurrently, in page order
+            details = self._iter_blog_details(blog_ids, member_id)
+            try:
+                async for entry in details:
+                    if since_date and entry.published_at < since_date:
+                        return
+                    yield entry
+            finally:
+                await details.aclose()
+
+            if last_page:
+                return
@@ -0,0 +1,103 @@
+"""Persistent cache for blog scrapers, kept in a single JSON file."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from .config import MEMBERS_CACHE_TTL
+
+logger = structlog.get_logger(__name__)
+
+
+class BlogCache:
+    """Remembers member lists and each member's newest seen blog across runs.
+
+    Pass one to a scraper (``get_scraper(group, cache=BlogCache(path))``) to make
+    ``get_members()`` reuse a recent member list and ``get_blogs()`` stop at the
+    first blog an earlier completed run already yielded.
+
+    Attributes:
+        path: JSON file backing the cache; created on first save.
+        members_ttl: Seconds a cached member list stays valid.
+    """
+
+    def __init__(self, path: Path | str, members_ttl: float = MEMBERS_CACHE_TTL):
+        """Load the cache file if it exists.
+
+        Args:
+            path: JSON file backing the cache.
+            members_ttl: Seconds a cached member list stays valid.
+        """
+        self.path = Path(path)
+        self.members_ttl = members_ttl
+        self._data: dict[str, Any] = {"members": {}, "last_seen": {}}
+        # Scrapers save from worker threads (asyncio.to_thread), possibly several at once
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Load the cache from disk, starting empty if it is missing or unreadable."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._data["members"] = dict(data.get("members", {}))
+            self._data["last_seen"] = dict(data.get("last_seen", {}))
+        except Exception as e:
+            logger.error("Failed to load blog cache", path=str(self.path), error=str(e))
+
+    def save(self) -> None:
+        """Write the cache to disk.
+
+        Writes a temporary file next to ``path`` and swaps it in, so a crash
+        mid-write leaves the previous cache intact.
+        """
+        tmp_path: str | None = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+        except Exception as e:
+            logger.error("Failed to save blog cache", path=str(self.path), error=str(e))
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def get_members(self, site: str) -> dict[str, str] | None:
+        """Return the cached member list for ``site`` if it is younger than ``members_ttl``."""
+        entry = self._data["members"].get(site)
+        if not entry or time.time() - entry.get("fetched_at", 0) > self.members_ttl:
+            return None
+        return dict(entry["members"])
+
+    def set_members(self, site: str, members: dict[str, str]) -> None:
+        """Store ``site``'s member list with the current time and save."""
+        with self._lock:
+            self._data["members"][site] = {"fetched_at": time.time(), "members": dict(members)}
+        self.save()
+
+    def get_last_seen(self, site: str, member_id: str) -> str | None:
+        """Return the ID of the newest blog already yielded for a member, if any."""
+        return self._data["last_seen"].get(f"{site}:{member_id}")
+
+    def set_last_seen(self, site: str, member_id: str, blog_id: str) -> None:
+        """Record ``blog_id`` as the newest blog yielded for a member and save."""
+        with self._lock:
+            self._data["last_seen"][f"{site}:{member_id}"] = blog_id
+        self.save()
@@ -22,6 +22,30 @@ DATE_FORMATS = [
 ]
 
 
+# DATE_FORMATS indexed by (date separator, number of ':'), which identifies each one.
+# Lets the default path run a single strptime instead of raising through failed formats.
+_DATE_FORMAT_BY_SHAPE = {
+    ("/" if "/" in fmt else ".", fmt.count(":")): fmt for fmt in DATE_FORMATS
+}
+
+
+def _parse_date_fields(date_text: str, sep: str) -> datetime:
+    """Parse ``Y<sep>M<sep>D[ H:M[:S]]`` with plain int() conversions.
+
+    Much cheaper than strptime, which re-reads its format on every call.
+    Raises ValueError for anything that doesn't have exactly that layout.
+    """
+    date_part, _, time_part = date_text.partition(" ")
+    fields = date_part.split(sep)
+    if len(fields) != 3 or len(fields[0]) != 4:
+        raise ValueError(date_text)
+    if time_part:
+        fields += time_part.split(":")
+    if not all(field.isdigit() for field in fields) or any(len(field) > 2 for field in fields[1:]):
+        raise ValueError(date_text)
+    return datetime(*map(int, fields), tzinfo=JST)
+
+
 def parse_jst_datetime(
     date_text: str,
     formats: list[str] | None = None,
@@ -39,12 +63,20 @@ def parse_jst_datetime(
     Returns:
         Parsed datetime with JST timezone, or current JST time on failure.
     """
+    date_text = date_text.strip()
     if formats is None:
-        formats = DATE_FORMATS
+        shape = ("/" if "/" in date_text else ".", date_text.count(":"))
+        fmt = _DATE_FORMAT_BY_SHAPE.get(shape)
+        if fmt is not None:
+            try:
+                return _parse_date_fields(date_text, shape[0])
+            except ValueError:
+                pass  # strptime has the final say on anything unusual
+        formats = [fmt] if fmt else DATE_FORMATS
 
     for fmt in formats:
         try:
-            dt = datetime.strptime(date_text.strip(), fmt)
+            dt = datetime.strptime(date_text, fmt)
             return dt.replace(tzinfo=JST)
         except ValueError:
             continue
@@ -69,11 +101,15 @@ DOWNLOAD_CONCURRENCY_INCREMENTAL = 5  # Incremental: gentle on server
 # Concurrency for image downloads within a blog
 IMAGE_DOWNLOAD_CONCURRENCY = 5
 
-# Delay between page requests (seconds)
-PAGE_DELAY = 0.3
+# Request rate cap per scraper (requests/second), shared by all of its concurrent calls.
+# Matches the old fixed 0.5 s/1.0 s sleeps between requests, without padding slow responses.
+REQUEST_RATE = 2
+
+# Statuses a scraper backs off on (Retry-After or exponential) before giving up on a page
+RETRY_STATUSES = frozenset({429, 503})
 
-# Delay between blog detail requests (seconds)
-DETAIL_DELAY = 0.5
+# Blog detail pages fetched in parallel while walking a full-content list page
+DETAIL_CONCURRENCY = 4
 
-# Delay between pages when fetching full content (seconds)
-FULL_CONTENT_PAGE_DELAY = 1.0
+# How long a BlogCache keeps a site's member list before refetching (seconds)
+MEMBERS_CACHE_TTL = 24 * 60 * 60
@@ -2,27 +2,84 @@
 
 from __future__ import annotations
 
-import asyncio
 import re
 from collections.abc import AsyncIterator
 from datetime import datetime
 
 import structlog
-from bs4 import BeautifulSoup
-
-from .base import BaseBlogScraper, BlogEntry, BlogGoneError, MemberInfo
+from lxml import etree
+from lxml import html as lxml_html
+
+from .base import (
+    BlogEntry,
+    BlogGoneError,
+    HtmlBlogScraper,
+    MemberInfo,
+    element_html,
+    element_strings,
+    element_text,
+    parse_html_tree,
+    xpath_has_class,
+)
 from .config import (
-    DETAIL_DELAY,
-    FULL_CONTENT_PAGE_DELAY,
     MAX_PAGES_SAFETY_CAP,
-    PAGE_DELAY,
     parse_jst_datetime,
 )
 
 logger = structlog.get_logger(__name__)
 
+# Compiled once; these run for every link on member/list pages
+_ARTIST_RE = re.compile(r"/artist/(\d+)")
+_DETAIL_RE = re.compile(r"/diary/detail/(\d+)")
+
+# Detail page lookups, compiled once and evaluated against a single lxml tree per page
+_TITLE_XPATH = etree.XPath(f"//*[{xpath_has_class('c-blog-article__title')}]")
+_DATE_XPATH = etree.XPath(f"//*[{xpath_has_class('c-blog-article__date')}]//time")
+_NAME_XPATH = etree.XPath(f"//*[{xpath_has_class('c-blog-article__name')}]//a")
+_CONTENT_XPATH = etree.XPath(f"//*[{xpath_has_class('c-blog-article__text')}]")
+_IMG_SRC_XPATH = etree.XPath(".//img/@src")
+
+# Blog list lookups
+_ARTICLE_XPATH = etree.XPath(f"//*[{xpath_has_class('p-blog-article')}]")
+_DETAIL_HREF_XPATH = etree.XPath("(.//a[contains(@href, '/diary/detail/')])[1]/@href")
+_ARTICLE_NAME_XPATH = etree.XPath(f"(.//*[{xpath_has_class('c-blog-article__name')}])[1]")
+_ARTICLE_TITLE_XPATH = etree.XPath(f"(.//*[{xpath_has_class('c-blog-article__title')}])[1]")
+_ARTICLE_DATE_XPATH = etree.XPath(f"(.//*[{xpath_has_class('c-blog-article__date')}])[1]")
+_FIRST_IMG_XPATH = etree.XPath("(.//img)[1]")
+
+# Member list lookups
+_CT_LINK_XPATH = etree.XPath("//a[contains(@href, 'ct=')]")
+_PARENT_MEMBER_NAME_XPATH = etree.XPath(
+    f"ancestor::div[1]//*[{xpath_has_class('name')} or {xpath_has_class('p-blog-member__name')}]"
+)
+_MEMBER_NAME_XPATH = etree.XPath(
+    f"(.//*[{xpath_has_class('name')} or {xpath_has_class('p-blog-member__name')}])[1]"
+)
+_ARTIST_LINK_XPATH = etree.XPath("//a[contains(@href, '/artist/')]")
+_PARENT_LI_XPATH = etree.XPath("ancestor::li[1]")
+_PARENT_DIV_XPATH = etree.XPath("ancestor::div[1]")
+
+
+def _extract_ct(href: str) -> str | None:
+    """Return the numeric ``ct`` (member ID) query parameter of a link, if present.
+
+    Plain string splitting; this runs on every member link, where a regex search costs more.
+    """
+    query = href.partition("?")[2].partition("#")[0]
+    for part in query.split("&"):
+        if part[:3] == "ct=":
+            value = part[3:]
+            return value if value.isdigit() else None
+    return None
+
+
+def _member_container(link: lxml_html.HtmlElement) -> lxml_html.HtmlElement | None:
+    """Return the closest ``li`` around a member link, else the closest ``div``."""
+    parents = _PARENT_LI_XPATH(link) or _PARENT_DIV_XPATH(link)
+    return parents[0] if parents else None
 
-class HinatazakaBlogScraper(BaseBlogScraper):
+
+class HinatazakaBlogScraper(HtmlBlogScraper):
     """Scraper for Hinatazaka46 official blog.
 
     Uses HTML scraping from www.hinatazaka46.com.
@@ -49,10 +106,14 @@ class HinatazakaBlogScraper(BaseBlogScraper):
         Returns:
             Dictionary mapping member_id (ct parameter) to member_name.
         """
+        cached = self._cached_members()
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}/s/official/diary/member"
         params = {"ima": "0000"}
 
-        async with self.session.get(url, params=params) as resp:
+        async with self._get(url, params=params) as resp:
             if resp.status != 200:
                 logger.warning(
                     "failed_to_fetch_members",
@@ -62,28 +123,25 @@ class HinatazakaBlogScraper(BaseBlogScraper):
                 return {}
 
             html = await resp.text()
-            soup = BeautifulSoup(html, "html.parser")
-
-            members: dict[str, str] = {}
-            # Look for member links in the member list
-            for link in soup.select('a[href*="ct="]'):
-                href = str(link.get("href", ""))
-                match = re.search(r"ct=(\d+)", href)
-                if match:
-                    member_id = match.group(1)
-                    # Get member name from the link text or parent element
-                    name = link.get_text(strip=True)
-                    if not name:
-                        # Try parent element
-                        parent = link.find_parent("div")
-                        if parent:
-                            name_elem = parent.select_one(".name, .p-blog-member__name")
-                            if name_elem:
-                                name = name_elem.get_text(strip=True)
-                    if name and member_id not in members and name not in self._GROUP_ACCOUNT_NAMES:
-                        members[member_id] = name
 
-            return members
+        tree = parse_html_tree(html)
+        members: dict[str, str] = {}
+        # Look for member links in the member list
+        for link in _CT_LINK_XPATH(tree):
+            member_id = _extract_ct(link.get("href", ""))
+            if member_id:
+                # Get member name from the link text or parent element
+                name = element_text(link)
+                if not name:
+                    # Try parent element
+                    name_elems = _PARENT_MEMBER_NAME_XPATH(link)
+                    if name_elems:
+                        name = element_text(name_elems[0])
+                if name and member_id not in members and name not in self._GROUP_ACCOUNT_NAMES:
+                    members[member_id] = name
+
+        await self._remember_members(members)
+        return members
 
     async def get_members_with_thumbnails(self) -> list[MemberInfo]:
         """Fetch blog members with their profile thumbnail URLs.
@@ -102,15 +160,15 @@ class HinatazakaBlogScraper(BaseBlogScraper):
         artist_url = f"{self.base_url}/s/official/search/artist"
         params = {"ima": "0000"}
 
-        async with self.session.get(artist_url, params=params) as resp:
+        async with self._get(artist_url, params=params) as resp:
             if resp.status == 200:
                 html = await resp.text()
-                soup = BeautifulSoup(html, "html.parser")
+                tree = parse_html_tree(html)
 
                 # Find all member links with artist IDs
-                for link in soup.select('a[href*="/artist/"]'):
-                    href = str(link.get("href", ""))
-                    match = re.search(r"/artist/(\d+)", href)
+                for link in _ARTIST_LINK_XPATH(tree):
+                    href = link.get("href", "")
+                    match = _ARTIST_RE.search(href)
                     if not match:
                         continue
 
@@ -120,30 +178,25 @@ class HinatazakaBlogScraper(BaseBlogScraper):
                     seen_ids.add(member_id)
 
                     # Find the image within or near the link
-                    img = link.select_one("img")
-                    if not img:
+                    parent = _member_container(link)
+                    imgs = _FIRST_IMG_XPATH(link)
+                    if not imgs and parent is not None:
                         # Try parent container
-                        parent = link.find_parent("li") or link.find_parent("div")
-                        if parent:
-                            img = parent.select_one("img")
+                        imgs = _FIRST_IMG_XPATH(parent)
 
                     thumbnail_url = ""
-                    if img:
-                        src = img.get("src", "")
+                    if imgs:
+                        src = imgs[0].get("src", "")
                         if src:
                             thumbnail_url = self.normalize_url(src)
 
                     # Get member name from link text or nearby elements
-                    name = link.get_text(strip=True)
-                    if not name or name.isspace():
+                    name = element_text(link)
+                    if not name and parent is not None:
                         # Try to find name in parent or sibling elements
-                        parent = link.find_parent("li") or link.find_parent("div")
-                        if parent:
-                            # Look for text content
-                            for child in parent.stripped_strings:
-                                if child and not child.isspace():
-                                    name = child
-                                    break
+                        strings = element_strings(parent)
+                        if strings:
+                            name = strings[0]
 
                     if name and thumbnail_url and name not in self._GROUP_ACCOUNT_NAMES:
                         members.append(
@@ -162,41 +215,38 @@ class HinatazakaBlogScraper(BaseBlogScraper):
 
         # Also scrape the diary member page to catch mascots like ポカ
         diary_url = f"{self.base_url}/s/official/diary/member"
-        async with self.session.get(diary_url, params=params) as resp:
+        async with self._get(diary_url, params=params) as resp:
             if resp.status == 200:
                 html = await resp.text()
-                soup = BeautifulSoup(html, "html.parser")
+                tree = parse_html_tree(html)
 
                 # Find member items with ct parameter (blog member list)
-                for link in soup.select('a[href*="ct="]'):
-                    href = str(link.get("href", ""))
-                    match = re.search(r"ct=(\d+)", href)
-                    if not match:
+                for link in _CT_LINK_XPATH(tree):
+                    member_id = _extract_ct(link.get("href", ""))
+                    if not member_id:
                         continue
-
-                    member_id = match.group(1)
                     if member_id in seen_ids:
                         continue
                     seen_ids.add(member_id)
 
                     # Find the container for this member
-                    container = link.find_parent("li") or link.find_parent("div")
-                    if not container:
+                    container = _member_container(link)
+                    if container is None:
                         continue
 
                     # Find the image
-                    img = container.select_one("img")
+                    imgs = _FIRST_IMG_XPATH(container)
                     thumbnail_url = ""
-                    if img:
-                        src = img.get("src", "")
+                    if imgs:
+                        src = imgs[0].get("src", "")
                         if src:
                             thumbnail_url = self.normalize_url(src)
 
                     # Get member name
-                    name_elem = container.select_one(".name, .p-blog-member__name")
-                    name = name_elem.get_text(strip=True) if name_elem else ""
+                    name_elems = _MEMBER_NAME_XPATH(container)
+                    name = element_text(name_elems[0]) if name_elems else ""
                     if not name:
-                        name = link.get_text(strip=True)
+                        name = element_text(link)
 
                     if name and thumbnail_url and name not in self._GROUP_ACCOUNT_NAMES:
                         members.append(
@@ -250,11 +300,11 @@ class HinatazakaBlogScraper(BaseBlogScraper):
         seen_ids: set[str] = set()
         effective_max = min(max_pages, MAX_PAGES_SAFETY_CAP)
 
+        url = f"{self.base_url}/s/official/diary/member/list"
         while page < effective_max:
-            url = f"{self.base_url}/s/official/diary/member/list"
             params = {"ima": "0000", "ct": member_id, "page": page}
 
-            async with self.session.get(url, params=params) as resp:
+            async with self._get(url, params=params) as resp:
                 if resp.status != 200:
                     logger.warning(
                         "blog_list_fetch_failed",
@@ -265,72 +315,70 @@ class HinatazakaBlogScraper(BaseBlogScraper):
                     break
 
                 html = await resp.text()
-                soup = BeautifulSoup(html, "html.parser")
-
-                # .p-blog-article elements are pre-filtered by ct parameter
-                # All articles on this page belong to the target member
-                articles = soup.select(".p-blog-article")
-
-                if not articles:
-                    break
-
-                for article in articles:
-                    link = article.select_one('a[href*="/diary/detail/"]')
-                    if not link:
-                        continue
-
-                    href = link.get("href", "")
-                    match = re.search(r"/diary/detail/(\d+)", href)
-                    if not match:
-                        continue
-
-                    blog_id = match.group(1)
-                    if blog_id in seen_ids:
-                        continue
-                    seen_ids.add(blog_id)
-
-                    # Get member name from article (for metadata)
-                    name_elem = article.select_one(".c-blog-article__name")
-                    member_name = name_elem.get_text(strip=True) if name_elem else ""
-
-                    # Parse title
-                    title_elem = article.select_one(".c-blog-article__title")
-                    title = title_elem.get_text(strip=True) if title_elem else ""
-
-                    # Extract date (format: "2024.1.23 16:03")
-                    date_elem = article.select_one(".c-blog-article__date")
-                    date_text = date_elem.get_text(strip=True) if date_elem else ""
-                    published_at = parse_jst_datetime(date_text)
-
-                    # Check date filter
-                    if since_date and published_at < since_date:
-                        return
-
-                    # Extract first image if present
-                    images: list[str] = []
-                    img = article.select_one("img")
-                    if img:
-                        src = img.get("src", "")
-                        if src:
-                            images.append(self.normalize_url(src))
-
-                    blog_url = self.normalize_url(href)
 
-                    yield BlogEntry(
-                        id=blog_id,
-                        title=title,
-                        content="",  # Empty - fetch with get_blog_detail() when needed
-                        published_at=published_at,
-                        url=blog_url,
-                        images=images,
-                        member_id=member_id,
-                        member_name=member_name,
-                    )
+            # .p-blog-article elements are pre-filtered by ct parameter
+            # All articles on this page belong to the target member
+            articles = _ARTICLE_XPATH(parse_html_tree(html))
+
+            if not articles:
+                break
+
+            for article in articles:
+                hrefs = _DETAIL_HREF_XPATH(article)
+                if not hrefs:
+                    continue
+
+                href = str(hrefs[0])
+                match = _DETAIL_RE.search(href)
+                if not match:
+                    continue
+
+                blog_id = match.group(1)
+                if blog_id in seen_ids:
+                    continue
+                seen_ids.add(blog_id)
+
+                # Get member name from article (for metadata)
+                name_elems = _ARTICLE_NAME_XPATH(article)
+                member_name = element_text(name_elems[0]) if name_elems else ""
+
+                # Parse title
+                title_elems = _ARTICLE_TITLE_XPATH(article)
+                title = element_text(title_elems[0]) if title_elems else ""
+
+                # Extract date (format: "2024.1.23 16:03")
+                date_elems = _ARTICLE_DATE_XPATH(article)
+                date_text = element_text(date_elems[0]) if date_elems else ""
+                published_at = parse_jst_datetime(date_text)
+
+                # Check date filter
+                if since_date and published_at < since_date:
+                    return
+
+                # Extract first image if present
+                images: list[str] = []
+                imgs = _FIRST_IMG_XPATH(article)
+                if imgs:
+                    src = imgs[0].get("src", "")
+                    if src:
+                        images.append(self.normalize_url(src))
+
+                blog_url = self.normalize_url(href)
+
+                yield BlogEntry(
+                    id=blog_id,
+                    title=title,
+                    content="",  # Empty - fetch with get_blog_detail() when needed
+                    published_at=published_at,
+                    url=blog_url,
+                    images=images,
+                    member_id=member_id,
+                    member_name=member_name,
+                )
 
-                page += 1
-                await asyncio.sleep(PAGE_DELAY)
+            page += 1
 
-    async def get_blogs(
+    def get_blogs(
         self,
         member_id: str,
         since_date: datetime | None = None,
@@ -350,70 +398,36 @@ class HinatazakaBlogScraper(BaseBlogScraper):
         Yields:
             BlogEntry objects with full content for each blog post found.
         """
-        page = 0
-        seen_ids: set[str] = set()
-
-        while page < MAX_PAGES_SAFETY_CAP:
-            url = f"{self.base_url}/s/official/diary/member/list"
-            params = {"ima": "0000", "ct": member_id, "page": page}
-
-            async with self.session.get(url, params=params) as resp:
-                if resp.status != 200:
-                    logger.warning(
-                        "blog_list_fetch_failed",
-                        status=resp.status,
-                        member_id=member_id,
-                        page=page,
-                    )
-                    break
+        url = f"{self.base_url}/s/official/diary/member/list"
+        return self._track_last_seen(member_id, self._iter_listed_blogs(url, member_id, since_date))
 
-                html = await resp.text()
-                soup = BeautifulSoup(html, "html.parser")
-
-                # .p-blog-article elements are pre-filtered by ct parameter
-                # All articles on this page belong to the target member
-                articles = soup.select(".p-blog-article")
-
-                if not articles:
-                    break
-
-                for article in articles:
-                    link = article.select_one('a[href*="/diary/detail/"]')
-                    if not link:
-                        continue
-
-                    href = link.get("href", "")
-                    match = re.search(r"/diary/detail/(\d+)", href)
-                    if not match:
-                        continue
-
-                    blog_id = match.group(1)
-                    if blog_id in seen_ids:
-                        continue
-                    seen_ids.add(blog_id)
-
-                    # Fetch full blog detail
-                    try:
-                        entry = await self.get_blog_detail(blog_id)
-                        entry.member_id = member_id
-
-                        # Check date filter
-                        if since_date and entry.published_at < since_date:
-                            return
-
-                        yield entry
-
-                        # Polite delay between requests
-                        await asyncio.sleep(DETAIL_DELAY)
-                    except ValueError as e:
-                        logger.warning(
-                            "blog_detail_fetch_failed",
-                            blog_id=blog_id,
-                            error=str(e),
-                        )
-
-                page += 1
-                await asyncio.sleep(FULL_CONTENT_PAGE_DELAY)
+    def _parse_blog_list_page(
+        self,
+        html: str,
+        seen_ids: set[str],
+        since_date: datetime | None,
+    ) -> tuple[list[str], bool] | None:
+        """Collect new detail IDs from a .p-blog-article list page; never stops early."""
+        # .p-blog-article elements are pre-filtered by ct parameter
+        # All articles on this page belong to the target member
+        articles = _ARTICLE_XPATH(parse_html_tree(html))
+        if not articles:
+            return None
+
+        blog_ids: list[str] = []
+        for article in articles:
+            hrefs = _DETAIL_HREF_XPATH(article)
+            match = _DETAIL_RE.search(hrefs[0]) if hrefs else None
+            if not match:
+                continue
+
+            blog_id = match.group(1)
+            if blog_id in seen_ids:
+                continue
+            seen_ids.add(blog_id)
+            blog_ids.append(blog_id)
+
+        return blog_ids, False
 
     async def get_blog_detail(self, blog_id: str, member_id: str | None = None) -> BlogEntry:
         """Fetch the full content of a specific blog post.
@@ -433,7 +447,7 @@ class HinatazakaBlogScraper(BaseBlogScraper):
         url = f"{self.base_url}/s/official/diary/detail/{blog_id}"
         params = {"ima": "0000", "cd": "member"}
 
-        async with self.session.get(url, params=params) as resp:
+        async with self._get(url, params=params) as resp:
             if resp.status in (404, 410):
                 raise BlogGoneError(f"Blog {blog_id} has been removed (HTTP {resp.status})")
             if resp.status != 200:
@@ -456,43 +470,37 @@ class HinatazakaBlogScraper(BaseBlogScraper):
         Raises:
             ValueError: If required elements are not found.
         """
-        soup = BeautifulSoup(html, "html.parser")
+        tree = parse_html_tree(html)
 
         # Extract title
-        title_elem = soup.select_one(".c-blog-article__title")
-        title = title_elem.get_text(strip=True) if title_elem else ""
+        title_elems = _TITLE_XPATH(tree)
+        title = element_text(title_elems[0]) if title_elems else ""
 
         # Extract date
-        date_elem = soup.select_one(".c-blog-article__date time")
-        date_text = date_elem.get_text(strip=True) if date_elem else ""
+        date_elems = _DATE_XPATH(tree)
+        date_text = element_text(date_elems[0]) if date_elems else ""
         published_at = parse_jst_datetime(date_text)
 
         # Extract member name
-        name_elem = soup.select_one(".c-blog-article__name a")
-        member_name = name_elem.get_text(strip=True) if name_elem else ""
+        name_elems = _NAME_XPATH(tree)
+        member_name = element_text(name_elems[0]) if name_elems else ""
 
         # Extract member ID from name link
         member_id = ""
-        if name_elem:
-            href = name_elem.get("href", "")
-            ct_match = re.search(r"ct=(\d+)", href)
-            if ct_match:
-                member_id = ct_match.group(1)
+        if name_elems:
+            member_id = _extract_ct(name_elems[0].get("href", "")) or ""
 
         # Extract content
-        content_elem = soup.select_one(".c-blog-article__text")
+        content_elems = _CONTENT_XPATH(tree)
         content = ""
         images: list[str] = []
 
-        if content_elem:
+        if content_elems:
             # Get raw HTML content and normalize URLs within it
-            content = self.normalize_html_urls(str(content_elem))
+            content = self.normalize_html_urls(element_html(content_elems[0]))
 
             # Extract image URLs
-            for img in content_elem.select("img"):
-                src = img.get("src", "")
-                if src:
-                    images.append(self.normalize_url(src))
+            images = [self.normalize_url(src) for src in _IMG_SRC_XPATH(content_elems[0]) if src]
 
         return BlogEntry(
             id=blog_id,
@@ -2,31 +2,31 @@
 
 from __future__ import annotations
 
-import asyncio
 import json
-from collections.abc import AsyncIterator
+from collections.abc import AsyncGenerator, AsyncIterator
 from datetime import datetime
 from typing import Any
 
+import orjson
 import structlog
-from bs4 import BeautifulSoup
 
-from .base import BaseBlogScraper, BlogEntry, BlogGoneError, MemberInfo
+from .base import BaseBlogScraper, BlogEntry, BlogGoneError, MemberInfo, extract_img_srcs
 from .config import (
-    FULL_CONTENT_PAGE_DELAY,
     MAX_PAGES_SAFETY_CAP,
-    PAGE_DELAY,
     parse_jst_datetime,
 )
 
 logger = structlog.get_logger(__name__)
 
+_JSONP_TRAILER = frozenset(b" \t\r\n;")
+_CLOSE_PAREN = ord(")")
 
-def parse_jsonp(text: str, callback: str = "res") -> dict[str, Any]:
+
+def parse_jsonp(text: str | bytes, callback: str = "res") -> dict[str, Any]:
     """Parse a JSONP response into a dictionary.
 
     Args:
-        text: Raw JSONP response text.
+        text: Raw JSONP response body; bytes (from ``resp.read()``) skip a decode step.
         callback: The callback function name (default: "res").
 
     Returns:
@@ -35,18 +35,19 @@ def parse_jsonp(text: str, callback: str = "res") -> dict[str, Any]:
     Raises:
         ValueError: If the JSONP format is invalid.
     """
-    prefix = f"{callback}("
-    if not text.startswith(prefix):
-        raise ValueError(f"Invalid JSONP format: expected '{prefix}' prefix")
-
-    # Find the matching closing parenthesis
-    # The format is: res({...}) or res({...});
-    # Strip trailing semicolon and whitespace, then remove the closing paren
-    text = text.strip().rstrip(";")
-    if not text.endswith(")"):
+    data = text.encode() if isinstance(text, str) else text
+    prefix = f"{callback}(".encode()
+    if not data.startswith(prefix):
+        raise ValueError(f"Invalid JSONP format: expected '{prefix.decode()}' prefix")
+
+    # The format is: res({...}) or res({...}); (plus optional whitespace).
+    # Find the closing paren from the end without copying the payload.
+    end = len(data)
+    while end and data[end - 1] in _JSONP_TRAILER:
+        end -= 1
+    if not end or data[end - 1] != _CLOSE_PAREN:
         raise ValueError("Invalid JSONP format: missing closing parenthesis")
-    json_str = text[len(prefix) : -1]
-    result: dict[str, Any] = json.loads(json_str)
+    result: dict[str, Any] = orjson.loads(memoryview(data)[len(prefix) : end - 1])
     return result
 
 
@@ -70,10 +71,14 @@ class NogizakaBlogScraper(BaseBlogScraper):
         Returns:
             Dictionary mapping member_id (code) to member_name.
         """
+        cached = self._cached_members()
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}/s/n46/api/list/member"
         params = {"callback": "res"}
 
-        async with self.session.get(url, params=params) as resp:
+        async with self._get(url, params=params) as resp:
             if resp.status != 200:
                 logger.warning(
                     "failed_to_fetch_members",
@@ -82,10 +87,10 @@ class NogizakaBlogScraper(BaseBlogScraper):
                 )
                 return {}
 
-            text = await resp.text()
+            body = await resp.read()
             try:
-                data = parse_jsonp(text)
-                return {
+                data = parse_jsonp(body)
+                members = {
                     member["code"]: member["name"]
                     for member in data.get("data", [])
                     if member.get("code")
@@ -100,6 +105,9 @@ class NogizakaBlogScraper(BaseBlogScraper):
                 )
                 return {}
 
+        await self._remember_members(members)
+        return members
+
     async def get_members_with_thumbnails(self) -> list[MemberInfo]:
         """Fetch blog members with their profile thumbnail URLs.
 
@@ -112,7 +120,7 @@ class NogizakaBlogScraper(BaseBlogScraper):
         url = f"{self.base_url}/s/n46/api/list/member"
         params = {"callback": "res"}
 
-        async with self.session.get(url, params=params) as resp:
+        async with self._get(url, params=params) as resp:
             if resp.status != 200:
                 logger.warning(
                     "failed_to_fetch_members_with_thumbnails",
@@ -121,9 +129,9 @@ class NogizakaBlogScraper(BaseBlogScraper):
                 )
                 return []
 
-            text = await resp.text()
+            body = await resp.read()
             try:
-                data = parse_jsonp(text)
+                data = parse_jsonp(body)
                 members: list[MemberInfo] = []
                 for member in data.get("data", []):
                     if not member.get("code") or not member.get("name"):
@@ -176,8 +184,8 @@ class NogizakaBlogScraper(BaseBlogScraper):
         seen_ids: set[str] = set()
         page_count = 0
 
+        url = f"{self.base_url}/s/n46/api/list/blog"
         while page_count < max_pages:
-            url = f"{self.base_url}/s/n46/api/list/blog"
             params = {
                 "ct": member_id,
                 "rw": page_size,
@@ -185,13 +193,13 @@ class NogizakaBlogScraper(BaseBlogScraper):
                 "callback": "res",
             }
 
-            async with self.session.get(url, params=params) as resp:
+            async with self._get(url, params=params) as resp:
                 if resp.status != 200:
                     break
 
-                text = await resp.text()
+                body = await resp.read()
                 try:
-                    data = parse_jsonp(text)
+                    data = parse_jsonp(body)
                 except (ValueError, json.JSONDecodeError):
                     break
 
@@ -237,9 +245,8 @@ class NogizakaBlogScraper(BaseBlogScraper):
 
                 offset += page_size
                 page_count += 1
-                await asyncio.sleep(PAGE_DELAY)
 
-    async def get_blogs(
+    def get_blogs(
         self,
         member_id: str,
         since_date: datetime | None = None,
@@ -256,13 +263,21 @@ class NogizakaBlogScraper(BaseBlogScraper):
         Yields:
             BlogEntry objects for each blog post found.
         """
+        return self._track_last_seen(member_id, self._iter_api_blogs(member_id, since_date))
+
+    async def _iter_api_blogs(
+        self,
+        member_id: str,
+        since_date: datetime | None,
+    ) -> AsyncGenerator[BlogEntry, None]:
+        """Page through the blog list API for ``get_blogs()``."""
         offset = 0
         page_size = 32
         seen_ids: set[str] = set()
         page_count = 0
 
+        url = f"{self.base_url}/s/n46/api/list/blog"
         while page_count < MAX_PAGES_SAFETY_CAP:
-            url = f"{self.base_url}/s/n46/api/list/blog"
             params = {
                 "ct": member_id,
                 "rw": page_size,
@@ -270,7 +285,7 @@ class NogizakaBlogScraper(BaseBlogScraper):
                 "callback": "res",
             }
 
-            async with self.session.get(url, params=params) as resp:
+            async with self._get(url, params=params) as resp:
                 if resp.status != 200:
                     logger.warning(
                         "blog_list_fetch_failed",
@@ -278,17 +293,19 @@ class NogizakaBlogScraper(BaseBlogScraper):
                         member_id=member_id,
                         offset=offset,
                     )
+                    self._skipped_members.add(member_id)
                     break
 
-                text = await resp.text()
+                body = await resp.read()
                 try:
-                    data = parse_jsonp(text)
+                    data = parse_jsonp(body)
                 except (ValueError, json.JSONDecodeError) as e:
                     logger.warning(
                         "failed_to_parse_blog_list",
                         error=str(e),
                         member_id=member_id,
                     )
+                    self._skipped_members.add(member_id)
                     break
 
                 blogs = data.get("data", [])
@@ -318,13 +335,13 @@ class NogizakaBlogScraper(BaseBlogScraper):
                             blog_id=blog_id,
                             error=str(e),
                         )
+                        self._skipped_members.add(member_id)
 
                 if not found_new or len(blogs) < page_size:
                     break
 
                 offset += page_size
                 page_count += 1
-                await asyncio.sleep(FULL_CONTENT_PAGE_DELAY)
 
     async def get_blog_detail(self, blog_id: str, member_id: str | None = None) -> BlogEntry:
         """Fetch the full content of a specific blog post.
@@ -350,8 +367,8 @@ class NogizakaBlogScraper(BaseBlogScraper):
         page_size = 32
         max_pages = MAX_PAGES_SAFETY_CAP
 
+        url = f"{self.base_url}/s/n46/api/list/blog"
         for _ in range(max_pages):
-            url = f"{self.base_url}/s/n46/api/list/blog"
             params: dict[str, str | int] = {
                 "rw": page_size,
                 "st": offset,
@@ -361,15 +378,15 @@ class NogizakaBlogScraper(BaseBlogScraper):
             if member_id:
                 params["ct"] = member_id
 
-            async with self.session.get(url, params=params) as resp:
+            async with self._get(url, params=params) as resp:
                 if resp.status in (404, 410):
                     raise BlogGoneError(f"Blog {blog_id} has been removed (HTTP {resp.status})")
                 if resp.status != 200:
                     raise ValueError(f"Failed to fetch blog list: HTTP {resp.status}")
 
-                text = await resp.text()
+                body = await resp.read()
                 try:
-                    data = parse_jsonp(text)
+                    data = parse_jsonp(body)
                 except (ValueError, json.JSONDecodeError) as e:
                     raise ValueError(f"Failed to parse blog API response: {e}") from e
 
@@ -383,7 +400,6 @@ class NogizakaBlogScraper(BaseBlogScraper):
                         return self._parse_blog_from_api(blog)
 
                 offset += page_size
-                await asyncio.sleep(PAGE_DELAY)
 
         raise ValueError(f"Blog {blog_id} not found in API")
 
@@ -407,18 +423,13 @@ class NogizakaBlogScraper(BaseBlogScraper):
         date_str = blog.get("date", "")
         published_at = parse_jst_datetime(date_str)
 
-        # Extract images from content
-        images: list[str] = []
-        soup = BeautifulSoup(content, "html.parser")
-        for img in soup.select("img"):
-            src = img.get("src", "")
-            if src:
-                images.append(self.normalize_url(src))
-
-        # Also add the main image if present
+        # Main image (if present) first, then images from content, each URL once.
+        # dict keys keep insertion order and dedupe without list scans or inserts.
         main_img = blog.get("img", "")
-        if main_img and main_img not in images:
-            images.insert(0, main_img)
+        seen: dict[str, None] = {main_img: None} if main_img else {}
+        for src in extract_img_srcs(content):
+            seen.setdefault(self.normalize_url(src), None)
+        images = list(seen)
 
         return BlogEntry(
             id=blog_id,
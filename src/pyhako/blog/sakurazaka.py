@@ -2,27 +2,74 @@
 
 from __future__ import annotations
 
-import asyncio
 import re
 from collections.abc import AsyncIterator
 from datetime import datetime
 
 import structlog
-from bs4 import BeautifulSoup
-
-from .base import BaseBlogScraper, BlogEntry, BlogGoneError, MemberInfo
+from lxml import etree
+
+from .base import (
+    BlogEntry,
+    BlogGoneError,
+    HtmlBlogScraper,
+    MemberInfo,
+    element_html,
+    element_text,
+    parse_html_tree,
+    xpath_has_class,
+)
 from .config import (
-    DETAIL_DELAY,
-    FULL_CONTENT_PAGE_DELAY,
-    MAX_PAGES_SAFETY_CAP,
-    PAGE_DELAY,
     parse_jst_datetime,
 )
 
 logger = structlog.get_logger(__name__)
 
+# Compiled once; these run for every link on member/list pages
+_ARTIST_RE = re.compile(r"/s/s46/artist/(\d+)")
+_DETAIL_RE = re.compile(r"/diary/detail/(\d+)")
+
+# Detail page lookups, compiled once and evaluated against a single lxml tree per page
+_OG_TITLE_XPATH = etree.XPath("//meta[@property='og:title']")
+_OG_IMAGE_XPATH = etree.XPath("//meta[@property='og:image']")
+_TITLE_XPATH = etree.XPath(f"//*[{xpath_has_class('title')}]")
+_DATE_XPATH = etree.XPath(f"//*[{xpath_has_class('blog-foot')}]//*[{xpath_has_class('date')}]")
+_NAME_XPATH = etree.XPath(
+    f"//*[{xpath_has_class('name')} or {xpath_has_class('prof-name')} or {xpath_has_class('blog-name')}]"
+)
+# Candidate blog body containers, in order of preference
+_CONTENT_XPATHS = [
+    etree.XPath(f"//*[{xpath_has_class('box-article')}]"),
+    etree.XPath(f"//*[{xpath_has_class('blog-detail-txt')}]"),
+    etree.XPath(f"//*[{xpath_has_class('article-body')}]"),
+    etree.XPath(f"//*[{xpath_has_class('entry-content')}]"),
+    etree.XPath(f"//article//*[{xpath_has_class('txt')}]"),
+]
+_IMG_SRC_XPATH = etree.XPath(".//img/@src")
+
+# Detail page metadata lookups (get_blog_detail_metadata)
+_METADATA_CONTENT_XPATH = etree.XPath(
+    f"(//*[{xpath_has_class('box-article')} or {xpath_has_class('blog-detail-txt')}"
+    f" or {xpath_has_class('article-body')}])[1]"
+)
+
+# Blog list lookups
+_BOX_XPATH = etree.XPath(f"//li[{xpath_has_class('box')}]")
+_DETAIL_HREF_XPATH = etree.XPath("(.//a[contains(@href, '/diary/detail/')])[1]/@href")
+_BOX_DATE_XPATH = etree.XPath(f"(.//*[{xpath_has_class('date')}])[1]")
+_BOX_NAME_XPATH = etree.XPath(f"(.//*[{xpath_has_class('name')}])[1]")
+_BOX_TITLE_XPATH = etree.XPath(f"(.//*[{xpath_has_class('title')} or {xpath_has_class('ttl')} or self::h3])[1]")
+_BOX_THUMBNAIL_XPATH = etree.XPath(f"(.//span[{xpath_has_class('img')}])[1]")
 
-class SakurazakaBlogScraper(BaseBlogScraper):
+# Member list lookups
+_ARTIST_LINK_XPATH = etree.XPath("//a[contains(@href, '/s/s46/artist/')]")
+_FIRST_DIV_XPATH = etree.XPath("(.//div)[1]")
+_FIRST_IMG_ALT_XPATH = etree.XPath("(.//img)[1]/@alt")
+_FIRST_IMG_XPATH = etree.XPath("(.//img)[1]")
+_BACKGROUND_URL_RE = re.compile(r'background-image:\s*url\(["\']?([^"\')\s]+)["\']?\)')
+
+
+class SakurazakaBlogScraper(HtmlBlogScraper):
     """Scraper for Sakurazaka46 official blog.
 
     Uses HTML scraping from sakurazaka46.com.
@@ -46,10 +93,14 @@ class SakurazakaBlogScraper(BaseBlogScraper):
         Returns:
             Dictionary mapping member_id (artist ID) to member_name.
         """
+        cached = self._cached_members()
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}/s/s46/search/artist"
         params = {"ima": "0000"}
 
-        async with self.session.get(url, params=params) as resp:
+        async with self._get(url, params=params) as resp:
             if resp.status != 200:
                 logger.warning(
                     "failed_to_fetch_members",
@@ -59,30 +110,30 @@ class SakurazakaBlogScraper(BaseBlogScraper):
                 return {}
 
             html = await resp.text()
-            soup = BeautifulSoup(html, "html.parser")
-
-            members: dict[str, str] = {}
-            # Look for member links in format /s/s46/artist/{ID}
-            for link in soup.select('a[href*="/s/s46/artist/"]'):
-                href = str(link.get("href", ""))
-                match = re.search(r"/s/s46/artist/(\d+)", href)
-                if match:
-                    member_id = match.group(1)
-                    # Get member name - first div contains kanji, second has hiragana
-                    # We want only the kanji name
-                    name = ""
-                    divs = link.select("div")
-                    if divs:
-                        name = divs[0].get_text(strip=True)
-                    if not name:
-                        # Fallback: try img alt attribute
-                        img = link.select_one("img")
-                        if img:
-                            name = str(img.get("alt", ""))
-                    if name and member_id not in members and name not in self._GROUP_ACCOUNT_NAMES:
-                        members[member_id] = name
-
-            return members
+
+        tree = parse_html_tree(html)
+        members: dict[str, str] = {}
+        # Look for member links in format /s/s46/artist/{ID}
+        for link in _ARTIST_LINK_XPATH(tree):
+            match = _ARTIST_RE.search(link.get("href", ""))
+            if match:
+                member_id = match.group(1)
+                # Get member name - first div contains kanji, second has hiragana
+                # We want only the kanji name
+                name = ""
+                divs = _FIRST_DIV_XPATH(link)
+                if divs:
+                    name = element_text(divs[0])
+                if not name:
+                    # Fallback: try img alt attribute
+                    alts = _FIRST_IMG_ALT_XPATH(link)
+                    if alts:
+                        name = str(alts[0])
+                if name and member_id not in members and name not in self._GROUP_ACCOUNT_NAMES:
+                    members[member_id] = name
+
+        await self._remember_members(members)
+        return members
 
     async def get_members_with_thumbnails(self) -> list[MemberInfo]:
         """Fetch blog members with their profile thumbnail URLs.
@@ -99,7 +150,7 @@ class SakurazakaBlogScraper(BaseBlogScraper):
         url = f"{self.base_url}/s/s46/search/artist"
         params = {"ima": "0000"}
 
-        async with self.session.get(url, params=params) as resp:
+        async with self._get(url, params=params) as resp:
             if resp.status != 200:
                 logger.warning(
                     "failed_to_fetch_members_with_thumbnails",
@@ -109,45 +160,44 @@ class SakurazakaBlogScraper(BaseBlogScraper):
                 return []
 
             html = await resp.text()
-            soup = BeautifulSoup(html, "html.parser")
 
-            # Find all member links in format /s/s46/artist/{ID}
-            for link in soup.select('a[href*="/s/s46/artist/"]'):
-                href = str(link.get("href", ""))
-                match = re.search(r"/s/s46/artist/(\d+)", href)
-                if not match:
-                    continue
-
-                member_id = match.group(1)
-                if member_id in seen_ids:
-                    continue
-                seen_ids.add(member_id)
-
-                # Find the image within the link
-                img = link.select_one("img")
-                thumbnail_url = ""
-                if img:
-                    src = img.get("src", "")
-                    if src:
-                        thumbnail_url = self.normalize_url(src)
-
-                # Get member name - first div contains kanji
-                name = ""
-                divs = link.select("div")
-                if divs:
-                    name = divs[0].get_text(strip=True)
-                if not name and img:
-                    # Fallback: try img alt attribute
-                    name = str(img.get("alt", ""))
-
-                if name and thumbnail_url and name not in self._GROUP_ACCOUNT_NAMES:
-                    members.append(
-                        MemberInfo(
-                            id=member_id,
-                            name=name,
-                            thumbnail_url=thumbnail_url,
-                        )
+        # Find all member links in format /s/s46/artist/{ID}
+        for link in _ARTIST_LINK_XPATH(parse_html_tree(html)):
+            match = _ARTIST_RE.search(link.get("href", ""))
+            if not match:
+                continue
+
+            member_id = match.group(1)
+            if member_id in seen_ids:
+                continue
+            seen_ids.add(member_id)
+
+            # Find the image within the link
+            imgs = _FIRST_IMG_XPATH(link)
+            img = imgs[0] if imgs else None
+            thumbnail_url = ""
+            if img is not None:
+                src = img.get("src", "")
+                if src:
+                    thumbnail_url = self.normalize_url(src)
+
+            # Get member name - first div contains kanji
+            name = ""
+            divs = _FIRST_DIV_XPATH(link)
+            if divs:
+                name = element_text(divs[0])
+            if not name and img is not None:
+                # Fallback: try img alt attribute
+                name = img.get("alt", "")
+
+            if name and thumbnail_url and name not in self._GROUP_ACCOUNT_NAMES:
+                members.append(
+                    MemberInfo(
+                        id=member_id,
+                        name=name,
+                        thumbnail_url=thumbnail_url,
                     )
+                )
 
         return members
 
@@ -178,103 +228,99 @@ class SakurazakaBlogScraper(BaseBlogScraper):
         page = 0
         seen_ids: set[str] = set()
 
+        url = f"{self.base_url}/s/s46/diary/blog/list"
         while page < max_pages:
-            url = f"{self.base_url}/s/s46/diary/blog/list"
             params = {"ima": "0000", "ct": member_id, "page": page}
 
-            async with self.session.get(url, params=params) as resp:
+            async with self._get(url, params=params) as resp:
                 if resp.status != 200:
                     break
 
                 html = await resp.text()
-                soup = BeautifulSoup(html, "html.parser")
 
-                # Find all blog entry boxes
-                boxes = soup.select("li.box")
+            # Find all blog entry boxes
+            boxes = _BOX_XPATH(parse_html_tree(html))
 
-                if not boxes:
-                    break
+            if not boxes:
+                break
 
-                found_new = False
-                for box in boxes:
-                    link = box.select_one('a[href*="/diary/detail/"]')
-                    if not link:
-                        continue
+            found_new = False
+            for box in boxes:
+                hrefs = _DETAIL_HREF_XPATH(box)
+                if not hrefs:
+                    continue
 
-                    href = link.get("href", "")
-                    match = re.search(r"/diary/detail/(\d+)", href)
-                    if not match:
-                        continue
+                href = str(hrefs[0])
+                match = _DETAIL_RE.search(href)
+                if not match:
+                    continue
 
-                    blog_id = match.group(1)
-                    if blog_id in seen_ids:
-                        continue
+                blog_id = match.group(1)
+                if blog_id in seen_ids:
+                    continue
 
-                    # Extract author name from list entry
-                    # Filter out "featured" blogs that don't belong to this member
-                    author_elem = box.select_one(".name")
-                    author_name = author_elem.get_text(strip=True) if author_elem else ""
-                    if member_name and author_name:
-                        # Normalize spaces for comparison (full-width vs half-width)
-                        normalized_author = author_name.replace(" ", "").replace("\u3000", "")
-                        normalized_member = member_name.replace(" ", "").replace("\u3000", "")
-                        if normalized_author != normalized_member:
-                            # Blog belongs to different member, skip
-                            logger.debug(
-                                "skipping_featured_blog",
-                                blog_id=blog_id,
-                                expected=member_name,
-                                actual=author_name,
-                            )
-                            continue
-
-                    seen_ids.add(blog_id)
-                    found_new = True
-
-                    # Parse date from list
-                    date_elem = box.select_one(".date")
-                    date_text = date_elem.get_text(strip=True) if date_elem else ""
-                    published_at = parse_jst_datetime(date_text)
-
-                    if since_date and published_at < since_date:
-                        return
-
-                    # Parse title from list
-                    title_elem = box.select_one(".title, .ttl, h3")
-                    title = title_elem.get_text(strip=True) if title_elem else ""
-
-                    # Extract blog thumbnail from CSS background-image on span.img
-                    # Sakurazaka stores thumbnails in style="background-image: url(...)"
-                    images: list[str] = []
-                    thumbnail_span = box.select_one("span.img")
-                    if thumbnail_span:
-                        style = thumbnail_span.get("style", "")
-                        bg_match = re.search(
-                            r'background-image:\s*url\(["\']?([^"\')\s]+)["\']?\)', style
+                # Extract author name from list entry
+                # Filter out "featured" blogs that don't belong to this member
+                author_elems = _BOX_NAME_XPATH(box)
+                author_name = element_text(author_elems[0]) if author_elems else ""
+                if member_name and author_name:
+                    # Normalize spaces for comparison (full-width vs half-width)
+                    normalized_author = author_name.replace(" ", "").replace("\u3000", "")
+                    normalized_member = member_name.replace(" ", "").replace("\u3000", "")
+                    if normalized_author != normalized_member:
+                        # Blog belongs to different member, skip
+                        logger.debug(
+                            "skipping_featured_blog",
+                            blog_id=blog_id,
+                            expected=member_name,
+                            actual=author_name,
                         )
-                        if bg_match:
-                            images.append(self.normalize_url(bg_match.group(1)))
-
-                    blog_url = self.normalize_url(href)
-
-                    yield BlogEntry(
-                        id=blog_id,
-                        title=title,
-                        content="",  # Empty - fetch with get_blog_detail() when needed
-                        published_at=published_at,
-                        url=blog_url,
-                        images=images,
-                        member_id=member_id,
-                        member_name=author_name,
-                    )
+                        continue
 
-                if not found_new:
-                    break
+                seen_ids.add(blog_id)
+                found_new = True
+
+                # Parse date from list
+                date_elems = _BOX_DATE_XPATH(box)
+                date_text = element_text(date_elems[0]) if date_elems else ""
+                published_at = parse_jst_datetime(date_text)
+
+                if since_date and published_at < since_date:
+                    return
+
+                # Parse title from list
+                title_elems = _BOX_TITLE_XPATH(box)
+                title = element_text(title_elems[0]) if title_elems else ""
+
+                # Extract blog thumbnail from CSS background-image on span.img
+                # Sakurazaka stores thumbnails in style="background-image: url(...)"
+                images: list[str] = []
+                thumbnail_spans = _BOX_THUMBNAIL_XPATH(box)
+                if thumbnail_spans:
+                    style = thumbnail_spans[0].get("style", "")
+                    bg_match = _BACKGROUND_URL_RE.search(style)
+                    if bg_match:
+                        images.append(self.normalize_url(bg_match.group(1)))
+
+                blog_url = self.normalize_url(href)
+
+                yield BlogEntry(
+                    id=blog_id,
+                    title=title,
+                    content="",  # Empty - fetch with get_blog_detail() when needed
+                    published_at=published_at,
+                    url=blog_url,
+                    images=images,
+                    member_id=member_id,
+                    member_name=author_name,
+                )
+
+            if not found_new:
+                break
 
-                page += 1
-                await asyncio.sleep(PAGE_DELAY)
+            page += 1
 
-    async def get_blogs(
+    def get_blogs(
         self,
         member_id: str,
         since_date: datetime | None = None,
@@ -291,86 +337,45 @@ class SakurazakaBlogScraper(BaseBlogScraper):
         Yields:
             BlogEntry objects for each blog post found.
         """
-        page = 0
-        seen_ids: set[str] = set()
-
-        while page < MAX_PAGES_SAFETY_CAP:
-            url = f"{self.base_url}/s/s46/diary/blog/list"
-            params = {"ima": "0000", "ct": member_id, "page": page}
-
-            async with self.session.get(url, params=params) as resp:
-                if resp.status != 200:
-                    logger.warning(
-                        "blog_list_fetch_failed",
-                        status=resp.status,
-                        member_id=member_id,
-                        page=page,
-                    )
-                    break
-
-                html = await resp.text()
-                soup = BeautifulSoup(html, "html.parser")
-
-                # Find all blog entry boxes (specific to member's blog list)
-                # Use li.box to avoid picking up unrelated blog links
-                boxes = soup.select("li.box")
-
-                if not boxes:
-                    break
+        url = f"{self.base_url}/s/s46/diary/blog/list"
+        return self._track_last_seen(member_id, self._iter_listed_blogs(url, member_id, since_date))
 
-                found_new = False
-                for box in boxes:
-                    link = box.select_one('a[href*="/diary/detail/"]')
-                    if not link:
-                        continue
-
-                    href = link.get("href", "")
-                    match = re.search(r"/diary/detail/(\d+)", href)
-                    if not match:
-                        continue
-
-                    blog_id = match.group(1)
-                    if blog_id in seen_ids:
-                        continue
-
-                    seen_ids.add(blog_id)
-                    found_new = True
-
-                    # Extract preview data from list for early date filtering
-                    date_elem = box.select_one(".date")
-                    date_text = date_elem.get_text(strip=True) if date_elem else ""
-
-                    # Check date filter early (from preview)
-                    if since_date and date_text:
-                        preview_date = parse_jst_datetime(date_text)
-                        if preview_date < since_date:
-                            return
-
-                    # Fetch full blog detail
-                    try:
-                        entry = await self.get_blog_detail(blog_id)
-                        entry.member_id = member_id
-
-                        # Check date filter again with actual date
-                        if since_date and entry.published_at < since_date:
-                            return
-
-                        yield entry
-
-                        # Polite delay between requests
-                        await asyncio.sleep(DETAIL_DELAY)
-                    except ValueError as e:
-                        logger.warning(
-                            "blog_detail_fetch_failed",
-                            blog_id=blog_id,
-                            error=str(e),
-                        )
-
-                if not found_new:
-                    break
-
-                page += 1
-                await asyncio.sleep(FULL_CONTENT_PAGE_DELAY)
+    def _parse_blog_list_page(
+        self,
+        html: str,
+        seen_ids: set[str],
+        since_date: datetime | None,
+    ) -> tuple[list[str], bool] | None:
+        """Collect new detail IDs from an li.box list page, stopping at since_date by preview date."""
+        # Find all blog entry boxes (specific to member's blog list)
+        # Use li.box to avoid picking up unrelated blog links
+        boxes = _BOX_XPATH(parse_html_tree(html))
+        if not boxes:
+            return None
+
+        blog_ids: list[str] = []
+        for box in boxes:
+            hrefs = _DETAIL_HREF_XPATH(box)
+            match = _DETAIL_RE.search(hrefs[0]) if hrefs else None
+            if not match:
+                continue
+
+            blog_id = match.group(1)
+            if blog_id in seen_ids:
+                continue
+            seen_ids.add(blog_id)
+
+            # Check date filter early, from the list preview
+            if since_date:
+                date_elems = _BOX_DATE_XPATH(box)
+                date_text = element_text(date_elems[0]) if date_elems else ""
+                if date_text and parse_jst_datetime(date_text) < since_date:
+                    return blog_ids, True
+
+            blog_ids.append(blog_id)
+
+        # A page with nothing new means the list has stopped advancing
+        return blog_ids, not blog_ids
 
     async def get_blog_detail(self, blog_id: str, member_id: str | None = None) -> BlogEntry:
         """Fetch the full content of a specific blog post.
@@ -390,7 +395,7 @@ class SakurazakaBlogScraper(BaseBlogScraper):
         url = f"{self.base_url}/s/s46/diary/detail/{blog_id}"
         params = {"ima": "0000", "cd": "blog"}
 
-        async with self.session.get(url, params=params) as resp:
+        async with self._get(url, params=params) as resp:
             if resp.status in (404, 410):
                 raise BlogGoneError(f"Blog {blog_id} has been removed (HTTP {resp.status})")
             if resp.status != 200:
@@ -413,63 +418,52 @@ class SakurazakaBlogScraper(BaseBlogScraper):
         Raises:
             ValueError: If required elements are not found.
         """
-        soup = BeautifulSoup(html, "html.parser")
+        tree = parse_html_tree(html)
 
         # Try og:meta tags first (most reliable)
         # og:title includes site suffix like "ブログ名 | 櫻坂46 メンバー名 公式ブログ"
         # Strip everything from the last " | " to get just the blog title
-        title_meta = soup.select_one('meta[property="og:title"]')
+        title_metas = _OG_TITLE_XPATH(tree)
         title = ""
-        if title_meta:
-            title = title_meta.get("content", "")
+        if title_metas:
+            title = title_metas[0].get("content", "")
             if " | " in title:
                 title = title.rsplit(" | ", 1)[0]
         else:
             # Fallback to page title structure
-            title_elem = soup.select_one(".title, h1.title, h2.title")
-            title = title_elem.get_text(strip=True) if title_elem else ""
+            title_elems = _TITLE_XPATH(tree)
+            title = element_text(title_elems[0]) if title_elems else ""
 
         # Extract date — must use .blog-foot .date to get the footer date
         # with time (e.g. "2026/02/28 21:05"), NOT the calendar header .date
         # which only contains the day number (e.g. "28")
-        date_elem = soup.select_one(".blog-foot .date")
-        date_text = date_elem.get_text(strip=True) if date_elem else ""
+        date_elems = _DATE_XPATH(tree)
+        date_text = element_text(date_elems[0]) if date_elems else ""
         published_at = parse_jst_datetime(date_text)
 
         # Extract member name
-        name_elem = soup.select_one(".name, .prof-name, .blog-name")
-        member_name = name_elem.get_text(strip=True) if name_elem else ""
-
-        # Extract content - try several possible selectors
-        content_selectors = [
-            ".box-article",
-            ".blog-detail-txt",
-            ".article-body",
-            ".entry-content",
-            "article .txt",
-        ]
+        name_elems = _NAME_XPATH(tree)
+        member_name = element_text(name_elems[0]) if name_elems else ""
 
+        # Extract content - try several possible containers
         content = ""
         images: list[str] = []
 
-        for selector in content_selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem:
+        for content_xpath in _CONTENT_XPATHS:
+            content_elems = content_xpath(tree)
+            if content_elems:
                 # Normalize URLs within the HTML content
-                content = self.normalize_html_urls(str(content_elem))
+                content = self.normalize_html_urls(element_html(content_elems[0]))
 
                 # Extract image URLs
-                for img in content_elem.select("img"):
-                    src = img.get("src", "")
-                    if src:
-                        images.append(self.normalize_url(src))
+                images = [self.normalize_url(src) for src in _IMG_SRC_XPATH(content_elems[0]) if src]
                 break
 
         # Also check for og:image
         if not images:
-            og_image = soup.select_one('meta[property="og:image"]')
-            if og_image:
-                img_url = og_image.get("content", "")
+            og_images = _OG_IMAGE_XPATH(tree)
+            if og_images:
+                img_url = og_images[0].get("content", "")
                 if img_url:
                     images.append(self.normalize_url(img_url))
 
@@ -501,19 +495,19 @@ class SakurazakaBlogScraper(BaseBlogScraper):
         params = {"ima": "0000", "cd": "blog"}
 
         try:
-            async with self.session.get(url, params=params) as resp:
+            async with self._get(url, params=params) as resp:
                 if resp.status != 200:
                     return None, None, None
 
                 html = await resp.text()
-                soup = BeautifulSoup(html, "html.parser")
+                tree = parse_html_tree(html)
 
                 # Extract title from og:title (most reliable, full text)
                 # og:title includes site suffix: "ブログ名 | 櫻坂46 メンバー名 公式ブログ"
                 title = None
-                title_meta = soup.select_one('meta[property="og:title"]')
-                if title_meta:
-                    raw_title = title_meta.get("content", "")
+                title_metas = _OG_TITLE_XPATH(tree)
+                if title_metas:
+                    raw_title = title_metas[0].get("content", "")
                     if raw_title and " | " in raw_title:
                         title = raw_title.rsplit(" | ", 1)[0] or None
                     else:
@@ -522,25 +516,25 @@ class SakurazakaBlogScraper(BaseBlogScraper):
                 # Extract precise datetime — must use .blog-foot .date to get
                 # the footer date with time (e.g. "2026/02/28 21:05"),
                 # NOT the calendar header .date which only has the day number
-                date_elem = soup.select_one(".blog-foot .date")
-                date_text = date_elem.get_text(strip=True) if date_elem else ""
+                date_elems = _DATE_XPATH(tree)
+                date_text = element_text(date_elems[0]) if date_elems else ""
                 published_at = parse_jst_datetime(date_text) if date_text else None
 
                 # Extract thumbnail - try og:image first (most reliable)
                 thumbnail = None
-                og_image = soup.select_one('meta[property="og:image"]')
-                if og_image:
-                    img_url = og_image.get("content", "")
+                og_images = _OG_IMAGE_XPATH(tree)
+                if og_images:
+                    img_url = og_images[0].get("content", "")
                     if img_url:
                         thumbnail = self.normalize_url(img_url)
 
                 # Fallback: first image in content
                 if not thumbnail:
-                    content_elem = soup.select_one(".box-article, .blog-detail-txt, .article-body")
-                    if content_elem:
-                        img = content_elem.select_one("img")
-                        if img:
-                            src = img.get("src", "")
+                    content_elems = _METADATA_CONTENT_XPATH(tree)
+                    if content_elems:
+                        imgs = _FIRST_IMG_XPATH(content_elems[0])
+                        if imgs:
+                            src = imgs[0].get("src", "")
                             if src:
                                 thumbnail = self.normalize_url(src)
 
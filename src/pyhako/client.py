@@ -1,16 +1,29 @@
 import asyncio
+import os
+import sys
+from collections.abc import Mapping
 from enum import Enum
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Optional, Union
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Optional, Union
+from urllib.parse import urlsplit
 
 import aiofiles
 import aiohttp
+import orjson
 import structlog
+from yarl import URL
 
+from .config import MEDIA_DOWNLOAD_CONCURRENCY_INITIAL, MEDIA_DOWNLOAD_WINDOW_INITIAL
 from .credentials import get_token_manager
 from .exceptions import ApiError, RefreshFailedError, SessionExpiredError
+from .http import CONNECTOR_LIMIT_PER_HOST, RateLimiter, create_connector, get_with_backoff
 from .utils import get_jwt_remaining_seconds, get_media_extension
 
+if TYPE_CHECKING:
+    from .auth import BrowserAuth
+
 logger = structlog.get_logger()
 
 class Group(Enum):
@@ -19,7 +32,7 @@ class Group(Enum):
     SAKURAZAKA46 = "sakurazaka46"
     YODEL = "yodel"
 
-GROUP_CONFIG = {
+_GROUP_CONFIG: dict[Group, dict[str, Any]] = {
     Group.HINATAZAKA46: {
         "api_base": "https://api.message.hinatazaka46.com/v2",
         "app_id": "jp.co.sonymusic.communication.keyakizaka 2.5",
@@ -50,6 +63,53 @@ GROUP_CONFIG = {
     }
 }
 
+# Derived once here so hot paths (e.g. browser response handlers) never re-parse URLs
+for _config in _GROUP_CONFIG.values():
+    _config["api_host"] = urlsplit(_config["api_base"]).netloc
+del _config
+
+# Shared by every Client and BrowserAuth call: expose read-only views so no caller
+# can change another instance's endpoints by mutating its config
+GROUP_CONFIG: Mapping[Group, Mapping[str, Any]] = MappingProxyType(
+    {group: MappingProxyType(config) for group, config in _GROUP_CONFIG.items()}
+)
+
+# Bytes read from the response per write while streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Timeouts for the client's own session; no total cap so long media downloads are not cut off
+SESSION_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
+# Message type -> media subdirectory; other types (text) have no media to download
+MEDIA_DIR_BY_TYPE = {
+    'image': 'picture',
+    'picture': 'picture',
+    'video': 'video',
+    'movie': 'video',
+    'voice': 'voice',
+}
+# Default cap on a client's concurrent API GET requests; keeps fan-out under the
+# connector's per-host limit and away from server-side throttling
+MAX_API_CONCURRENCY = 16
+# Each get_messages() call requests timeline pages at most this many times per second
+# (the old fixed 0.5 s sleep, minus the padding); concurrent timelines are paced separately
+# and bounded overall by max_concurrency
+TIMELINE_PAGE_RATE = 2
+# Statuses treated as throttling: API calls retry only 429 (5xx surfaces as ApiError),
+# media downloads also ride out a CDN's 503
+API_RETRY_STATUSES = frozenset({429})
+DOWNLOAD_RETRY_STATUSES = frozenset({429, 503})
+
+
+def _import_browser_auth() -> "type[BrowserAuth]":
+    """Import ``BrowserAuth`` on demand; the first call loads Playwright."""
+    from .auth import BrowserAuth
+    return BrowserAuth
+
+
+def _json_dumps(obj: Any) -> str:
+    """orjson serializer for the client's own session (aiohttp expects ``str``)."""
+    return orjson.dumps(obj).decode()
+
+
 class Client:
     """
     Async client for Sakamichi Groups Message API.
@@ -63,6 +123,10 @@ class Client:
         refresh_token (str): OAuth2 refresh token.
         cookies (dict): Session cookies used for token refreshing.
         token_manager (TokenManager): Optional manager for persistent underlying storage.
+
+    Every request method takes an aiohttp session; pass ``None`` to use the client's
+    own pooled session, and release it with ``await client.close()`` or by using the
+    client as an async context manager.
     """
 
     def __init__(
@@ -74,7 +138,8 @@ class Client:
         app_id: Optional[str] = None,
         user_agent: Optional[str] = None,
         auth_dir: Optional[Union[str, Path]] = None,
-        use_token_storage: bool = False
+        use_token_storage: bool = False,
+        max_concurrency: int = MAX_API_CONCURRENCY
     ):
         """
         Initialize the client.
@@ -87,6 +152,7 @@ class Client:
             app_id: The X-Talk-App-ID header value (optional, defaults to group config).
             user_agent: The User-Agent header value (optional, defaults to hardcoded).
             use_token_storage: If True, attempts to load/save credentials using system keyring (or file fallback).
+            max_concurrency: Maximum number of API GET requests this client has in flight at once.
 
         Raises:
             ValueError: If an invalid group string is provided.
@@ -111,9 +177,9 @@ class Client:
                         access_token = saved.get("access_token")
                         refresh_token = saved.get("refresh_token") or refresh_token
                         cookies = saved.get("cookies") or cookies
-                        logger.info(f"Loaded credentials for {self.group.value} from storage.")
+                        logger.info("Loaded credentials from storage", group=self.group.value)
             except Exception as e:
-                logger.warning(f"Failed to initialize token storage: {e}")
+                logger.warning("Failed to initialize token storage", error=str(e))
 
         self.access_token = access_token
         self.refresh_token = refresh_token
@@ -122,6 +188,14 @@ class Client:
         self.app_id = app_id or self.config["app_id"]
         self.api_base = self.config["api_base"]
         self.auth_dir = Path(auth_dir) if auth_dir else None
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Download directories already created by this client
+        self._ensured_dirs: set[Path] = set()
+        # endpoint -> parsed URL, so repeated GETs (e.g. timeline pages) skip URL parsing
+        self._api_urls: dict[str, URL] = {}
+        self.max_concurrency = max(1, max_concurrency)
+        # Created on first request so it belongs to the running event loop
+        self._request_sem: Optional[asyncio.Semaphore] = None
 
         self.headers = {
             "x-talk-app-id": self.app_id,
@@ -133,9 +207,40 @@ class Client:
             "accept": "application/json",
             "accept-language": "ja,en-US;q=0.9,en;q=0.8"
         }
+        # Token refresh sends the same headers minus Authorization; built once here
+        self._refresh_headers = dict(self.headers)
         if self.access_token:
             self.headers["Authorization"] = f"Bearer {self.access_token}"
 
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The client's own session, created on first access; used when a method is passed ``session=None``."""
+        if self._session is None or self._session.closed:
+            # Pooled connector: API calls and downloads reuse the same TCP/TLS connections
+            self._session = aiohttp.ClientSession(
+                connector=create_connector(), timeout=SESSION_TIMEOUT, json_serialize=_json_dumps
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the client's own session; sessions passed in by the caller are left open."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "Client":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    def _api_url(self, endpoint: str) -> URL:
+        """Parsed ``api_base + endpoint``, cached per client."""
+        url = self._api_urls.get(endpoint)
+        if url is None:
+            url = self._api_urls[endpoint] = URL(f"{self.api_base}{endpoint}")
+        return url
+
     async def update_token(self, new_token: str, new_refresh_token: Optional[str] = None) -> None:
         """
         Update the instance's access token and headers.
@@ -153,14 +258,16 @@ class Client:
 
         if self.token_manager:
             try:
-                self.token_manager.save_session(
+                # Keyring backends do blocking IPC; keep the event loop free
+                await asyncio.to_thread(
+                    self.token_manager.save_session,
                     self.group.value,
                     self.access_token,
                     self.refresh_token,
                     self.cookies
                 )
             except Exception as e:
-                logger.warning(f"Failed to auto-save refreshed token: {e}")
+                logger.warning("Failed to auto-save refreshed token", error=str(e))
 
     def save_session(self) -> None:
         """Manually save current session to storage if configured."""
@@ -172,12 +279,16 @@ class Client:
                 self.cookies
             )
 
-    async def fetch_json(self, session: aiohttp.ClientSession, endpoint: str, params: Optional[dict[str, Any]] = None) -> Optional[dict[str, Any]]:
+    async def asave_session(self) -> None:
+        """Like ``save_session()``, but runs the blocking storage write in a worker thread."""
+        await asyncio.to_thread(self.save_session)
+
+    async def fetch_json(self, session: Optional[aiohttp.ClientSession], endpoint: str, params: Optional[dict[str, Any]] = None) -> Optional[dict[str, Any]]:
         """
         Helper method to perform JSON GET requests.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             endpoint: API endpoint path (e.g. "/groups").
             params: Query parameters.
 
@@ -187,46 +298,51 @@ class Client:
         Raises:
             ApiError: If the API returns a server error (5xx) or other unhandled status.
         """
-        url = f"{self.api_base}{endpoint}"
+        session = session or self.session
+        url = self._api_url(endpoint)
         logger.debug("API GET request", endpoint=endpoint, params=params)
-        try:
-            async with session.get(url, headers=self.headers, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    logger.debug("API GET success", endpoint=endpoint, status=200)
-                    return data
-                elif resp.status == 401:
-                    logger.warning("API returned 401 Unauthorized", endpoint=endpoint, will_retry=True)
-                    if await self.refresh_access_token(session):
-                        # Retry the request with new token
-                        async with session.get(url, headers=self.headers, params=params) as resp_retry:
-                            if resp_retry.status == 200:
-                                return await resp_retry.json()
-                            elif resp_retry.status == 401:
-                                logger.warning(f"Unauthorized at {endpoint} even after refresh.")
-                                return None
-                            elif resp_retry.status >= 500:
-                                raise ApiError(f"Server error {resp_retry.status}", resp_retry.status)
-                    return None
-                elif resp.status >= 500:
-                    logger.error(f"Server error {resp.status} at {endpoint}")
-                    raise ApiError(f"Server error {resp.status}", resp.status)
-                else:
-                    logger.warning(f"Unexpected status {resp.status} at {endpoint}")
-                    return None
-        except ApiError:
-            raise
-        except SessionExpiredError as e:
-            logger.debug(f"Session expired during request to {endpoint}: {e}")
-            raise
-        except aiohttp.ClientError as e:
-            logger.error(f"Network error fetching {url}: {e}")
-            raise ApiError(f"Network error: {e}") from e
-        except Exception as e:
-            logger.error(f"Unexpected error fetching {url}: {e}")
-            return None
+        if self._request_sem is None:
+            self._request_sem = asyncio.Semaphore(self.max_concurrency)
+        async with self._request_sem:
+            try:
+                request = get_with_backoff(session, url, API_RETRY_STATUSES, headers=self.headers, params=params)
+                async with request as resp:
+                    if resp.status == 200:
+                        data = await resp.json(loads=orjson.loads)
+                        logger.debug("API GET success", endpoint=endpoint, status=200)
+                        return data
+                    elif resp.status == 401:
+                        logger.warning("API returned 401 Unauthorized", endpoint=endpoint, will_retry=True)
+                        if await self.refresh_access_token(session):
+                            # Retry the request with new token
+                            async with session.get(url, headers=self.headers, params=params) as resp_retry:
+                                if resp_retry.status == 200:
+                                    return await resp_retry.json(loads=orjson.loads)
+                                elif resp_retry.status == 401:
+                                    logger.warning("Unauthorized even after refresh", endpoint=endpoint)
+                                    return None
+                                elif resp_retry.status >= 500:
+                                    raise ApiError(f"Server error {resp_retry.status}", resp_retry.status)
+                        return None
+                    elif resp.status >= 500:
+                        logger.error("API server error", endpoint=endpoint, status=resp.status)
+                        raise ApiError(f"Server error {resp.status}", resp.status)
+                    else:
+                        logger.warning("Unexpected API status", endpoint=endpoint, status=resp.status)
+                        return None
+            except ApiError:
+                raise
+            except SessionExpiredError as e:
+                logger.debug("Session expired during request", endpoint=endpoint, error=str(e))
+                raise
+            except aiohttp.ClientError as e:
+                logger.error("Network error fetching", url=str(url), error=str(e))
+                raise ApiError(f"Network error: {e}") from e
+            except Exception as e:
+                logger.error("Unexpected error fetching", url=str(url), error=str(e))
+                return None
 
-    async def refresh_access_token(self, session: aiohttp.ClientSession) -> bool:
+    async def refresh_access_token(self, session: Optional[aiohttp.ClientSession] = None) -> bool:
         """
         Attempt to refresh the access token using stored cookies.
 
@@ -252,11 +368,11 @@ class Client:
             logger.warning("No credentials (refresh_token/cookies/auth_dir) available for refresh.")
             return False
 
-        url = f"{self.api_base}/update_token"
+        session = session or self.session
+        url = self._api_url("/update_token")
 
         # Headers for refresh: exclude Authorization, but keep Platform/Origin/Referer
-        refresh_headers = self.headers.copy()
-        refresh_headers.pop("Authorization", None)
+        refresh_headers = self._refresh_headers
 
 
         # 1. Try refresh_token if available (Plan A - Unused in Web Flow, kept for future mobile support)
@@ -266,16 +382,16 @@ class Client:
             try:
                 async with session.post(url, headers=refresh_headers, json={"refresh_token": self.refresh_token}) as resp:
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = await resp.json(loads=orjson.loads)
                         new_at = data.get('access_token')
                         if new_at:
                             await self.update_token(new_at, data.get('refresh_token'))
                             logger.info("Token refreshed successfully via refresh_token.")
                             return True
                     elif resp.status in (400, 401):
-                        logger.warning(f"refresh_token failed (Status {resp.status}). Falling back...")
+                        logger.warning("refresh_token failed, falling back", status=resp.status)
             except Exception as e:
-                 logger.warning(f"Error during refresh_token attempt: {e}")
+                 logger.warning("Error during refresh_token attempt", error=str(e))
 
         # 2. Try cookies (Web Session) if available
         if self.cookies:
@@ -300,7 +416,7 @@ class Client:
                     )
 
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = await resp.json(loads=orjson.loads)
                         new_token = data.get('access_token')
                         if new_token:
                             old_expiry = self.get_token_expiry_seconds()
@@ -328,7 +444,7 @@ class Client:
                             return True
                     elif resp.status == 400:
                         # Session invalidated (e.g., user logged in from another browser)
-                        body = await resp.json()
+                        body = await resp.json(loads=orjson.loads)
                         logger.warning(
                             "Cookie refresh returned 400",
                             response_code=body.get('code'),
@@ -340,7 +456,7 @@ class Client:
                                 "Your session has been invalidated. "
                                 "This usually happens when you log in from another browser."
                             )
-                        logger.warning(f"Cookie refresh failed: {body}")
+                        logger.warning("Cookie refresh failed", response_body=body)
                     elif resp.status == 401:
                         logger.warning("Cookie refresh returned 401 - session cookies may be expired")
                     else:
@@ -353,30 +469,38 @@ class Client:
             except SessionExpiredError:
                 raise
             except Exception as e:
-                logger.error(f"Cookie refresh attempt failed with exception: {e}", exc_info=True)
+                logger.error("Cookie refresh attempt failed with exception", error=str(e), exc_info=True)
 
         # 3. Try Headless Browser (Plan C)
         if self.auth_dir and self.auth_dir.exists():
             try:
-                # Lazy import to avoid circular dependency
-                from .auth import BrowserAuth
+                # Lazy import (auth imports this module, and Playwright is heavy); the
+                # first one loads Playwright, so keep it off the event loop
+                if "pyhako.auth" in sys.modules:
+                    BrowserAuth = _import_browser_auth()
+                else:
+                    BrowserAuth = await asyncio.to_thread(_import_browser_auth)
                 logger.info("Attempting headless browser refresh (Plan C)...")
 
                 # Check if playwright is installed by trying import, though BrowserAuth import essentially checked it
-                creds = await BrowserAuth.refresh_token_headless(self.group, self.auth_dir)
+                creds = await BrowserAuth.refresh_token_headless(
+                    self.group,
+                    self.auth_dir,
+                    token_manager=self.token_manager,
+                    stale_token=self.access_token,
+                )
                 if creds:
                     # Update local state
                     await self.update_token(creds['access_token'])
                     self.cookies = creds.get('cookies', {})
 
                     # Persist immediately
-                    if self.token_manager:
-                        self.token_manager.save_session(self.group.value, self.access_token, self.refresh_token, self.cookies)
+                    await self.asave_session()
 
                     logger.info("Headless refresh successful!")
                     return True
             except Exception as e:
-                logger.warning(f"Headless refresh failed: {e}")
+                logger.warning("Headless refresh failed", error=str(e))
 
         # All refresh plans exhausted - this is unexpected and should be reported
         logger.error("All token refresh plans failed - raising RefreshFailedError")
@@ -408,7 +532,7 @@ class Client:
 
     async def refresh_if_needed(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession] = None,
         min_seconds_remaining: int = 300
     ) -> bool:
         """
@@ -418,7 +542,7 @@ class Client:
         the token is still valid for a reasonable time.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             min_seconds_remaining: Threshold in seconds. Refresh if token
                 expires within this time. Default: 300 (5 minutes).
 
@@ -467,12 +591,16 @@ class Client:
         )
         return False
 
-    async def get_groups(self, session: aiohttp.ClientSession, include_inactive: bool = False) -> list[dict[str, Any]]:
+    async def get_groups(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        include_inactive: bool = False
+    ) -> list[dict[str, Any]]:
         """
         Fetch all subscribed groups (artists).
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             include_inactive: If True, includes expired/suspended subscriptions
                               for open groups.
 
@@ -487,33 +615,25 @@ class Client:
         if not groups:
             return []
 
-        filtered = []
-        for g in groups:
-            # Always include closed groups for graduation detection.
-            # Callers must skip syncing these (timeline/members return 404).
-            if g.get('state') == 'closed':
-                filtered.append(g)
-                continue
-
-            # Open groups: check subscription state
-            sub = g.get('subscription')
-            sub_state = sub.get('state') if sub else None
-
-            if sub_state == 'active':
-                filtered.append(g)
-            elif include_inactive and sub_state is not None:
-                # Include expired/suspended open groups the user previously subscribed to.
-                # Skip groups with no subscription (never subscribed — avoids pulling
-                # all unsubscribed orgs when organization_id is omitted for Yodel).
-                filtered.append(g)
-        return filtered
-
-    async def get_members(self, session: aiohttp.ClientSession, group_id: int) -> list[dict[str, Any]]:
+        # Always include closed groups for graduation detection; callers must skip
+        # syncing these (timeline/members return 404). Open groups need an active
+        # subscription, or with include_inactive any subscription state at all
+        # (expired/suspended). Groups with no subscription were never subscribed
+        # and are skipped, which avoids pulling all unsubscribed orgs when
+        # organization_id is omitted for Yodel.
+        return [
+            g for g in groups
+            if g.get('state') == 'closed'
+            or (sub_state := (g.get('subscription') or {}).get('state')) == 'active'
+            or (include_inactive and sub_state is not None)
+        ]
+
+    async def get_members(self, session: Optional[aiohttp.ClientSession], group_id: int) -> list[dict[str, Any]]:
         """
         Fetch all members (timelines) within a group.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             group_id: The ID of the group/artist.
 
         Returns:
@@ -524,7 +644,7 @@ class Client:
 
     async def get_messages(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         group_id: int,
         since_id: Optional[int] = None,
         max_id: Optional[int] = None,
@@ -535,7 +655,7 @@ class Client:
         Automatically handles pagination to retrieve all messages newer than `since_id`.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             group_id: The ID of the group/artist.
             since_id: The message ID to start fetching from (exclusive).
             max_id: Ignored by API, kept for compatibility/filtering.
@@ -552,21 +672,23 @@ class Client:
         """
         all_messages: dict[int, dict[str, Any]] = {}
         page = 0
-        current_continuation = None
+        prev_continuation = None
         since_timestamp: Optional[str] = None
 
-        while True:
-            params: dict[str, Any] = {
-                "count": 200,
-                "order": "desc"
-            }
-            if current_continuation:
-                params["continuation"] = current_continuation
-
-            if max_id and page == 0 and not current_continuation:
-                params["max_id"] = max_id
+        # Built once; only the continuation changes from page to page
+        endpoint = f"/groups/{group_id}/timeline"
+        params: dict[str, Any] = {
+            "count": 200,
+            "order": "desc"
+        }
+        if max_id:
+            params["max_id"] = max_id
+        page_limiter = RateLimiter(TIMELINE_PAGE_RATE)
 
-            data = await self.fetch_json(session, f"/groups/{group_id}/timeline", params)
+        while True:
+            # Token bucket rather than a fixed sleep: slow pages are not padded further
+            await page_limiter.acquire()
+            data = await self.fetch_json(session, endpoint, params)
             if not data:
                 if page == 0 and await self.refresh_access_token(session):
                     # Retry once if token was refreshed on first page
@@ -574,11 +696,18 @@ class Client:
                 break
 
             messages = data.get('messages', [])
+            if not messages:
+                break
 
-            # Warn about messages with unusually low IDs (potential API issues)
+            # Collect ALL messages first, filter by since_id later
+            # This is necessary because messages are ordered by published_at, not id
+            found_since_id = False
             for m in messages:
-                msg_id = m.get('id', 0)
-                if msg_id < 100000:  # Suspicious low ID
+                msg_id = m['id']
+                all_messages[msg_id] = m
+
+                # Warn about messages with unusually low IDs (potential API issues)
+                if msg_id < 100000:
                     logger.warning(
                         "API returned suspicious low-ID message",
                         message_id=msg_id,
@@ -589,15 +718,6 @@ class Client:
                         published_at=m.get('published_at'),
                         raw_keys=list(m.keys())
                     )
-            if not messages:
-                break
-
-            # Collect ALL messages first, filter by since_id later
-            # This is necessary because messages are ordered by published_at, not id
-            found_since_id = False
-            for m in messages:
-                msg_id = m['id']
-                all_messages[msg_id] = m
 
                 # Track the timestamp of since_id message when we find it
                 if since_id and msg_id == since_id:
@@ -625,24 +745,29 @@ class Client:
                     break
 
             current_continuation = data.get('continuation')
-            if not current_continuation or current_continuation == params.get("continuation"):
+            if not current_continuation or current_continuation == prev_continuation:
                 break
+            prev_continuation = current_continuation
+            # max_id only applies to the first page
+            params.pop("max_id", None)
+            params["continuation"] = current_continuation
 
             page += 1
-            await asyncio.sleep(0.5)
 
-        # Filter to only messages with id > since_id
+        # Filter to only messages with id > since_id while building the result list
         if since_id:
-            all_messages = {k: v for k, v in all_messages.items() if k > since_id}
-
-        return sorted(all_messages.values(), key=lambda x: x['id'])
+            result = [m for msg_id, m in all_messages.items() if msg_id > since_id]
+        else:
+            result = list(all_messages.values())
+        result.sort(key=itemgetter('id'))
+        return result
 
-    async def download_file(self, session: aiohttp.ClientSession, url: str, filepath: Path, timestamp: Optional[str] = None) -> bool:
+    async def download_file(self, session: Optional[aiohttp.ClientSession], url: str, filepath: Path, timestamp: Optional[str] = None) -> bool:
         """
         Download a file from a URL to the local filesystem.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             url: The download URL.
             filepath: Destination Path object.
             timestamp: Optional ISO timestamp (unused currently, reserved for future use).
@@ -653,25 +778,58 @@ class Client:
         if not url or filepath.exists():
             return True
 
+        # Stream into a side file and move it into place once complete, so memory
+        # stays bounded and an interrupted download never leaves a truncated file
+        # that the exists() check above would later treat as done. A .part left by
+        # an earlier attempt is resumed with a Range request.
+        part_path = filepath.with_name(filepath.name + ".part")
+        session = session or self.session
         try:
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    async with aiofiles.open(filepath, 'wb') as f:
-                        await f.write(await resp.read())
+            if filepath.parent not in self._ensured_dirs:
+                await asyncio.to_thread(filepath.parent.mkdir, parents=True, exist_ok=True)
+                self._ensured_dirs.add(filepath.parent)
+            try:
+                resume_from = part_path.stat().st_size
+            except FileNotFoundError:
+                resume_from = 0
+            headers = {"Range": f"bytes={resume_from}-"} if resume_from else None
+
+            async with get_with_backoff(session, url, DOWNLOAD_RETRY_STATUSES, headers=headers) as resp:
+                if resp.status == 200 or (
+                    resp.status == 206
+                    and resp.headers.get("Content-Range", "").startswith(f"bytes {resume_from}-")
+                ):
+                    # 200 means the server ignored the Range header: start over
+                    mode = 'ab' if resp.status == 206 else 'wb'
+                    async with aiofiles.open(part_path, mode) as f:
+                        async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            await f.write(chunk)
+                    os.replace(part_path, filepath)
                     return True
-                else:
-                    logger.warning(f"Download failed {resp.status} for {url}")
+                if (
+                    resume_from
+                    and resp.status == 416
+                    and resp.headers.get("Content-Range", "") == f"bytes */{resume_from}"
+                ):
+                    # The .part is already complete: an earlier run died before moving it into place
+                    os.replace(part_path, filepath)
+                    return True
+                logger.warning("Download failed", url=url, status=resp.status)
+                if resume_from and resp.status in (206, 416):
+                    # The partial file does not line up with the server's copy
+                    part_path.unlink(missing_ok=True)
         except Exception as e:
-            logger.error(f"Error downloading {url}: {e}")
+            logger.error("Error downloading", url=url, error=str(e))
+            # The directory may have been removed underneath us; recreate it next time
+            self._ensured_dirs.discard(filepath.parent)
         return False
 
-    async def download_message_media(self, session: aiohttp.ClientSession, message: dict[str, Any], output_dir: Path) -> Optional[Path]:
+    async def download_message_media(self, session: Optional[aiohttp.ClientSession], message: dict[str, Any], output_dir: Path) -> Optional[Path]:
         """
         Download media associated with a message to the specified directory.
 
         Args:
-            session: Active aiohttp session.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             message: Message dictionary from API.
             output_dir: Root directory for the member.
 
@@ -679,52 +837,110 @@ class Client:
             Path to the downloaded file, or None if no media/download failed.
         """
         raw_type = message.get('type')
-        msg_type = 'text'
-        if raw_type in ['image', 'picture']:
-            msg_type = 'picture'
-        elif raw_type in ['video', 'movie']:
-            msg_type = 'video'
-        elif raw_type == 'voice':
-            msg_type = 'voice'
+        msg_type = MEDIA_DIR_BY_TYPE.get(raw_type)
+        if msg_type is None:
+            return None
 
         media_url = message.get('file') or message.get('thumbnail')
-        if not media_url or msg_type == 'text':
+        if not media_url:
             return None
 
         try:
             ext = get_media_extension(media_url, raw_type)
-            target_dir = output_dir / msg_type
-            target_dir.mkdir(parents=True, exist_ok=True)
-
-            filename = f"{message['id']}.{ext}"
-            filepath = target_dir / filename
+            # download_file() creates the directory, and only when it actually downloads
+            filepath = output_dir / msg_type / f"{message['id']}.{ext}"
 
             if await self.download_file(session, media_url, filepath):
                 return filepath
         except Exception as e:
-            logger.error(f"Message media download error: {e}")
+            logger.error("Message media download error", error=str(e))
             pass
 
         return None
 
-    async def get_profile(self, session: aiohttp.ClientSession) -> Optional[dict[str, Any]]:
+    async def download_messages_media(
+        self,
+        session: Optional[aiohttp.ClientSession],
+        messages: list[dict[str, Any]],
+        output_dir: Path,
+        concurrency: int = MEDIA_DOWNLOAD_CONCURRENCY_INITIAL
+    ) -> list[Optional[Path]]:
+        """
+        Download media for many messages concurrently.
+
+        Starts with ``MEDIA_DOWNLOAD_WINDOW_INITIAL`` downloads in flight and doubles it each
+        time a full window completes without failures (TCP slow-start style),
+        up to ``concurrency`` (capped at the connector's per-host limit). Once
+        the items still waiting fit in the current window, as many of them as
+        the cap allows start right away so the tail is not serialized behind
+        slow transfers.
+
+        Args:
+            session: Active aiohttp ClientSession, or None for the client's own session.
+            messages: Message dictionaries from the API.
+            output_dir: Root directory for the member.
+            concurrency: Maximum number of simultaneous downloads.
+
+        Returns:
+            Results of ``download_message_media`` in the same order as ``messages``.
+        """
+        limit = max(1, min(concurrency, CONNECTOR_LIMIT_PER_HOST))
+        window = min(MEDIA_DOWNLOAD_WINDOW_INITIAL, limit)
+        sem = asyncio.Semaphore(window)
+        total = len(messages)
+        started = 0
+        window_successes = 0
+        end_game = False
+
+        async def _bounded(message: dict[str, Any]) -> Optional[Path]:
+            nonlocal window, started, window_successes, end_game
+            async with sem:
+                started += 1
+                result = await self.download_message_media(session, message, output_dir)
+
+                failed = result is None and bool(message.get('file') or message.get('thumbnail'))
+                if failed:
+                    window_successes = 0
+                else:
+                    window_successes += 1
+                    if window_successes >= window and window < limit:
+                        # Whole window went through cleanly: open it up further
+                        extra = min(window, limit - window)
+                        for _ in range(extra):
+                            sem.release()
+                        window += extra
+                        window_successes = 0
+
+                waiting = total - started
+                if not end_game and 0 < waiting <= window:
+                    # End game: let the remaining downloads start right away, up to the cap
+                    end_game = True
+                    extra = min(waiting, limit - window)
+                    for _ in range(extra):
+                        sem.release()
+                    window += extra
+                return result
+
+        return list(await asyncio.gather(*[_bounded(m) for m in messages]))
+
+    async def get_profile(self, session: Optional[aiohttp.ClientSession] = None) -> Optional[dict[str, Any]]:
         """
         Fetch the current user's profile.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
 
         Returns:
             Dict containing profile info (nickname, etc.) or None if failed.
         """
         return await self.fetch_json(session, "/profile")
 
-    async def get_news(self, session: aiohttp.ClientSession, count: int = 20) -> list[dict[str, Any]]:
+    async def get_news(self, session: Optional[aiohttp.ClientSession] = None, count: int = 20) -> list[dict[str, Any]]:
         """
         Fetch official news (announcements).
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             count: Number of items to fetch (default 20).
 
         Returns:
@@ -736,12 +952,12 @@ class Client:
             return data["announcements"]
         return []
 
-    async def get_tags(self, session: aiohttp.ClientSession) -> list[dict[str, Any]]:
+    async def get_tags(self, session: Optional[aiohttp.ClientSession] = None) -> list[dict[str, Any]]:
         """
         Fetch available tags.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
 
         Returns:
             List of tags.
@@ -751,12 +967,16 @@ class Client:
             return data["tags"]
         return []
 
-    async def get_fc_contents(self, session: aiohttp.ClientSession, organization_id: int = 1) -> list[dict[str, Any]]:
+    async def get_fc_contents(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        organization_id: int = 1
+    ) -> list[dict[str, Any]]:
         """
         Fetch Fan Club contents.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             organization_id: Organization ID (default 1).
 
         Returns:
@@ -767,12 +987,12 @@ class Client:
             return data["contents"]
         return []
 
-    async def get_organizations(self, session: aiohttp.ClientSession) -> list[dict[str, Any]]:
+    async def get_organizations(self, session: Optional[aiohttp.ClientSession] = None) -> list[dict[str, Any]]:
         """
         Fetch available organizations.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
 
         Returns:
             List of organizations.
@@ -782,12 +1002,12 @@ class Client:
             return data["organizations"]
         return []
 
-    async def get_products(self, session: aiohttp.ClientSession, product_type: Optional[str] = None) -> list[dict[str, Any]]:
+    async def get_products(self, session: Optional[aiohttp.ClientSession] = None, product_type: Optional[str] = None) -> list[dict[str, Any]]:
         """
         Fetch products (subscriptions etc).
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             product_type: Optional filter (e.g. 'subscription', 'fc_subscription').
 
         Returns:
@@ -807,7 +1027,7 @@ class Client:
 
     async def post_json(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         endpoint: str,
         data: Optional[dict[str, Any]] = None
     ) -> Optional[dict[str, Any]]:
@@ -815,19 +1035,20 @@ class Client:
         Helper method to perform JSON POST requests.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             endpoint: API endpoint path (e.g. "/messages/123/favorite").
             data: Request body as dict (can be None for empty body).
 
         Returns:
             JSON response as dict or None if failed.
         """
+        session = session or self.session
         url = f"{self.api_base}{endpoint}"
         logger.debug("API POST request", endpoint=endpoint, data_keys=list(data.keys()) if data else None)
         try:
             async with session.post(url, headers=self.headers, json=data) as resp:
                 if resp.status == 200:
-                    result = await resp.json()
+                    result = await resp.json(loads=orjson.loads)
                     logger.debug("API POST success", endpoint=endpoint, status=200)
                     return result
                 elif resp.status == 401:
@@ -835,34 +1056,35 @@ class Client:
                     if await self.refresh_access_token(session):
                         async with session.post(url, headers=self.headers, json=data) as resp_retry:
                             if resp_retry.status == 200:
-                                return await resp_retry.json()
+                                return await resp_retry.json(loads=orjson.loads)
                     return None
                 elif resp.status >= 500:
                     raise ApiError(f"Server error {resp.status}", resp.status)
                 else:
-                    logger.warning(f"Unexpected status {resp.status} at POST {endpoint}")
+                    logger.warning("Unexpected API status", method="POST", endpoint=endpoint, status=resp.status)
                     return None
         except ApiError:
             raise
         except aiohttp.ClientError as e:
-            logger.error(f"Network error posting to {url}: {e}")
+            logger.error("Network error posting", url=url, error=str(e))
             raise ApiError(f"Network error: {e}") from e
 
     async def delete_json(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         endpoint: str
     ) -> bool:
         """
         Helper method to perform DELETE requests.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             endpoint: API endpoint path.
 
         Returns:
             True if successful (2xx), False otherwise.
         """
+        session = session or self.session
         url = f"{self.api_base}{endpoint}"
         try:
             async with session.delete(url, headers=self.headers) as resp:
@@ -874,15 +1096,15 @@ class Client:
                             return resp_retry.status in (200, 204)
                     return False
                 else:
-                    logger.warning(f"DELETE {endpoint} returned {resp.status}")
+                    logger.warning("Unexpected API status", method="DELETE", endpoint=endpoint, status=resp.status)
                     return False
         except Exception as e:
-            logger.error(f"Error deleting {url}: {e}")
+            logger.error("Error deleting", url=url, error=str(e))
             return False
 
     async def get_letters(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         group_id: int,
         updated_from: Optional[str] = None,
         count: int = 200
@@ -891,7 +1113,7 @@ class Client:
         Fetch user's sent letters/cards to a member.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             group_id: The ID of the group/member.
             updated_from: ISO timestamp to fetch letters updated after.
             count: Number of letters to fetch (default 200).
@@ -910,7 +1132,7 @@ class Client:
 
     async def get_past_messages(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         group_id: int
     ) -> list[dict[str, Any]]:
         """
@@ -920,7 +1142,7 @@ class Client:
         before their subscription began. Does NOT mark messages as read.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             group_id: The ID of the group/member.
 
         Returns:
@@ -933,14 +1155,14 @@ class Client:
 
     async def get_subscription_streak(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         group_id: int
     ) -> Optional[dict[str, Any]]:
         """
         Fetch consecutive subscription days for a member.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             group_id: The ID of the group/member.
 
         Returns:
@@ -950,14 +1172,14 @@ class Client:
 
     async def get_member(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         member_id: int
     ) -> Optional[dict[str, Any]]:
         """
         Fetch individual member details.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             member_id: The ID of the member.
 
         Returns:
@@ -965,12 +1187,12 @@ class Client:
         """
         return await self.fetch_json(session, f"/members/{member_id}")
 
-    async def get_account(self, session: aiohttp.ClientSession) -> Optional[dict[str, Any]]:
+    async def get_account(self, session: Optional[aiohttp.ClientSession] = None) -> Optional[dict[str, Any]]:
         """
         Fetch user account information.
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
 
         Returns:
             Account info dict or None if failed.
@@ -979,14 +1201,14 @@ class Client:
 
     async def add_favorite(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         message_id: int
     ) -> bool:
         """
         Add a message to favorites (server-side).
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             message_id: The ID of the message to favorite.
 
         Returns:
@@ -998,14 +1220,14 @@ class Client:
 
     async def remove_favorite(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         message_id: int
     ) -> bool:
         """
         Remove a message from favorites (server-side).
 
         Args:
-            session: Active aiohttp ClientSession.
+            session: Active aiohttp ClientSession, or None for the client's own session.
             message_id: The ID of the message to unfavorite.
 
         Returns:
@@ -11,9 +11,14 @@ to adjust sync behavior without modifying code.
 # Legacy concurrency constants — kept for backward compatibility.
 # When using AdaptivePool (HakoDesk 0.2.0+), these are ignored; the pool
 # manages concurrency dynamically based on network conditions.
+# MEDIA_DOWNLOAD_CONCURRENCY_INITIAL is also Client.download_messages_media()'s default cap.
 MEDIA_DOWNLOAD_CONCURRENCY_INITIAL = 20  # First sync: aggressive
 MEDIA_DOWNLOAD_CONCURRENCY_INCREMENTAL = 5  # Incremental: gentle on server
 
+# Client.download_messages_media() starts with this many downloads in flight and
+# doubles after each clean window, up to its concurrency cap
+MEDIA_DOWNLOAD_WINDOW_INITIAL = 4
+
 
 # =============================================================================
 # Blog Sync Configuration (re-exported from blog.config for convenience)
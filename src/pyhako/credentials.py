@@ -1,28 +1,67 @@
 
-import base64
+import copy
 import json
 import platform
+import threading
+import time
 import zlib
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, Optional
 
 import structlog
+import zstandard
 
 from .exceptions import HakoError
 
 logger = structlog.get_logger()
 
+# Optional (pip install pyhako[speedups]): SIMD base64 codec with the stdlib module's API
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 SERVICE_NAME = "pyhako"
 
+# zstd level for stored credentials; new data is written as ZSTD_PREFIX + base64(zstd frame)
+COMPRESSION_LEVEL = 10
+ZSTD_PREFIX = "ZSTD"
+# JSON shorter than this is stored as-is; compressing + base64 would barely shrink it
+COMPRESSION_MIN_SIZE = 800
+
+# Seconds KeyringStore keeps a decoded credential in memory before asking the OS store again
+CREDENTIAL_CACHE_TTL = 300
+
+# Reused across calls to avoid setting up a compression context per save/load
+_ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+_ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+
+# Keyring module with a verified backend, shared by all KeyringStores. The probe talks
+# to the OS credential store, so its outcome is memoized; see reset_keyring_cache().
+_KEYRING: Any = None
+_PROBE_OK: Optional[bool] = None
+_PROBE_ERROR: Optional[Exception] = None
+_KEYRING_LOCK = threading.Lock()
+
 def _compress_data(data: str) -> str:
     """Compress and base64-encode data for storage in size-limited backends."""
-    compressed = zlib.compress(data.encode('utf-8'), level=9)
-    return base64.b64encode(compressed).decode('ascii')
+    if len(data) < COMPRESSION_MIN_SIZE:
+        return data
+    compressed = _ZSTD_COMPRESSOR.compress(data.encode('utf-8'))
+    return ZSTD_PREFIX + base64.b64encode(compressed).decode('ascii')
 
 def _decompress_data(data: str) -> str:
-    """Decompress base64-encoded data."""
+    """Decompress data written by ``_compress_data`` (zstd), older releases (zlib) or stored raw."""
+    if data[:1] == '{':
+        # Plain JSON: short payloads (and legacy data) are stored uncompressed
+        return data
     try:
+        if data.startswith(ZSTD_PREFIX):
+            compressed = base64.b64decode(data[len(ZSTD_PREFIX):].encode('ascii'))
+            return _ZSTD_DECOMPRESSOR.decompress(compressed).decode('utf-8')
+        # Written by releases that used zlib
         compressed = base64.b64decode(data.encode('ascii'))
         return zlib.decompress(compressed).decode('utf-8')
     except Exception as e:
@@ -71,46 +110,88 @@ class CredentialStore(ABC):
         pass
 
     @abstractmethod
-    def load(self, group: str) -> Optional[dict[str, Any]]:
+    def load(self, group: str, fresh: bool = False) -> Optional[dict[str, Any]]:
+        """Return the stored token data; ``fresh`` bypasses any in-process cache."""
         pass
 
     @abstractmethod
     def delete(self, group: str) -> None:
         pass
 
-class KeyringStore(CredentialStore):
-    def __init__(self):
+    def save_many(self, entries: dict[str, dict[str, Any]]) -> None:
+        """Save several groups' token data; stores may override to batch the writes."""
+        for group, token_data in entries.items():
+            self.save(group, token_data)
+
+
+def _probe_keyring(keyring: Any) -> None:
+    # Linux Headless Fallback Logic
+    # We attempt to verify the backend works. If not, we try keyrings.alt.
+    try:
+        # Probe the backend with a write operation
+        keyring.set_password("pyhako_probe", "probe", "ok")
+        keyring.delete_password("pyhako_probe", "probe")
+    except Exception as e:
+        logger.warning("Default keyring backend seems broken (headless?)", error=str(e))
+
+        # Try fallback
         try:
-            import keyring
+            from keyrings.alt.file import PlaintextKeyring
+            keyring.set_keyring(PlaintextKeyring())
+            logger.warning("Switched to PlaintextKeyring (keyrings.alt) as fallback.")
+
+            # Verify fallback
+            keyring.set_password("pyhako_probe", "probe", "ok")
+            keyring.delete_password("pyhako_probe", "probe")
+        except ImportError:
+            logger.error("keyrings.alt not found. Cannot provide fallback.")
+            raise e from None
+        except Exception as fallback_error:
+            logger.error("Fallback backend also failed", error=str(fallback_error))
+            raise e from None
+
 
-            # Linux Headless Fallback Logic
-            # We attempt to verify the backend works. If not, we try keyrings.alt.
+def _get_keyring() -> Any:
+    """Return the keyring module with a verified backend, probing it once per process."""
+    global _KEYRING, _PROBE_OK, _PROBE_ERROR
+    try:
+        import keyring
+    except ImportError:
+        raise HakoError("keyring package is not installed.") from None
+
+    with _KEYRING_LOCK:
+        if _PROBE_OK is None:
             try:
-                # Probe the backend with a write operation
-                keyring.set_password("pyhako_probe", "probe", "ok")
-                keyring.delete_password("pyhako_probe", "probe")
+                _probe_keyring(keyring)
             except Exception as e:
-                logger.warning(f"Default keyring backend seems broken (headless?): {e}")
-
-                # Try fallback
-                try:
-                    from keyrings.alt.file import PlaintextKeyring
-                    keyring.set_keyring(PlaintextKeyring())
-                    logger.warning("Switched to PlaintextKeyring (keyrings.alt) as fallback.")
-
-                    # Verify fallback
-                    keyring.set_password("pyhako_probe", "probe", "ok")
-                    keyring.delete_password("pyhako_probe", "probe")
-                except ImportError:
-                    logger.error("keyrings.alt not found. Cannot provide fallback.")
-                    raise e from None
-                except Exception as fallback_error:
-                    logger.error(f"Fallback backend also failed: {fallback_error}")
-                    raise e from None
-
-            self._keyring = keyring
-        except ImportError:
-            raise HakoError("keyring package is not installed.") from None
+                _PROBE_OK, _PROBE_ERROR = False, e
+                raise
+            _KEYRING, _PROBE_OK = keyring, True
+        elif not _PROBE_OK:
+            raise HakoError(f"Keyring backend is unavailable: {_PROBE_ERROR}")
+        return _KEYRING
+
+
+def reset_keyring_cache() -> None:
+    """Forget the memoized keyring probe so the next ``KeyringStore()`` probes again (for tests)."""
+    global _KEYRING, _PROBE_OK, _PROBE_ERROR
+    with _KEYRING_LOCK:
+        _KEYRING, _PROBE_OK, _PROBE_ERROR = None, None, None
+
+
+class KeyringStore(CredentialStore):
+    def __init__(self):
+        # Shared by every store; the probe (a write + delete on the OS store) only runs once
+        self._keyring = _get_keyring()
+
+        # group -> (monotonic expiry, decoded token data); every keyring read is OS IPC
+        self._cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        # Stores may be used from worker threads (e.g. asyncio.to_thread saves)
+        self._cache_lock = threading.Lock()
+
+    def _remember(self, group: str, token_data: dict[str, Any]) -> None:
+        with self._cache_lock:
+            self._cache[group] = (time.monotonic() + CREDENTIAL_CACHE_TTL, copy.deepcopy(token_data))
 
     def save(self, group: str, token_data: dict[str, Any]) -> None:
         # Keyring stores strings - compress JSON to fit Windows Credential Manager limits
@@ -120,19 +201,40 @@ class KeyringStore(CredentialStore):
             self._keyring.set_password(SERVICE_NAME, group, compressed)
         except Exception as e:
              raise HakoError(f"Failed to save credentials to keyring: {e}") from e
+        self._remember(group, token_data)
 
-    def load(self, group: str) -> Optional[dict[str, Any]]:
+    def save_many(self, entries: dict[str, dict[str, Any]]) -> None:
+        # Serialize everything up front so a bad entry fails before any keyring write
+        try:
+            payloads = {group: _compress_data(json.dumps(data)) for group, data in entries.items()}
+            for group, payload in payloads.items():
+                self._keyring.set_password(SERVICE_NAME, group, payload)
+                self._remember(group, entries[group])
+        except Exception as e:
+            raise HakoError(f"Failed to save credentials to keyring: {e}") from e
+
+    def load(self, group: str, fresh: bool = False) -> Optional[dict[str, Any]]:
+        with self._cache_lock:
+            cached = None if fresh else self._cache.get(group)
+        if cached is not None and cached[0] > time.monotonic():
+            # Copy so callers can't mutate the cached entry
+            return copy.deepcopy(cached[1])
         try:
             data = self._keyring.get_password(SERVICE_NAME, group)
             if data:
                 # Decompress (handles legacy uncompressed data automatically)
                 json_data = _decompress_data(data)
-                return json.loads(json_data)
+                token_data = json.loads(json_data)
+                self._remember(group, token_data)
+                return token_data
         except Exception as e:
-            logger.warning(f"Failed to load credentials for {group}: {e}")
+            logger.warning("Failed to load credentials", group=group, error=str(e))
         return None
 
     def delete(self, group: str) -> None:
+        with self._cache_lock:
+            self._cache.pop(group, None)
+
         # 1. Delete from currently active backend
         try:
             self._keyring.delete_password(SERVICE_NAME, group)
@@ -167,7 +269,7 @@ class TokenManager:
             self.store = KeyringStore()
             logger.debug("Using KeyringStore")
         except Exception as e:
-            logger.error(f"Keyring initialization failed: {e}")
+            logger.error("Keyring initialization failed", error=str(e))
             raise HakoError(f"Secure storage (keyring) is required but failed to initialize: {e}") from e
 
     def save_session(self, group: str, access_token: str, refresh_token: Optional[str] = None, cookies: Optional[dict[Any, Any]] = None) -> None:
@@ -177,10 +279,30 @@ class TokenManager:
             "cookies": cookies
         }
         self.store.save(group, data)
-        logger.info(f"Session saved for {group}")
-
-    def load_session(self, group: str) -> Optional[dict[str, Any]]:
-        data = self.store.load(group)
+        logger.info("Session saved", group=group)
+
+    def save_sessions(
+        self,
+        sessions: Iterable[tuple[str, str, Optional[str], Optional[dict[Any, Any]]]],
+    ) -> None:
+        """
+        Save several sessions at once (e.g. after logging in to multiple groups).
+
+        Args:
+            sessions: ``(group, access_token, refresh_token, cookies)`` tuples, as for save_session().
+        """
+        entries = {
+            group: {"access_token": access_token, "refresh_token": refresh_token, "cookies": cookies}
+            for group, access_token, refresh_token, cookies in sessions
+        }
+        if not entries:
+            return
+        self.store.save_many(entries)
+        logger.info("Sessions saved", groups=list(entries))
+
+    def load_session(self, group: str, fresh: bool = False) -> Optional[dict[str, Any]]:
+        # fresh=True reads the backend itself, e.g. to see a token another process just saved
+        data = self.store.load(group, fresh=fresh)
         if data:
             logger.debug("Session loaded", group=group, has_token=bool(data.get('access_token')), has_refresh=bool(data.get('refresh_token')))
         else:
@@ -0,0 +1,193 @@
+"""Shared aiohttp sessions with pooled keep-alive connections."""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+import structlog
+from yarl import URL
+
+try:
+    import aiodns  # noqa: F401  (installed by aiohttp[speedups])
+    _HAS_AIODNS = True
+except ImportError:
+    _HAS_AIODNS = False
+
+logger = structlog.get_logger()
+
+# Connector defaults tuned for many requests against a handful of hosts
+CONNECTOR_LIMIT = 500
+CONNECTOR_LIMIT_PER_HOST = 32
+DNS_CACHE_TTL = 20  # seconds
+KEEPALIVE_TIMEOUT = 30  # seconds
+
+# Throttled responses are retried this many times, waiting for Retry-After or else
+# an exponential backoff starting at RATE_LIMIT_BACKOFF seconds
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0
+
+# host -> (session, loop the session belongs to)
+_SESSIONS: dict[str, tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]] = {}
+
+
+class RateLimiter:
+    """
+    Async token bucket allowing ``rate`` acquisitions per ``period`` seconds.
+
+    Bursts of up to ``rate`` go through immediately; beyond that, callers wait only
+    as long as needed to stay under the rate, so slow responses are never padded
+    with extra sleeps. Not tied to an event loop.
+
+    Usage:
+        limiter = RateLimiter(10)
+        async with limiter:
+            ...
+    """
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self._level = 0.0
+        self._last = time.monotonic()
+
+    def _leak(self) -> None:
+        now = time.monotonic()
+        self._level = max(0.0, self._level - (now - self._last) * self.rate / self.period)
+        self._last = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be made under the rate, then take a slot."""
+        while True:
+            self._leak()
+            if self._level + 1 <= self.rate:
+                self._level += 1
+                return
+            await asyncio.sleep((self._level + 1 - self.rate) * self.period / self.rate)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+def _retry_after_seconds(resp: aiohttp.ClientResponse, attempt: int) -> float:
+    """Seconds to wait before retrying a throttled response."""
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After", "")))
+    except (TypeError, ValueError):
+        return RATE_LIMIT_BACKOFF * 2 ** attempt
+
+
+@asynccontextmanager
+async def get_with_backoff(
+    session: aiohttp.ClientSession,
+    url: str | URL,
+    retry_statuses: frozenset[int],
+    **kwargs: Any,
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """
+    ``session.get()`` that waits out ``retry_statuses`` responses, up to RATE_LIMIT_RETRIES times.
+
+    Each retry waits for the response's ``Retry-After`` seconds, or else an exponential
+    backoff from RATE_LIMIT_BACKOFF. The last response is yielded whatever its status.
+
+    Usage:
+        async with get_with_backoff(session, url, frozenset({429})) as resp:
+            ...
+    """
+    for attempt in range(RATE_LIMIT_RETRIES):
+        async with session.get(url, **kwargs) as resp:
+            if resp.status not in retry_statuses:
+                yield resp
+                return
+            status = resp.status
+            delay = _retry_after_seconds(resp, attempt)
+        logger.warning(
+            "Request throttled, backing off", url=str(url), status=status, delay=delay, attempt=attempt + 1
+        )
+        await asyncio.sleep(delay)
+    async with session.get(url, **kwargs) as resp:
+        yield resp
+
+
+def create_connector(**overrides: Any) -> aiohttp.TCPConnector:
+    """
+    Build a TCPConnector that keeps connections and DNS results around for reuse.
+
+    Args:
+        **overrides: Keyword arguments overriding the defaults passed to ``aiohttp.TCPConnector``.
+
+    Returns:
+        A new connector (must be created inside a running event loop).
+    """
+    options: dict[str, Any] = {
+        "limit": CONNECTOR_LIMIT,
+        "limit_per_host": CONNECTOR_LIMIT_PER_HOST,
+        "ttl_dns_cache": DNS_CACHE_TTL,
+        "keepalive_timeout": KEEPALIVE_TIMEOUT,
+    }
+    if _HAS_AIODNS:
+        # Async c-ares lookups instead of getaddrinfo in the default thread pool
+        # (older aiohttp releases never pick this resolver on their own)
+        options["resolver"] = aiohttp.AsyncResolver()
+    options.update(overrides)
+    return aiohttp.TCPConnector(**options)
+
+
+async def get_session(base_url: str) -> aiohttp.ClientSession:
+    """
+    Return the shared session for ``base_url``'s host, creating it on first use.
+
+    Reusing one session per host amortizes TLS handshakes and DNS lookups across
+    calls. Sessions are bound to the event loop that created them; a new one is
+    made transparently if called from a different loop.
+
+    Args:
+        base_url: Any URL on the target host (e.g. ``client.api_base``).
+
+    Returns:
+        An open ``aiohttp.ClientSession``. Do not close it yourself; use ``close_sessions()``.
+    """
+    host = urlsplit(base_url).netloc or base_url
+    loop = asyncio.get_running_loop()
+
+    entry = _SESSIONS.get(host)
+    if entry is not None:
+        session, session_loop = entry
+        if not session.closed and session_loop is loop:
+            return session
+
+    session = aiohttp.ClientSession(connector=create_connector())
+    _SESSIONS[host] = (session, loop)
+    logger.debug("Created shared HTTP session", host=host)
+    return session
+
+
+async def close_sessions() -> None:
+    """Close all shared sessions created by ``get_session()`` on the running loop."""
+    loop = asyncio.get_running_loop()
+    for host, (session, session_loop) in list(_SESSIONS.items()):
+        if session_loop is loop:
+            del _SESSIONS[host]
+            await session.close()
+
+
+def _close_sessions_at_exit() -> None:
+    for session, loop in _SESSIONS.values():
+        if session.closed or loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(session.close())
+        except Exception:
+            pass
+    _SESSIONS.clear()
+
+
+atexit.register(_close_sessions_at_exit)
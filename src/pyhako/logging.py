@@ -8,6 +8,12 @@ from typing import Any
 
 import structlog
 
+# Lowercase names whose values are replaced in log output (top level and one dict deep)
+SENSITIVE_KEYS = frozenset({
+    "access_token", "refresh_token", "token", "password", "secret", "cookie", "cookies", "authorization"
+})
+REDACTED = "***REDACTED***"
+
 
 def configure_logging(
     log_file: str | Path | None = None,
@@ -42,8 +48,8 @@ def configure_logging(
         _redact_secrets,
     ]
 
-    # Structlog processors
-    processors = shared_processors + [
+    # Structlog processors; drop records below the stdlib logger's level before any other work
+    processors = [structlog.stdlib.filter_by_level] + shared_processors + [
         structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
     ]
 
@@ -120,20 +126,14 @@ def _redact_secrets(
     """
     Processor to redact sensitive keys from log output.
     """
-    sensitive_keys = {
-        "access_token", "refresh_token", "token", "password", "secret", "cookie", "cookies", "authorization"
-    }
-
-    # Redact top-level keys
-    for key in event_dict.copy():
-        if key.lower() in sensitive_keys:
-            event_dict[key] = "***REDACTED***"
-
-    # Shallow redaction for dictionary values (handling headers/cookies dicts)
-    for _, value in event_dict.items():
-        if isinstance(value, dict):
+    # Single pass; only values are reassigned, so iterating the dict directly is safe
+    for key, value in event_dict.items():
+        if key.lower() in SENSITIVE_KEYS:
+            event_dict[key] = REDACTED
+        elif isinstance(value, dict):
+            # Shallow redaction for dictionary values (handling headers/cookies dicts)
             for sub_key in value:
-                if sub_key.lower() in sensitive_keys:
-                    value[sub_key] = "***REDACTED***"
+                if sub_key.lower() in SENSITIVE_KEYS:
+                    value[sub_key] = REDACTED
 
     return event_dict
@@ -1,11 +1,14 @@
 import asyncio
-import json
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
 import aiofiles
 import aiohttp
+import orjson
 import structlog
 
 from .client import Client
@@ -14,6 +17,19 @@ from .utils import get_media_extension, normalize_message, sanitize_name
 
 logger = structlog.get_logger()
 
+# State and message files are machine-read on the next sync, so they are written compact;
+# pass pretty_json=True to SyncManager for indented output. orjson writes UTF-8 bytes directly.
+JSON_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS
+PRETTY_JSON_DUMP_OPTIONS = JSON_DUMP_OPTIONS | orjson.OPT_INDENT_2
+
+def _list_dir(path: Path) -> set[str]:
+    """Return the names in ``path``, or an empty set if it does not exist."""
+    try:
+        return set(os.listdir(path))
+    except FileNotFoundError:
+        return set()
+
+
 class SyncManager:
     """
     Manages synchronization of messages and media for a specific client.
@@ -21,26 +37,31 @@ class SyncManager:
     Handles state tracking, message fetching, deduplication, and media downloading.
     """
 
-    def __init__(self, client: Client, output_dir: Path):
+    def __init__(self, client: Client, output_dir: Path, pretty_json: bool = False):
         """
         Initialize the SyncManager.
 
         Args:
             client: Authenticated Client instance.
             output_dir: Directory to store synchronized data.
+            pretty_json: Indent the JSON files it writes (larger and slower; for inspecting by hand).
         """
         self.client = client
         self.output_dir = output_dir
+        self.json_options = PRETTY_JSON_DUMP_OPTIONS if pretty_json else JSON_DUMP_OPTIONS
         self.state_file = output_dir / "sync_state.json"
         self.sync_state: dict[str, dict[str, Any]] = {}
+        # Set while state updates are batched; see batch_state_updates()
+        self._defer_saves = 0
+        self._state_dirty = False
         self.load_sync_state()
 
     def load_sync_state(self) -> None:
         """Load synchronization state from JSON file."""
         if self.state_file.exists():
             try:
-                with open(self.state_file, encoding='utf-8') as f:
-                    self.sync_state = json.load(f)
+                with open(self.state_file, 'rb') as f:
+                    self.sync_state = orjson.loads(f.read())
             except Exception as e:
                 logger.error("Failed to load sync state", error=str(e))
                 self.sync_state = {}
@@ -48,11 +69,39 @@ class SyncManager:
     def save_sync_state(self) -> None:
         """Save synchronization state to JSON file."""
         try:
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(self.sync_state, f, indent=2)
+            with open(self.state_file, 'wb') as f:
+                f.write(orjson.dumps(self.sync_state, option=self.json_options))
+            self._state_dirty = False
         except Exception as e:
             logger.error("Failed to save sync state", error=str(e))
 
+    def flush(self) -> None:
+        """Save synchronization state if it changed since the last save."""
+        if self._state_dirty:
+            self.save_sync_state()
+
+    @contextmanager
+    def batch_state_updates(self) -> Iterator[None]:
+        """
+        Defer sync state saves until the block exits, then save once.
+
+        Without this, every ``sync_member()`` rewrites ``sync_state.json``. If the
+        block is interrupted, messages.json is still current and the next sync just
+        re-fetches from the last saved state.
+
+        Usage:
+            with manager.batch_state_updates():
+                for member in members:
+                    await manager.sync_member(session, group, member, queue)
+        """
+        self._defer_saves += 1
+        try:
+            yield
+        finally:
+            self._defer_saves -= 1
+            if not self._defer_saves:
+                self.flush()
+
     def update_sync_state(self, group_id: int, member_id: int, last_msg_id: int, count: int) -> None:
         """
         Update state for a specific member after sync.
@@ -69,7 +118,9 @@ class SyncManager:
             "total_messages": count,
             "last_sync": datetime.now(timezone.utc).isoformat() + "Z"
         }
-        self.save_sync_state()
+        self._state_dirty = True
+        if not self._defer_saves:
+            self.save_sync_state()
 
     def get_last_id(self, group_id: int, member_id: int) -> Optional[int]:
         """
@@ -153,51 +204,74 @@ class SyncManager:
             # Process & Prepare
             processed = self.prepare_messages(messages, member_dir, media_queue)
 
+            member_info = {
+                "id": mid,
+                "name": mname,
+                "group_id": gid,
+                "portrait": member.get('portrait'),
+                "thumbnail": member.get('thumbnail'),
+                "phone_image": member.get('phone_image'),
+                "group_thumbnail": group.get('thumbnail'),
+            }
+
             # Load existing
             existing_file = member_dir / "messages.json"
-            existing_msgs: list[dict[str, Any]] = []
+            existing_data: dict[str, Any] = {}
             if existing_file.exists():
                 try:
-                    async with aiofiles.open(existing_file, encoding='utf-8') as f:
-                        data = json.loads(await f.read())
-                        existing_msgs = data.get('messages', [])
+                    async with aiofiles.open(existing_file, 'rb') as f:
+                        existing_data = orjson.loads(await f.read())
                 except Exception:
                     pass
-
-            # Dedupe (Upsert: Prefer new data)
-            merged_dict = {x['id']: x for x in existing_msgs}
-            for pm in processed:
-                merged_dict[pm['id']] = pm
-
-            merged = list(merged_dict.values())
-            merged.sort(key=lambda x: x.get('timestamp') or '')
-
-            # Stats
-            type_counts = {"text": 0, "video": 0, "picture": 0, "voice": 0}
-            for msg in merged:
-                mtype = msg.get('type', 'text')
-                if mtype in type_counts:
-                    type_counts[mtype] += 1
-
-            # Save
-            export_data = {
-                "exported_at": datetime.now(timezone.utc).isoformat() + "Z",
-                "member": {
-                    "id": mid,
-                    "name": mname,
-                    "group_id": gid,
-                    "portrait": member.get('portrait'),
-                    "thumbnail": member.get('thumbnail'),
-                    "phone_image": member.get('phone_image'),
-                    "group_thumbnail": group.get('thumbnail'),
-                },
-                "total_messages": len(merged),
-                "message_type_counts": type_counts,
-                "messages": merged
-            }
-
-            async with aiofiles.open(existing_file, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(export_data, ensure_ascii=False, indent=2))
+            existing_msgs: list[dict[str, Any]] = existing_data.get('messages', [])
+
+            # Dedupe (Upsert: Prefer new data). Only the fetched ids are hashed; the
+            # history is sorted by timestamp, so it is scanned newest-first and only
+            # down to the oldest fetched timestamp (nothing older can match).
+            incoming = {pm['id']: pm for pm in processed}
+            oldest_incoming = min((pm.get('timestamp') or '' for pm in processed), default='')
+            replaced = 0
+            for i in range(len(existing_msgs) - 1, -1, -1):
+                if not incoming or (existing_msgs[i].get('timestamp') or '') < oldest_incoming:
+                    break
+                pm = incoming.pop(existing_msgs[i]['id'], None)
+                if pm is not None and pm != existing_msgs[i]:
+                    existing_msgs[i] = pm
+                    replaced += 1
+            added = sorted(incoming.values(), key=lambda x: x.get('timestamp') or '')
+
+            if replaced or added or existing_data.get('member') != member_info:
+                merged = existing_msgs
+                # existing_msgs is stored sorted; re-sort only if the merge broke that order
+                needs_sort = replaced or (
+                    merged and added and (added[0].get('timestamp') or '') < (merged[-1].get('timestamp') or '')
+                )
+                merged.extend(added)
+                if needs_sort:
+                    merged.sort(key=lambda x: x.get('timestamp') or '')
+
+                # Stats
+                type_counts = {"text": 0, "video": 0, "picture": 0, "voice": 0}
+                for msg in merged:
+                    mtype = msg.get('type', 'text')
+                    if mtype in type_counts:
+                        type_counts[mtype] += 1
+
+                # Save
+                export_data = {
+                    "exported_at": datetime.now(timezone.utc).isoformat() + "Z",
+                    "member": member_info,
+                    "total_messages": len(merged),
+                    "message_type_counts": type_counts,
+                    "messages": merged
+                }
+
+                async with aiofiles.open(existing_file, 'wb') as f:
+                    await f.write(orjson.dumps(export_data, option=self.json_options))
+            else:
+                # Re-fetched messages only (e.g. since_id overlap); the file is already current
+                merged = existing_msgs
+                logger.debug("Messages unchanged, skipping rewrite", member=mname)
 
             # Update State
             max_id = max(x['id'] for x in merged) if merged else (last_id or 0)
@@ -227,6 +301,8 @@ class SyncManager:
             List of processed message dicts.
         """
         processed = []
+        # One listing per media subdir instead of a stat() per message
+        listings: dict[str, set[str]] = {}
         for msg in messages:
             try:
                 # Normalize core fields
@@ -248,9 +324,13 @@ class SyncManager:
                         subdir = 'voice'
 
                     filepath = member_dir / subdir / f"{msg['id']}.{ext}"
+                    existing = listings.get(subdir)
+                    if existing is None:
+                        existing = listings[subdir] = _list_dir(member_dir / subdir)
+                    downloaded = filepath.name in existing
 
                     # Logic: If file doesn't exist, queue it.
-                    if not filepath.exists():
+                    if not downloaded:
                         queue.append({
                             'url': media_url,
                             'path': filepath,
@@ -263,7 +343,7 @@ class SyncManager:
                     p_msg['media_file'] = str(filepath.relative_to(self.output_dir))
 
                     # Extract dimensions if file exists (already downloaded or will be processed)
-                    if filepath.exists():
+                    if downloaded:
                         width, height = get_media_dimensions(filepath, msg_type)
                         if width and height:
                             p_msg['width'] = width
@@ -378,8 +458,8 @@ class SyncManager:
             return
 
         try:
-            async with aiofiles.open(messages_file, encoding='utf-8') as f:
-                data = json.loads(await f.read())
+            async with aiofiles.open(messages_file, 'rb') as f:
+                data = orjson.loads(await f.read())
 
             updated = False
             for msg in data.get('messages', []):
@@ -392,8 +472,8 @@ class SyncManager:
                             updated = True
 
             if updated:
-                async with aiofiles.open(messages_file, 'w', encoding='utf-8') as f:
-                    await f.write(json.dumps(data, ensure_ascii=False, indent=2))
+                async with aiofiles.open(messages_file, 'wb') as f:
+                    await f.write(orjson.dumps(data, option=self.json_options))
 
         except Exception as e:
             logger.error("Failed to update message metadata", file=str(messages_file), error=str(e))
@@ -1,6 +1,7 @@
 import base64
 import json
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Optional
 from urllib.parse import urlparse
 
@@ -64,7 +65,12 @@ def parse_jwt_expiry(token: str) -> Optional[int]:
     """
     if not token:
         return None
+    return _decode_jwt_expiry(token)
 
+
+@lru_cache(maxsize=32)
+def _decode_jwt_expiry(token: str) -> Optional[int]:
+    # Tokens are re-checked far more often than they change, so decode each one once
     try:
         parts = token.split('.')
         if len(parts) < 2:
@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from pyhako import Client, Group
+from pyhako.credentials import reset_keyring_cache
 
 
 @pytest.fixture
@@ -18,3 +19,18 @@ def mock_session():
 @pytest.fixture
 def client():
     return Client(group=Group.HINATAZAKA46, access_token="test_token")
+
+@pytest.fixture
+def header_value():
+    """Build a stand-in for Playwright's async, case-insensitive Request.header_value()."""
+    def make(headers):
+        lowered = {k.lower(): v for k, v in headers.items()}
+        return AsyncMock(side_effect=lambda name: lowered.get(name.lower()))
+    return make
+
+@pytest.fixture(autouse=True)
+def _fresh_keyring_probe():
+    # Tests patch the keyring module, so never reuse another test's probe result
+    reset_keyring_cache()
+    yield
+    reset_keyring_cache()
@@ -1,6 +1,9 @@
 """Extended tests for pyhako.auth module to improve coverage."""
 
 import asyncio
+import json
+import os
+import stat
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -75,7 +78,7 @@ class TestBrowserAuthLogin:
                 assert result is None
 
     @pytest.mark.asyncio
-    async def test_login_captures_token_from_response(self):
+    async def test_login_captures_token_from_response(self, header_value):
         """Test that token is captured from API response."""
         with patch("pyhako.auth.async_playwright") as mock_pw:
             mock_ctx = AsyncMock()
@@ -110,6 +113,7 @@ class TestBrowserAuthLogin:
                     captured_handler = handler
 
             mock_page.on = capture_on
+            mock_page.remove_listener = MagicMock()
 
             # Start login as a task
             login_task = asyncio.create_task(
@@ -128,6 +132,7 @@ class TestBrowserAuthLogin:
                     "x-talk-app-id": "test_app_id",
                     "user-agent": "test_ua"
                 }
+                mock_request.header_value = header_value(mock_request.headers)
 
                 mock_response = MagicMock()
                 mock_response.status = 200
@@ -141,6 +146,7 @@ class TestBrowserAuthLogin:
             assert result["access_token"] == "test_token_123"
             assert result["app_id"] == "test_app_id"
             assert result["cookies"]["session"] == "sess123"
+            mock_page.remove_listener.assert_called_once_with("response", captured_handler)
 
 
 class TestBrowserAuthRefreshHeadless:
@@ -204,15 +210,30 @@ class TestBrowserAuthRefreshHeadless:
                 side_effect=Exception("Executable doesn't exist")
             )
 
-            # Browser error should result in None
-            result = await BrowserAuth.refresh_token_headless(
-                Group.NOGIZAKA46,
-                auth_dir
-            )
+            # Browser error should result in None (after one off-loop install attempt)
+            with patch("pyhako.auth._install_chromium", new_callable=AsyncMock) as mock_install:
+                result = await BrowserAuth.refresh_token_headless(
+                    Group.NOGIZAKA46,
+                    auth_dir
+                )
             assert result is None
+            mock_install.assert_awaited_once_with()
+
+    @pytest.mark.asyncio
+    async def test_install_chromium_subprocess_failure(self):
+        """A failing installer subprocess surfaces as RuntimeError with its last stderr line."""
+        from pyhako.auth import _install_chromium
+
+        proc = MagicMock(returncode=1)
+        proc.communicate = AsyncMock(return_value=(b"", b"Downloading...\nHost unreachable\n"))
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=proc)) as mock_exec:
+            with pytest.raises(RuntimeError, match="Host unreachable"):
+                await _install_chromium()
+
+        assert mock_exec.await_args.args[1:] == ("-m", "playwright", "install", "chromium")
 
     @pytest.mark.asyncio
-    async def test_refresh_headless_success(self, tmp_path):
+    async def test_refresh_headless_success(self, tmp_path, header_value):
         """Test successful headless refresh."""
         auth_dir = tmp_path / "auth"
         auth_dir.mkdir()
@@ -245,6 +266,7 @@ class TestBrowserAuthRefreshHeadless:
                     captured_handler = handler
 
             mock_page.on = capture_on
+            mock_page.remove_listener = MagicMock()
 
             # Start refresh as task
             refresh_task = asyncio.create_task(
@@ -262,6 +284,7 @@ class TestBrowserAuthRefreshHeadless:
                     "x-talk-app-id": "app123",
                     "user-agent": "ua123"
                 }
+                mock_request.header_value = header_value(mock_request.headers)
 
                 mock_response = MagicMock()
                 mock_response.status = 200
@@ -274,3 +297,449 @@ class TestBrowserAuthRefreshHeadless:
             assert result is not None
             assert result["access_token"] == "refreshed_token"
             assert result["cookies"]["session"] == "refreshed_sess"
+
+
+    @pytest.mark.asyncio
+    async def test_refresh_headless_token_beats_navigation(self, tmp_path, header_value):
+        """The token is returned as soon as it is captured, even if goto() has not returned."""
+        auth_dir = tmp_path / "auth"
+        auth_dir.mkdir()
+
+        with patch("pyhako.auth.async_playwright") as mock_pw:
+            mock_ctx = AsyncMock()
+            mock_pw.return_value = mock_ctx
+
+            mock_p = AsyncMock()
+            mock_ctx.__aenter__.return_value = mock_p
+
+            mock_context = AsyncMock()
+            mock_p.chromium.launch_persistent_context = AsyncMock(return_value=mock_context)
+            mock_context.pages = []
+            mock_context.cookies = AsyncMock(return_value=[])
+
+            mock_page = AsyncMock()
+            mock_context.new_page = AsyncMock(return_value=mock_page)
+            mock_page.remove_listener = MagicMock()
+
+            goto_cancelled = asyncio.Event()
+
+            async def hanging_goto(*args, **kwargs):
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    goto_cancelled.set()
+                    raise
+
+            mock_page.goto = hanging_goto
+
+            handlers = []
+            mock_page.on = lambda event, handler: handlers.append(handler)
+
+            refresh_task = asyncio.create_task(
+                BrowserAuth.refresh_token_headless(Group.NOGIZAKA46, auth_dir)
+            )
+            await asyncio.sleep(0.05)
+
+            mock_request = MagicMock()
+            mock_request.url = "https://api.message.nogizaka46.com/v2/groups"
+            mock_request.header_value = header_value({"authorization": "Bearer early_token"})
+            mock_response = MagicMock(status=200, request=mock_request)
+            await handlers[0](mock_response)
+
+            result = await asyncio.wait_for(refresh_task, timeout=1)
+            assert result["access_token"] == "early_token"
+            assert goto_cancelled.is_set()
+
+            await BrowserAuth.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_headless_uses_storage_state(self, tmp_path):
+        """A storage_state snapshot is tried first; a stale one is dropped for the profile."""
+        auth_dir = tmp_path / "auth"
+        auth_dir.mkdir()
+        state_path = auth_dir / "state.json"
+        state_path.write_text('{"cookies": [], "origins": []}')
+
+        with patch("pyhako.auth.async_playwright") as mock_pw:
+            mock_ctx = AsyncMock()
+            mock_pw.return_value = mock_ctx
+
+            mock_p = AsyncMock()
+            mock_ctx.__aenter__.return_value = mock_p
+
+            mock_browser = AsyncMock()
+            mock_p.chromium.launch = AsyncMock(return_value=mock_browser)
+            mock_context = AsyncMock()
+            mock_browser.new_context = AsyncMock(return_value=mock_context)
+            mock_page = AsyncMock()
+            mock_page.on = MagicMock()
+            mock_context.new_page = AsyncMock(return_value=mock_page)
+
+            with patch("asyncio.wait_for", side_effect=asyncio.TimeoutError):
+                result = await BrowserAuth.refresh_token_headless(Group.NOGIZAKA46, auth_dir)
+
+            assert result is None
+            mock_browser.new_context.assert_awaited_once_with(storage_state=str(state_path))
+            # Closing the throwaway context takes the page with it
+            mock_page.close.assert_not_awaited()
+            mock_context.close.assert_awaited_once()
+            # The browser itself stays warm for the next refresh
+            mock_browser.close.assert_not_awaited()
+            # The snapshot timed out: it is deleted and the profile gets one try
+            assert not state_path.exists()
+            mock_p.chromium.launch_persistent_context.assert_awaited_once()
+
+            await BrowserAuth.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_headless_stale_state_falls_back_to_profile(self, tmp_path, header_value):
+        """A snapshot that fails is retried with the profile, which rewrites it owner-only."""
+        auth_dir = tmp_path / "auth"
+        auth_dir.mkdir()
+        state_path = auth_dir / "state.json"
+        state_path.write_text('{"cookies": [], "origins": []}')
+
+        with patch("pyhako.auth.async_playwright") as mock_pw:
+            mock_ctx = AsyncMock()
+            mock_pw.return_value = mock_ctx
+
+            mock_p = AsyncMock()
+            mock_ctx.__aenter__.return_value = mock_p
+
+            # Snapshot attempt: navigation fails outright
+            stale_page = AsyncMock()
+            stale_page.on = MagicMock()
+            stale_page.goto = AsyncMock(side_effect=Exception("net::ERR_ABORTED"))
+            stale_context = AsyncMock()
+            stale_context.new_page = AsyncMock(return_value=stale_page)
+            mock_browser = AsyncMock()
+            mock_browser.new_context = AsyncMock(return_value=stale_context)
+            mock_p.chromium.launch = AsyncMock(return_value=mock_browser)
+
+            # Profile attempt: the page's first API call carries the token
+            profile_page = AsyncMock()
+            handlers = []
+            profile_page.on = lambda event, handler: handlers.append(handler)
+            profile_page.remove_listener = MagicMock()
+
+            async def navigate(*args, **kwargs):
+                request = MagicMock()
+                request.url = "https://api.message.nogizaka46.com/v2/foo"
+                request.header_value = header_value({"Authorization": "Bearer fresh_token"})
+                response = MagicMock(status=200, request=request)
+                await handlers[0](response)
+
+            profile_page.goto = AsyncMock(side_effect=navigate)
+            profile_context = AsyncMock()
+            profile_context.new_page = AsyncMock(return_value=profile_page)
+            profile_context.cookies = AsyncMock(return_value=[])
+            profile_context.storage_state = AsyncMock(return_value={"cookies": [{"name": "s"}], "origins": []})
+            mock_p.chromium.launch_persistent_context = AsyncMock(return_value=profile_context)
+
+            result = await BrowserAuth.refresh_token_headless(Group.NOGIZAKA46, auth_dir)
+
+            assert result["access_token"] == "fresh_token"
+            mock_p.chromium.launch_persistent_context.assert_awaited_once()
+            assert json.loads(state_path.read_text()) == {"cookies": [{"name": "s"}], "origins": []}
+            if os.name == "posix":
+                assert stat.S_IMODE(state_path.stat().st_mode) == 0o600
+
+            await BrowserAuth.close()
+
+
+class TestPlaywrightPool:
+    """Tests for the shared Playwright driver/browser pool."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_reuses_driver_and_context(self, tmp_path):
+        """Repeated headless refreshes reuse one driver and one persistent context."""
+        auth_dir = tmp_path / "auth"
+        auth_dir.mkdir()
+
+        with patch("pyhako.auth.async_playwright") as mock_pw:
+            mock_ctx = AsyncMock()
+            mock_pw.return_value = mock_ctx
+
+            mock_p = AsyncMock()
+            mock_ctx.__aenter__.return_value = mock_p
+
+            mock_context = AsyncMock()
+            mock_p.chromium.launch_persistent_context = AsyncMock(return_value=mock_context)
+            mock_context.pages = []
+            mock_page = AsyncMock()
+            mock_page.on = MagicMock()
+            mock_context.new_page = AsyncMock(return_value=mock_page)
+
+            with patch("asyncio.wait_for", side_effect=asyncio.TimeoutError):
+                for _ in range(2):
+                    assert await BrowserAuth.refresh_token_headless(Group.NOGIZAKA46, auth_dir) is None
+
+            assert mock_pw.call_count == 1
+            assert mock_p.chromium.launch_persistent_context.await_count == 1
+            assert mock_page.close.await_count == 2
+            mock_context.close.assert_not_awaited()
+
+            await BrowserAuth.close()
+            mock_context.close.assert_awaited_once()
+            mock_ctx.__aexit__.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_pooled_login_context_registers_stealth_once(self, tmp_path):
+        """Logins on a pooled profile add the stealth script once and each get their own page."""
+        with patch("pyhako.auth.async_playwright") as mock_pw:
+            mock_ctx = AsyncMock()
+            mock_pw.return_value = mock_ctx
+
+            mock_p = AsyncMock()
+            mock_ctx.__aenter__.return_value = mock_p
+
+            mock_context = AsyncMock()
+            mock_p.chromium.launch_persistent_context = AsyncMock(return_value=mock_context)
+            mock_context.pages = [AsyncMock()]  # the tab Chromium opens with
+            mock_page = AsyncMock()
+            mock_page.on = MagicMock()
+            mock_context.new_page = AsyncMock(return_value=mock_page)
+
+            with patch("asyncio.wait_for", side_effect=asyncio.TimeoutError):
+                for _ in range(2):
+                    await BrowserAuth.login(Group.NOGIZAKA46, headless=True, user_data_dir=str(tmp_path / "profile"))
+
+            assert mock_p.chromium.launch_persistent_context.await_count == 1
+            mock_context.add_init_script.assert_awaited_once()
+            assert mock_context.new_page.await_count == 2
+            assert mock_page.close.await_count == 2
+
+            await BrowserAuth.close()
+
+    @pytest.mark.asyncio
+    async def test_login_and_refresh_do_not_share_browser(self, tmp_path):
+        """A headless login and a storage-state refresh launch separately configured browsers."""
+        auth_dir = tmp_path / "auth"
+        auth_dir.mkdir()
+        (auth_dir / "state.json").write_text('{"cookies": [], "origins": []}')
+
+        with patch("pyhako.auth.async_playwright") as mock_pw:
+            mock_ctx = AsyncMock()
+            mock_pw.return_value = mock_ctx
+
+            mock_p = AsyncMock()
+            mock_ctx.__aenter__.return_value = mock_p
+
+            mock_browser = AsyncMock()
+            mock_p.chromium.launch = AsyncMock(return_value=mock_browser)
+            mock_context = AsyncMock()
+            mock_browser.new_context = AsyncMock(return_value=mock_context)
+            mock_page = AsyncMock()
+            mock_page.on = MagicMock()
+            mock_context.new_page = AsyncMock(return_value=mock_page)
+
+            with patch("asyncio.wait_for", side_effect=asyncio.TimeoutError):
+                await BrowserAuth.login(Group.NOGIZAKA46, headless=True)
+                await BrowserAuth.refresh_token_headless(Group.NOGIZAKA46, auth_dir)
+
+            assert mock_p.chromium.launch.await_count == 2
+            login_args, refresh_args = (c.kwargs["args"] for c in mock_p.chromium.launch.await_args_list)
+            assert login_args != refresh_args
+
+            await BrowserAuth.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_context_is_closed(self, tmp_path):
+        """A pooled context unused for IDLE_TIMEOUT seconds is closed in the background."""
+        from pyhako.auth import _PlaywrightPool
+
+        auth_dir = tmp_path / "auth"
+        auth_dir.mkdir()
+
+        with patch("pyhako.auth.async_playwright") as mock_pw, \
+             patch.object(_PlaywrightPool, "IDLE_TIMEOUT", 0.01):
+            mock_ctx = AsyncMock()
+            mock_pw.return_value = mock_ctx
+
+            mock_p = AsyncMock()
+            mock_ctx.__aenter__.return_value = mock_p
+
+            mock_context = AsyncMock()
+            mock_p.chromium.launch_persistent_context = AsyncMock(return_value=mock_context)
+            mock_context.pages = []
+            mock_page = AsyncMock()
+            mock_page.on = MagicMock()
+            mock_context.new_page = AsyncMock(return_value=mock_page)
+
+            with patch("asyncio.wait_for", side_effect=asyncio.TimeoutError):
+                await BrowserAuth.refresh_token_headless(Group.NOGIZAKA46, auth_dir)
+            mock_context.close.assert_not_awaited()
+
+            await asyncio.sleep(0.05)
+            mock_context.close.assert_awaited_once()
+
+            await BrowserAuth.close()
+            mock_context.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_profile_in_use_is_waited_for(self):
+        """A launch for a profile held under another purpose waits instead of closing it."""
+        from pyhako.auth import _PlaywrightPool
+
+        login_ctx, refresh_ctx = AsyncMock(), AsyncMock()
+        login_key = ("/profile", True, None, "login")
+        refresh_key = ("/profile", True, None, "refresh")
+
+        with patch("pyhako.auth.async_playwright"):
+            held = await _PlaywrightPool.acquire(login_key, AsyncMock(return_value=login_ctx))
+            waiting = asyncio.ensure_future(_PlaywrightPool.acquire(refresh_key, AsyncMock(return_value=refresh_ctx)))
+            await asyncio.sleep(0.01)
+            assert not waiting.done()
+            login_ctx.close.assert_not_awaited()
+
+            await _PlaywrightPool.release(login_key, held)
+            assert await waiting is refresh_ctx
+            login_ctx.close.assert_awaited_once()
+
+            await _PlaywrightPool.release(refresh_key, refresh_ctx)
+            await BrowserAuth.close()
+
+    @pytest.mark.asyncio
+    async def test_held_entries_survive_eviction_and_reaper(self):
+        """LRU eviction and the idle reaper skip browsers a caller still holds."""
+        from pyhako.auth import _PlaywrightPool
+
+        first, second = AsyncMock(), AsyncMock()
+        first_key = (None, True, None, "login")
+        second_key = (None, True, None, "refresh")
+
+        with patch("pyhako.auth.async_playwright"), \
+             patch.object(_PlaywrightPool, "MAX_ENTRIES", 1), \
+             patch.object(_PlaywrightPool, "IDLE_TIMEOUT", 0.01):
+            await _PlaywrightPool.acquire(first_key, AsyncMock(return_value=first))
+            await _PlaywrightPool.acquire(second_key, AsyncMock(return_value=second))
+            await _PlaywrightPool.release(second_key, second)
+
+            await asyncio.sleep(0.05)
+            await _PlaywrightPool.evict_idle()
+            first.close.assert_not_awaited()
+            second.close.assert_awaited_once()
+
+            # Reaped once its holder lets go
+            await _PlaywrightPool.release(first_key, first)
+            await asyncio.sleep(0.05)
+            first.close.assert_awaited_once()
+
+            await BrowserAuth.close()
+
+
+def _make_jwt(exp: int) -> str:
+    import base64
+
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJub25lIn0.{payload}.sig"
+
+
+class TestRefreshReusesStoredToken:
+    """Tests for skipping the browser when a stored token is still valid."""
+
+    @pytest.mark.asyncio
+    async def test_valid_stored_token_skips_browser(self, tmp_path):
+        import time
+
+        token = _make_jwt(int(time.time()) + 3600)
+        manager = MagicMock()
+        manager.load_session.return_value = {"access_token": token, "cookies": {"session": "s"}}
+
+        with patch("pyhako.auth.async_playwright") as mock_pw:
+            result = await BrowserAuth.refresh_token_headless(
+                Group.HINATAZAKA46, tmp_path, token_manager=manager, stale_token="old"
+            )
+
+        mock_pw.assert_not_called()
+        assert result["access_token"] == token
+        assert result["cookies"] == {"session": "s"}
+        # Read past the in-process cache so tokens saved by other processes are seen
+        manager.load_session.assert_called_once_with(Group.HINATAZAKA46.value, fresh=True)
+
+    @pytest.mark.asyncio
+    async def test_stale_or_expiring_token_is_not_reused(self):
+        import time
+
+        expiring = _make_jwt(int(time.time()) + 60)
+        valid = _make_jwt(int(time.time()) + 3600)
+        manager = MagicMock()
+
+        manager.load_session.return_value = {"access_token": expiring}
+        assert BrowserAuth._load_reusable_session(Group.HINATAZAKA46, manager, None) is None
+
+        manager.load_session.return_value = {"access_token": valid}
+        assert BrowserAuth._load_reusable_session(Group.HINATAZAKA46, manager, valid) is None
+
+        manager.load_session.side_effect = Exception("keyring locked")
+        assert BrowserAuth._load_reusable_session(Group.HINATAZAKA46, manager, None) is None
+
+
+    @pytest.mark.asyncio
+    async def test_recent_refresh_is_reused_until_invalidated(self, tmp_path):
+        import time
+
+        token = _make_jwt(int(time.time()) + 3600)
+        creds = {"access_token": token, "refresh_token": None, "cookies": {}, "app_id": "", "user_agent": ""}
+        BrowserAuth._refresh_cache[(Group.SAKURAZAKA46, str(tmp_path.resolve()))] = creds
+
+        with patch("pyhako.auth._PlaywrightPool.acquire", new_callable=AsyncMock) as mock_acquire:
+            mock_acquire.side_effect = Exception("browser must not launch")
+
+            result = await BrowserAuth.refresh_token_headless(Group.SAKURAZAKA46, tmp_path)
+            assert result == creds
+            assert result is not creds
+
+            # A token the API already rejected is never handed back
+            assert await BrowserAuth.refresh_token_headless(
+                Group.SAKURAZAKA46, tmp_path, stale_token=token
+            ) is None
+
+            BrowserAuth.invalidate_refresh(Group.SAKURAZAKA46, str(tmp_path))
+            assert await BrowserAuth.refresh_token_headless(Group.SAKURAZAKA46, tmp_path) is None
+            assert mock_acquire.await_count == 2
+
+class TestLoginCachePolicy:
+    """Tests for BrowserAuth.login cache_policy handling."""
+
+    @pytest.mark.asyncio
+    async def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            await BrowserAuth.login(Group.HINATAZAKA46, cache_policy="sometimes")
+
+    @pytest.mark.asyncio
+    async def test_enabled_returns_valid_cached_login(self):
+        import time
+
+        token = _make_jwt(int(time.time()) + 3600)
+        manager = MagicMock()
+        manager.store.load.return_value = {"access_token": token, "cookies": {"session": "s"}, "app_id": "a"}
+
+        with patch("pyhako.auth.get_token_manager", return_value=manager), \
+                patch("pyhako.auth.async_playwright") as mock_pw:
+            result = await BrowserAuth.login(Group.HINATAZAKA46, cache_policy="enabled")
+
+        mock_pw.assert_not_called()
+        assert result["access_token"] == token
+        assert result["app_id"] == "a"
+        key = manager.store.load.call_args[0][0]
+        assert key == BrowserAuth._cache_key(Group.HINATAZAKA46, None, None)
+        assert key != BrowserAuth._cache_key(Group.HINATAZAKA46, "/tmp/profile", None)
+
+    @pytest.mark.asyncio
+    async def test_replay_miss_never_opens_browser(self):
+        import time
+
+        manager = MagicMock()
+        manager.store.load.return_value = {"access_token": _make_jwt(int(time.time()) - 10)}
+
+        with patch("pyhako.auth.get_token_manager", return_value=manager), \
+                patch("pyhako.auth.async_playwright") as mock_pw:
+            assert await BrowserAuth.login(Group.HINATAZAKA46, cache_policy="replay") is None
+
+        mock_pw.assert_not_called()
+
+    def test_store_failure_is_non_fatal(self):
+        with patch("pyhako.auth.get_token_manager", side_effect=Exception("no keyring")):
+            BrowserAuth._store_cached_login("login-x", {"access_token": "t"})
+            assert BrowserAuth._load_cached_login("login-x") is None
@@ -1,5 +1,6 @@
 """Tests for blog scraping module."""
 
+import sys
 from datetime import datetime
 from unittest.mock import MagicMock
 from zoneinfo import ZoneInfo
@@ -14,6 +15,7 @@ from pyhako.blog import (
     get_scraper,
 )
 from pyhako.client import Group
+from pyhako.http import CONNECTOR_LIMIT_PER_HOST
 
 JST = ZoneInfo("Asia/Tokyo")
 
@@ -49,6 +51,111 @@ class TestBlogEntry:
         assert entry.member_id == ""
         assert entry.member_name == ""
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_blog_entry_is_slotted(self):
+        entry = BlogEntry(id="1", title="", content="", published_at=datetime.now(JST), url="")
+        assert not hasattr(entry, "__dict__")
+        with pytest.raises(AttributeError):
+            entry.extra = "x"
+
+
+@pytest.mark.parametrize("use_selectolax", [True, False])
+def test_extract_img_srcs(monkeypatch, use_selectolax):
+    """Both parser backends return image sources in document order, skipping empty ones."""
+    from pyhako.blog import base
+
+    if use_selectolax:
+        pytest.importorskip("selectolax")
+    else:
+        monkeypatch.setattr(base, "LexborHTMLParser", None)
+
+    html = '<p>hi<img src="/a.jpg"></p><img src=""><div><img alt="x"><img src="https://cdn/b.png?x=1&amp;y=2"></div>'
+    assert base.extract_img_srcs(html) == ["/a.jpg", "https://cdn/b.png?x=1&y=2"]
+    assert base.extract_img_srcs('<P><IMG SRC="/c.jpg"></P>') == ["/c.jpg"]
+
+
+def test_extract_img_srcs_skips_parse_without_img(monkeypatch):
+    from pyhako.blog import base
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parser should not run")
+
+    monkeypatch.setattr(base, "LexborHTMLParser", fail)
+    assert base.extract_img_srcs("<p>text only, no images</p>") == []
+
+
+
+@pytest.mark.parametrize(
+    "href, expected",
+    [
+        ("/s/official/diary/member/list?ima=0000&ct=42", "42"),
+        ("https://www.hinatazaka46.com/s/official/diary/member/list?ct=7#top", "7"),
+        ("/s/official/diary/member/list?act=5", None),
+        ("/s/official/diary/member/list?ct=abc", None),
+        ("/s/official/diary/member/list", None),
+    ],
+)
+def test_hinatazaka_extract_ct(href, expected):
+    from pyhako.blog.hinatazaka import _extract_ct
+
+    assert _extract_ct(href) == expected
+
+
+def test_lxml_detail_helpers():
+    """Class predicates match whole class tokens; text mirrors get_text(strip=True)."""
+    from lxml import etree
+
+    from pyhako.blog.base import element_html, element_text, parse_html_tree, xpath_has_class
+
+    tree = parse_html_tree(
+        '<div class="a-title-sub">no</div><div class="x  a-title">'
+        " Hi <b> there </b><script>var s;</script></div>tail"
+    )
+    (elem,) = etree.XPath(f"//*[{xpath_has_class('a-title')}]")(tree)
+    assert element_text(elem) == "Hithere"
+    assert element_html(elem).endswith("</div>")
+    assert parse_html_tree("  ").tag == "html"
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2024.1.23 16:03", datetime(2024, 1, 23, 16, 3, tzinfo=JST)),
+        ("2026/01/08 20:17:04", datetime(2026, 1, 8, 20, 17, 4, tzinfo=JST)),
+        ("2026/01/08 20:17", datetime(2026, 1, 8, 20, 17, tzinfo=JST)),
+        (" 2026/1/08 ", datetime(2026, 1, 8, tzinfo=JST)),
+        ("2024.1.23", datetime(2024, 1, 23, tzinfo=JST)),
+    ],
+)
+def test_parse_jst_datetime_formats(text, expected):
+    from pyhako.blog.config import parse_jst_datetime
+
+    assert parse_jst_datetime(text) == expected
+
+
+@pytest.mark.parametrize("text", ["2024.1.23  16:03", "2024/1/23 7:05:09"])
+def test_parse_jst_datetime_matches_strptime(text):
+    """Results agree with strptime, including inputs the integer fast path hands back to it."""
+    from pyhako.blog.config import parse_jst_datetime
+
+    fmt = "%Y.%m.%d %H:%M" if "." in text else "%Y/%m/%d %H:%M:%S"
+    assert parse_jst_datetime(text) == datetime.strptime(text, fmt).replace(tzinfo=JST)
+
+
+@pytest.mark.parametrize("text", ["2024.1.2.3", "2024.100.1", "24.1.23"])
+def test_parse_jst_datetime_rejects_malformed(text):
+    from pyhako.blog.config import parse_jst_datetime
+
+    before = datetime.now(JST)
+    assert parse_jst_datetime(text) >= before
+
+
+def test_parse_jst_datetime_unparseable_falls_back_to_now():
+    from pyhako.blog.config import parse_jst_datetime
+
+    before = datetime.now(JST)
+    assert parse_jst_datetime("2024.1.23 16:03:00") >= before
+
 
 class TestGetScraper:
     """Tests for get_scraper factory function."""
@@ -69,6 +176,10 @@ class TestGetScraper:
         scraper = get_scraper(Group.SAKURAZAKA46, mock_session)
         assert isinstance(scraper, SakurazakaBlogScraper)
 
+    def test_get_scraper_unsupported_group(self):
+        with pytest.raises(ValueError, match="Unsupported group"):
+            get_scraper(Group.YODEL, MagicMock())
+
 
 class TestHinatazakaBlogScraper:
     """Tests for HinatazakaBlogScraper."""
@@ -141,6 +252,24 @@ class TestNogizakaBlogScraper:
         with pytest.raises(ValueError):
             parse_jsonp('invalid({"data":[]})')
 
+    @pytest.mark.parametrize("jsonp", ['res({"a": 1});', 'res( {"a": 1} )\n', 'res({"a": 1});;  ', b'res({"a": 1})'])
+    def test_parse_jsonp_trailing_variants(self, jsonp):
+        from pyhako.blog.nogizaka import parse_jsonp
+
+        assert parse_jsonp(jsonp) == {"a": 1}
+
+    def test_parse_jsonp_utf8_bytes(self):
+        from pyhako.blog.nogizaka import parse_jsonp
+
+        assert parse_jsonp('res({"name": "乃木坂"});'.encode()) == {"name": "乃木坂"}
+
+    @pytest.mark.parametrize("jsonp", ['res({"a": 1}', 'res({"a": 1}) trailing', 'res({"a": 1}));'])
+    def test_parse_jsonp_bad_tail(self, jsonp):
+        from pyhako.blog.nogizaka import parse_jsonp
+
+        with pytest.raises(ValueError):
+            parse_jsonp(jsonp)
+
     def test_parse_blog_from_api(self, scraper):
         """Test parsing blog entry from API response."""
         blog_data = {
@@ -162,6 +291,23 @@ class TestNogizakaBlogScraper:
         assert len(entry.images) >= 1
         assert entry.published_at.year == 2026
 
+    def test_parse_blog_from_api_dedupes_images(self, scraper):
+        """Main image comes first and every image URL appears once, in order."""
+        blog_data = {
+            "text": (
+                '<img src="/files/a.jpg"><img src="/files/main.jpg">'
+                '<img src="/files/a.jpg"><img src="/files/b.jpg">'
+            ),
+            "img": "https://www.nogizaka46.com/files/main.jpg",
+        }
+        entry = scraper._parse_blog_from_api(blog_data)
+
+        assert entry.images == [
+            "https://www.nogizaka46.com/files/main.jpg",
+            "https://www.nogizaka46.com/files/a.jpg",
+            "https://www.nogizaka46.com/files/b.jpg",
+        ]
+
 
 class TestSakurazakaBlogScraper:
     """Tests for SakurazakaBlogScraper."""
@@ -196,3 +342,27 @@ class TestSakurazakaBlogScraper:
         assert entry.id == "67495"
         assert entry.title == "Test OG Title"
         assert "https://sakurazaka46.com/test.jpg" in entry.images
+
+
+class TestScraperSession:
+    """Tests for scraper session ownership."""
+
+    @pytest.mark.asyncio
+    async def test_owned_session_is_reused_and_closed(self):
+        scraper = get_scraper(Group.HINATAZAKA46)
+        session = scraper.session
+        assert scraper.session is session
+        assert session.connector.limit_per_host == CONNECTOR_LIMIT_PER_HOST
+
+        await scraper.close()
+        assert session.closed
+        assert scraper.session is not session
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_close_leaves_caller_session_open(self):
+        mock_session = MagicMock()
+        scraper = get_scraper(Group.SAKURAZAKA46, mock_session)
+        await scraper.close()
+        mock_session.close.assert_not_called()
+        assert scraper.session is mock_session
@@ -1,13 +1,15 @@
 """Comprehensive tests for blog scraper async methods using mocked HTTP responses."""
 
+import asyncio
 from datetime import datetime
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from zoneinfo import ZoneInfo
 
 import pytest
 
 from pyhako.blog import (
+    BlogEntry,
     HinatazakaBlogScraper,
     NogizakaBlogScraper,
     SakurazakaBlogScraper,
@@ -28,6 +30,9 @@ class MockResponse:
     async def text(self) -> str:
         return self._text
 
+    async def read(self) -> bytes:
+        return self._text.encode()
+
     async def json(self) -> Any:
         return self._json
 
@@ -73,6 +78,19 @@ class TestHinatazakaBlogScraperAsync:
         assert "41" in members
         assert members["41"] == "正源司陽子"
 
+    @pytest.mark.asyncio
+    async def test_get_members_name_from_parent(self, scraper, mock_session):
+        """Image-only member links take their name from the enclosing div."""
+        html = """
+        <div class="p-blog-member">
+            <a href="/s/official/diary/member/list?ct=40"><img src="/a.jpg"></a>
+            <p class="p-blog-member__name">松田好花</p>
+        </div>
+        """
+        mock_session.get.return_value = MockResponse(text=html, status=200)
+
+        assert await scraper.get_members() == {"40": "松田好花"}
+
     @pytest.mark.asyncio
     async def test_get_members_http_error(self, scraper, mock_session):
         """Test member list fetch with HTTP error."""
@@ -280,6 +298,19 @@ class TestSakurazakaBlogScraperAsync:
 
         assert "01" in members or len(members) >= 0  # May parse differently
 
+    @pytest.mark.asyncio
+    async def test_get_members_from_artist_links(self, scraper, mock_session):
+        """Names come from the first div in the link, falling back to the image alt."""
+        html = """
+        <ul>
+            <li><a href="/s/s46/artist/43"><div>山下 瞳月</div><div>やました しづき</div></a></li>
+            <li><a href="/s/s46/artist/44"><img src="/b.jpg" alt="村井 優"></a></li>
+        </ul>
+        """
+        mock_session.get.return_value = MockResponse(text=html, status=200)
+
+        assert await scraper.get_members() == {"43": "山下 瞳月", "44": "村井 優"}
+
     @pytest.mark.asyncio
     async def test_get_members_with_thumbnails(self, scraper, mock_session):
         """Test fetching members with thumbnails."""
@@ -305,6 +336,39 @@ class TestSakurazakaBlogScraperAsync:
         # Just check it returns a list without error
         assert isinstance(members, list)
 
+    @pytest.mark.asyncio
+    async def test_get_blogs_metadata_skips_featured_entries(self, scraper, mock_session):
+        """List boxes by other members are skipped; the thumbnail comes from span.img."""
+        html = """
+        <ul>
+            <li class="box">
+                <a href="/s/s46/diary/detail/100">
+                    <span class="img" style="background-image: url(/files/thumb.jpg);"></span>
+                    <p class="name">山下 瞳月</p>
+                    <p class="date">2026/1/15 12:00</p>
+                    <h3 class="title">Own entry</h3>
+                </a>
+            </li>
+            <li class="box">
+                <a href="/s/s46/diary/detail/101">
+                    <p class="name">村井 優</p>
+                    <p class="date">2026/1/14 12:00</p>
+                    <h3 class="title">Featured entry</h3>
+                </a>
+            </li>
+        </ul>
+        """
+        mock_session.get.side_effect = [
+            MockResponse(text=html, status=200),
+            MockResponse(text="<html><body></body></html>", status=200),
+        ]
+
+        blogs = [blog async for blog in scraper.get_blogs_metadata("43", member_name="山下瞳月", max_pages=2)]
+
+        assert [blog.id for blog in blogs] == ["100"]
+        assert blogs[0].title == "Own entry"
+        assert blogs[0].images == ["https://sakurazaka46.com/files/thumb.jpg"]
+
     @pytest.mark.asyncio
     async def test_get_blog_detail_with_og_tags(self, scraper, mock_session):
         """Test blog detail parsing with og:meta tags fallback."""
@@ -448,6 +512,23 @@ class TestNogizakaBlogScraperAsync:
 class TestBlogScraperEdgeCases:
     """Test edge cases across all scrapers."""
 
+    @pytest.mark.asyncio
+    async def test_throttled_request_is_retried(self):
+        """A 429 or 503 is waited out (Retry-After first) instead of ending the listing."""
+        mock_session = MagicMock()
+        scraper = HinatazakaBlogScraper(mock_session)
+        html = '<div class="p-blog-member"><a href="/s/official/diary/member/list?ct=40">松田好花</a></div>'
+        throttled = MockResponse(status=429)
+        throttled.headers = {"Retry-After": "3"}
+        unavailable = MockResponse(status=503)
+        unavailable.headers = {}
+        mock_session.get.side_effect = [throttled, unavailable, MockResponse(text=html)]
+
+        with patch("pyhako.http.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            assert await scraper.get_members() == {"40": "松田好花"}
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [3.0, 2.0]
+
     @pytest.mark.asyncio
     async def test_hinatazaka_normalize_url(self):
         """Test URL normalization for relative URLs."""
@@ -480,6 +561,19 @@ class TestBlogScraperEdgeCases:
         normalized = scraper.normalize_url("/files/test.jpg")
         assert normalized.startswith("https://")
 
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("", ""),
+            ("//cdn.example.com/a.jpg", "https://cdn.example.com/a.jpg"),
+            ("/files/a.jpg", "https://sakurazaka46.com/files/a.jpg"),
+            ("files/a.jpg", "https://sakurazaka46.com/files/a.jpg"),
+            ("http://example.com/a.jpg", "http://example.com/a.jpg"),
+        ],
+    )
+    def test_normalize_url_forms(self, url, expected):
+        assert SakurazakaBlogScraper(MagicMock()).normalize_url(url) == expected
+
     @pytest.mark.asyncio
     async def test_duplicate_blog_id_handling(self):
         """Test that duplicate blog IDs are filtered."""
@@ -519,3 +613,266 @@ class TestBlogScraperEdgeCases:
         # Should only have 1 blog even though there were 2 with same ID
         assert len(blogs) == 1
         assert blogs[0].id == "12345"
+
+    @pytest.mark.asyncio
+    async def test_iter_blog_details_bounded_and_ordered(self, monkeypatch):
+        """Detail pages are fetched in parallel up to the limit but yielded in list order."""
+        from pyhako.blog import base
+
+        monkeypatch.setattr(base, "DETAIL_CONCURRENCY", 2)
+        scraper = HinatazakaBlogScraper(MagicMock())
+        in_flight = peak = 0
+
+        async def fake_detail(blog_id, member_id=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later IDs finish first
+            await asyncio.sleep(0.01 * (5 - int(blog_id)))
+            in_flight -= 1
+            if blog_id == "3":
+                raise ValueError("gone")
+            return BlogEntry(id=blog_id, title="", content="", published_at=datetime.now(JST), url="")
+
+        scraper.get_blog_detail = fake_detail
+        entries = [e async for e in scraper._iter_blog_details(["1", "2", "3", "4"], "40")]
+
+        assert [e.id for e in entries] == ["1", "2", "4"]
+        assert all(e.member_id == "40" for e in entries)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_get_blogs_since_date_cancels_pending_details(self):
+        """Stopping at since_date cancels detail fetches still in flight."""
+        mock_session = MagicMock()
+        scraper = SakurazakaBlogScraper(mock_session)
+        html = "".join(
+            f'<li class="box"><a href="/s/s46/diary/detail/{i}"></a><p class="date">2026/1/{10 - i}</p></li>'
+            for i in range(1, 5)
+        )
+        mock_session.get.return_value = MockResponse(text=f"<ul>{html}</ul>")
+        cancelled = []
+
+        async def fake_detail(blog_id, member_id=None):
+            if blog_id == "1":
+                return BlogEntry(id="1", title="", content="", published_at=datetime(2026, 1, 9, tzinfo=JST), url="")
+            if blog_id == "2":
+                return BlogEntry(id="2", title="", content="", published_at=datetime(2020, 1, 1, tzinfo=JST), url="")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(blog_id)
+                raise
+
+        scraper.get_blog_detail = fake_detail
+        since_date = datetime(2025, 1, 1, tzinfo=JST)
+        entries = [e async for e in scraper.get_blogs("7", since_date=since_date)]
+        await asyncio.sleep(0)
+
+        assert [e.id for e in entries] == ["1"]
+        assert sorted(cancelled) == ["3", "4"]
+        assert mock_session.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_hinatazaka_get_blogs_pages_until_empty(self):
+        """Full-content listing walks pages until one has no articles."""
+        mock_session = MagicMock()
+        scraper = HinatazakaBlogScraper(mock_session)
+        page = '<article class="p-blog-article"><a href="/s/official/diary/detail/{0}">x</a></article>'
+        mock_session.get.side_effect = [
+            MockResponse(text=page.format(1) + page.format(2)),
+            MockResponse(text=page.format(2) + page.format(3)),
+            MockResponse(text="<html><body></body></html>"),
+        ]
+
+        async def fake_detail(blog_id, member_id=None):
+            return BlogEntry(id=blog_id, title="", content="", published_at=datetime.now(JST), url="")
+
+        scraper.get_blog_detail = fake_detail
+        entries = [e async for e in scraper.get_blogs("40")]
+
+        assert [e.id for e in entries] == ["1", "2", "3"]
+        assert all(e.member_id == "40" for e in entries)
+        assert mock_session.get.call_count == 3
+
+
+class TestBlogCache:
+    """Tests for the persistent BlogCache."""
+
+    @pytest.mark.asyncio
+    async def test_members_cached_until_ttl(self, tmp_path, monkeypatch):
+        from pyhako.blog import BlogCache, cache
+
+        clock = [1000.0]
+        monkeypatch.setattr(cache.time, "time", lambda: clock[0])
+        mock_session = MagicMock()
+        html = '<div><a href="/s/official/diary/member/list?ct=40">松田好花</a></div>'
+        mock_session.get.return_value = MockResponse(text=html)
+
+        scraper = HinatazakaBlogScraper(mock_session, cache=BlogCache(tmp_path / "blog_cache.json"))
+        assert await scraper.get_members() == {"40": "松田好花"}
+
+        # A new process reading the same file skips the request
+        again = HinatazakaBlogScraper(mock_session, cache=BlogCache(tmp_path / "blog_cache.json"))
+        assert await again.get_members() == {"40": "松田好花"}
+        assert mock_session.get.call_count == 1
+
+        clock[0] += 2 * 24 * 60 * 60
+        await again.get_members()
+        assert mock_session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_blogs_stops_at_last_seen(self, tmp_path):
+        from pyhako.blog import BlogCache
+
+        blog_cache = BlogCache(tmp_path / "blog_cache.json")
+        mock_session = MagicMock()
+        scraper = NogizakaBlogScraper(mock_session, cache=blog_cache)
+
+        def page(*codes):
+            blogs = ",".join(f'{{"code": "{c}", "date": "2026/01/0{c} 10:00:00"}}' for c in codes)
+            return MockResponse(text=f'res({{"data": [{blogs}]}});')
+
+        mock_session.get.side_effect = [page(3, 2, 1)]
+        assert [e.id for e in [e async for e in scraper.get_blogs("55401")]] == ["3", "2", "1"]
+        assert BlogCache(tmp_path / "blog_cache.json").get_last_seen(scraper.base_url, "55401") == "3"
+
+        # Next run: only blogs newer than the mark, and paging stops at it
+        mock_session.get.side_effect = [page(5, 4, 3, 2)]
+        assert [e.id for e in [e async for e in scraper.get_blogs("55401")]] == ["5", "4"]
+        assert blog_cache.get_last_seen(scraper.base_url, "55401") == "5"
+
+        # Abandoning an iteration early leaves the mark alone
+        mock_session.get.side_effect = [page(7, 6, 5)]
+        blogs = scraper.get_blogs("55401")
+        async for _ in blogs:
+            break
+        await blogs.aclose()
+        assert blog_cache.get_last_seen(scraper.base_url, "55401") == "5"
+
+    @pytest.mark.asyncio
+    async def test_failed_detail_keeps_last_seen(self, tmp_path):
+        from pyhako.blog import BlogCache
+
+        blog_cache = BlogCache(tmp_path / "blog_cache.json")
+        blog_cache.set_last_seen("https://www.hinatazaka46.com", "40", "1")
+        scraper = HinatazakaBlogScraper(MagicMock(), cache=blog_cache)
+        failing = {"3"}
+
+        async def fake_detail(blog_id, member_id=None):
+            if blog_id in failing:
+                raise ValueError("temporarily unavailable")
+            return BlogEntry(id=blog_id, title="", content="", published_at=datetime.now(JST), url="")
+
+        def fake_listed(list_url, member_id, since_date):
+            return scraper._iter_blog_details(["3", "2", "1"], member_id)
+
+        scraper.get_blog_detail = fake_detail
+        scraper._iter_listed_blogs = fake_listed
+
+        # Blog 3 fails: the mark must not move past it
+        assert [e.id async for e in scraper.get_blogs("40")] == ["2"]
+        assert blog_cache.get_last_seen(scraper.base_url, "40") == "1"
+
+        # Retried next run; once everything succeeds the mark advances
+        failing.clear()
+        assert [e.id async for e in scraper.get_blogs("40")] == ["3", "2"]
+        assert blog_cache.get_last_seen(scraper.base_url, "40") == "3"
+
+    @pytest.mark.asyncio
+    async def test_failed_list_page_keeps_last_seen(self, tmp_path):
+        from pyhako.blog import BlogCache
+
+        blog_cache = BlogCache(tmp_path / "blog_cache.json")
+        blog_cache.set_last_seen("https://www.hinatazaka46.com", "40", "1")
+        mock_session = MagicMock()
+        scraper = HinatazakaBlogScraper(mock_session, cache=blog_cache)
+
+        async def fake_detail(blog_id, member_id=None):
+            return BlogEntry(id=blog_id, title="", content="", published_at=datetime.now(JST), url="")
+
+        scraper.get_blog_detail = fake_detail
+
+        def page(*ids):
+            articles = "".join(
+                f'<article class="p-blog-article"><a href="/s/official/diary/detail/{i}"></a></article>' for i in ids
+            )
+            return MockResponse(text=f"<html><body>{articles}</body></html>")
+
+        # Page 1 fails: blogs 3 and 2 were never listed, so the mark must not move past them
+        mock_session.get.side_effect = [page(5, 4), MockResponse(status=500)]
+        assert [e.id async for e in scraper.get_blogs("40")] == ["5", "4"]
+        assert blog_cache.get_last_seen(scraper.base_url, "40") == "1"
+
+        # The next run pages down to the old mark again and then advances it
+        mock_session.get.side_effect = [page(5, 4), page(3, 2, 1)]
+        assert [e.id async for e in scraper.get_blogs("40")] == ["5", "4", "3", "2"]
+        assert blog_cache.get_last_seen(scraper.base_url, "40") == "5"
+
+    def test_save_replaces_file_atomically(self, tmp_path, monkeypatch):
+        from pyhako.blog import BlogCache, cache
+
+        path = tmp_path / "blog_cache.json"
+        blog_cache = BlogCache(path)
+        blog_cache.set_last_seen("site", "40", "1")
+
+        def crash(*args, **kwargs):
+            raise OSError("disk full")
+
+        # A write that dies midway leaves the previous file and no temp files behind
+        monkeypatch.setattr(cache.json, "dump", crash)
+        blog_cache.set_last_seen("site", "40", "2")
+        assert BlogCache(path).get_last_seen("site", "40") == "1"
+        assert [p.name for p in tmp_path.iterdir()] == ["blog_cache.json"]
+
+
+class TestGetBlogsMulti:
+    """Tests for BaseBlogScraper.get_blogs_multi."""
+
+    @staticmethod
+    def _scraper(per_member, fail_on=None):
+        scraper = SakurazakaBlogScraper(MagicMock())
+        state = {"active": 0, "peak": 0}
+
+        async def fake_get_blogs(member_id, since_date=None):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            try:
+                for i in range(per_member):
+                    await asyncio.sleep(0.001)
+                    if member_id == fail_on:
+                        raise RuntimeError("listing failed")
+                    yield BlogEntry(id=f"{member_id}-{i}", title="", content="", published_at=datetime.now(JST), url="")
+            finally:
+                state["active"] -= 1
+
+        scraper.get_blogs = fake_get_blogs
+        return scraper, state
+
+    @pytest.mark.asyncio
+    async def test_interleaves_members_with_bounded_concurrency(self):
+        scraper, state = self._scraper(per_member=3)
+        members = ["a", "b", "c", "d", "e"]
+
+        entries = [e.id async for e in scraper.get_blogs_multi(members, concurrency=2)]
+
+        assert sorted(entries) == sorted(f"{m}-{i}" for m in members for i in range(3))
+        for m in members:
+            assert [e for e in entries if e.startswith(m)] == [f"{m}-0", f"{m}-1", f"{m}-2"]
+        assert state["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_error_is_raised_and_others_cancelled(self):
+        scraper, state = self._scraper(per_member=50, fail_on="b")
+
+        with pytest.raises(RuntimeError, match="listing failed"):
+            async for _ in scraper.get_blogs_multi(["a", "b", "c"], concurrency=3):
+                pass
+        await asyncio.sleep(0)
+
+        assert state["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_no_members(self):
+        scraper, _ = self._scraper(per_member=1)
+        assert [e async for e in scraper.get_blogs_multi([])] == []
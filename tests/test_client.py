@@ -1,6 +1,7 @@
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from yarl import URL
 
 from pyhako import ApiError, Client, Group
 
@@ -26,7 +27,7 @@ async def test_fetch_json_success(client, mock_session):
     data = await client.fetch_json(mock_session, "/test")
     assert data == {"foo": "bar"}
     mock_session.get.assert_called_with(
-        "https://api.message.hinatazaka46.com/v2/test",
+        URL("https://api.message.hinatazaka46.com/v2/test"),
         headers=client.headers,
         params=None,
     )
@@ -94,17 +95,18 @@ async def test_get_groups(client, mock_session):
     mock_resp.status = 200
     mock_resp.json.return_value = [
         {"id": 1, "name": "Group1", "subscription": {"state": "active"}},
-        {"id": 2, "name": "Group2", "subscription": {"state": "expired"}}
+        {"id": 2, "name": "Group2", "subscription": {"state": "expired"}},
+        {"id": 3, "name": "Closed", "state": "closed"},
+        {"id": 4, "name": "NeverSubscribed", "subscription": None},
     ]
 
-    # Active only
+    # Active only (closed groups are always kept for graduation detection)
     groups = await client.get_groups(mock_session, include_inactive=False)
-    assert len(groups) == 1
-    assert groups[0]["id"] == 1
+    assert [g["id"] for g in groups] == [1, 3]
 
-    # All
+    # All the user ever subscribed to
     groups = await client.get_groups(mock_session, include_inactive=True)
-    assert len(groups) == 2
+    assert [g["id"] for g in groups] == [1, 2, 3]
 
 @pytest.mark.asyncio
 async def test_get_messages_pagination(client, mock_session):
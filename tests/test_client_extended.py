@@ -1,10 +1,16 @@
 """Extended tests for pyhako.client module to improve coverage."""
 
+import asyncio
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
+import orjson
 import pytest
 
 from pyhako import Client, Group, SessionExpiredError
+from pyhako.client import GROUP_CONFIG
+from pyhako.http import CONNECTOR_LIMIT_PER_HOST, RATE_LIMIT_BACKOFF, RATE_LIMIT_RETRIES
 
 
 class TestClientInitialization:
@@ -49,6 +55,15 @@ class TestClientInitialization:
         client = Client(group=Group.NOGIZAKA46)
         assert "Authorization" not in client.headers
 
+    def test_group_config_is_read_only(self):
+        """Test that the shared GROUP_CONFIG cannot be mutated through a client."""
+        client = Client(group=Group.HINATAZAKA46)
+        assert GROUP_CONFIG[Group.HINATAZAKA46]["api_host"] == "api.message.hinatazaka46.com"
+        with pytest.raises(TypeError):
+            client.config["api_base"] = "https://example.com"
+        with pytest.raises(TypeError):
+            GROUP_CONFIG[Group.YODEL] = {}
+
 
 class TestClientTokenStorage:
     """Tests for Client token storage integration."""
@@ -153,6 +168,21 @@ class TestClientSaveSession:
         # Should not raise
         client.save_session()
 
+    @pytest.mark.asyncio
+    async def test_asave_session_writes_from_worker_thread(self):
+        """Test asave_session performs the storage write off the event loop thread."""
+        mock_tm = MagicMock()
+        mock_tm.load_session.return_value = None
+        threads = []
+        mock_tm.save_session.side_effect = lambda *args: threads.append(threading.current_thread())
+
+        with patch("pyhako.client.get_token_manager", return_value=mock_tm):
+            client = Client(group=Group.NOGIZAKA46, access_token="token", use_token_storage=True)
+            await client.asave_session()
+
+        mock_tm.save_session.assert_called_once_with("nogizaka46", "token", None, None)
+        assert threads and threads[0] is not threading.main_thread()
+
 
 class TestClientFetchJson:
     """Tests for Client.fetch_json method."""
@@ -183,6 +213,7 @@ class TestClientFetchJson:
         mock_session.get.assert_called_once()
         call_kwargs = mock_session.get.call_args[1]
         assert call_kwargs["params"] == {"key": "val"}
+        mock_resp.json.assert_awaited_once_with(loads=orjson.loads)
 
     @pytest.mark.asyncio
     async def test_fetch_json_401_no_credentials(self, client, mock_session):
@@ -215,6 +246,72 @@ class TestClientFetchJson:
         result = await client.fetch_json(mock_session, "/test")
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_fetch_json_retries_after_429(self, client, mock_session):
+        """Test fetch_json waits for Retry-After (or backs off) on 429 before retrying."""
+        limited = AsyncMock()
+        limited.status = 429
+        limited.headers = {"Retry-After": "2"}
+        limited_no_header = AsyncMock()
+        limited_no_header.status = 429
+        limited_no_header.headers = {}
+        ok = AsyncMock()
+        ok.status = 200
+        ok.json = AsyncMock(return_value={"data": "value"})
+        mock_session.get.return_value.__aenter__.side_effect = [limited, limited_no_header, ok]
+
+        with patch("pyhako.client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await client.fetch_json(mock_session, "/test")
+
+        assert result == {"data": "value"}
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [2.0, RATE_LIMIT_BACKOFF * 2]
+
+    @pytest.mark.asyncio
+    async def test_fetch_json_gives_up_after_429_retries(self, client, mock_session):
+        """Test fetch_json returns None when still rate limited after RATE_LIMIT_RETRIES."""
+        mock_resp = mock_session.get.return_value.__aenter__.return_value
+        mock_resp.status = 429
+        mock_resp.headers = {"Retry-After": "0"}
+
+        with patch("pyhako.client.asyncio.sleep", new_callable=AsyncMock):
+            result = await client.fetch_json(mock_session, "/test")
+
+        assert result is None
+        assert mock_session.get.call_count == RATE_LIMIT_RETRIES + 1
+
+
+    @pytest.mark.asyncio
+    async def test_fetch_json_caps_concurrent_requests(self):
+        """Test that no more than max_concurrency GETs are in flight at once."""
+        client = Client(group=Group.NOGIZAKA46, access_token="test_token", max_concurrency=2)
+        in_flight = 0
+        peak = 0
+
+        class SlowResponse:
+            status = 200
+
+            async def __aenter__(self):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                return self
+
+            async def __aexit__(self, *exc_info):
+                nonlocal in_flight
+                in_flight -= 1
+
+            async def json(self, loads=None):
+                return {"ok": True}
+
+        session = MagicMock()
+        session.get.side_effect = lambda *args, **kwargs: SlowResponse()
+
+        results = await asyncio.gather(*(client.fetch_json(session, f"/test/{i}") for i in range(6)))
+
+        assert results == [{"ok": True}] * 6
+        assert peak == 2
+
 
 class TestClientRefreshToken:
     """Tests for Client.refresh_access_token method."""
@@ -252,6 +349,9 @@ class TestClientRefreshToken:
 
         assert result is True
         assert client.cookies["session"] == "new_cookie"
+        refresh_headers = mock_session.post.call_args.kwargs["headers"]
+        assert "Authorization" not in refresh_headers
+        assert refresh_headers["x-talk-app-id"] == client.app_id
 
     @pytest.mark.asyncio
     async def test_refresh_session_invalidated(self, client, mock_session):
@@ -320,20 +420,144 @@ class TestClientDownloadFile:
     @pytest.mark.asyncio
     async def test_download_file_creates_parent_dirs(self, client, mock_session, tmp_path):
         """Test that download creates parent directories."""
+        async def chunks(size):
+            yield b"file_content"
+
         mock_resp = mock_session.get.return_value.__aenter__.return_value
         mock_resp.status = 200
-        mock_resp.read = AsyncMock(return_value=b"file_content")
+        mock_resp.content = MagicMock()
+        mock_resp.content.iter_chunked = chunks
 
         filepath = tmp_path / "nested" / "dirs" / "file.jpg"
 
-        with patch("aiofiles.open", new_callable=MagicMock) as mock_open:
-            mock_file = AsyncMock()
-            mock_open.return_value.__aenter__.return_value = mock_file
+        result = await client.download_file(mock_session, "http://example.com/file.jpg", filepath)
+
+        assert result is True
+        assert filepath.read_bytes() == b"file_content"
+        assert not (filepath.parent / "file.jpg.part").exists()
 
+    @pytest.mark.asyncio
+    async def test_download_file_creates_each_directory_once(self, client, mock_session, tmp_path):
+        """Test that the parent directory is only created on the first download into it."""
+        async def chunks(size):
+            yield b"data"
+
+        mock_resp = mock_session.get.return_value.__aenter__.return_value
+        mock_resp.status = 200
+        mock_resp.content = MagicMock()
+        mock_resp.content.iter_chunked = chunks
+
+        target_dir = tmp_path / "picture"
+        target_dir.mkdir()
+
+        with patch("pathlib.Path.mkdir") as mock_mkdir:
+            for i in range(3):
+                assert await client.download_file(mock_session, f"http://example.com/{i}.jpg", target_dir / f"{i}.jpg")
+
+        assert mock_mkdir.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_download_file_retries_throttled_responses(self, client, mock_session, tmp_path):
+        """Test that 503/429 responses from the media host are retried with backoff."""
+        async def chunks(size):
+            yield b"data"
+
+        unavailable = AsyncMock()
+        unavailable.status = 503
+        unavailable.headers = {}
+        limited = AsyncMock()
+        limited.status = 429
+        limited.headers = {"Retry-After": "5"}
+        ok = AsyncMock()
+        ok.status = 200
+        ok.content = MagicMock()
+        ok.content.iter_chunked = chunks
+        mock_session.get.return_value.__aenter__.side_effect = [unavailable, limited, ok]
+
+        filepath = tmp_path / "file.jpg"
+        with patch("pyhako.client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
             result = await client.download_file(mock_session, "http://example.com/file.jpg", filepath)
 
-            assert result is True
-            assert filepath.parent.exists()
+        assert result is True
+        assert filepath.read_bytes() == b"data"
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [RATE_LIMIT_BACKOFF, 5.0]
+
+    @pytest.mark.asyncio
+    async def test_download_file_resumes_interrupted_download(self, client, mock_session, tmp_path):
+        """Test that a failed download keeps only a .part file, which the next attempt resumes."""
+        async def broken_chunks(size):
+            yield b"partial"
+            raise aiohttp.ClientPayloadError("connection lost")
+
+        async def rest_chunks(size):
+            yield b"_rest"
+
+        broken = AsyncMock()
+        broken.status = 200
+        broken.content = MagicMock()
+        broken.content.iter_chunked = broken_chunks
+        resumed = AsyncMock()
+        resumed.status = 206
+        resumed.headers = {"Content-Range": "bytes 7-11/12"}
+        resumed.content = MagicMock()
+        resumed.content.iter_chunked = rest_chunks
+        mock_session.get.return_value.__aenter__.side_effect = [broken, resumed]
+
+        filepath = tmp_path / "file.jpg"
+
+        assert await client.download_file(mock_session, "http://example.com/file.jpg", filepath) is False
+        assert not filepath.exists()
+        assert (tmp_path / "file.jpg.part").read_bytes() == b"partial"
+
+        assert await client.download_file(mock_session, "http://example.com/file.jpg", filepath) is True
+        assert mock_session.get.call_args.kwargs["headers"] == {"Range": "bytes=7-"}
+        assert filepath.read_bytes() == b"partial_rest"
+        assert not (tmp_path / "file.jpg.part").exists()
+
+    @pytest.mark.asyncio
+    async def test_download_file_restarts_when_range_ignored(self, client, mock_session, tmp_path):
+        """Test that a 200 reply to a Range request overwrites the stale .part file."""
+        async def chunks(size):
+            yield b"full_content"
+
+        mock_resp = mock_session.get.return_value.__aenter__.return_value
+        mock_resp.status = 200
+        mock_resp.content = MagicMock()
+        mock_resp.content.iter_chunked = chunks
+
+        filepath = tmp_path / "file.jpg"
+        (tmp_path / "file.jpg.part").write_bytes(b"stale")
+
+        assert await client.download_file(mock_session, "http://example.com/file.jpg", filepath) is True
+        assert filepath.read_bytes() == b"full_content"
+
+    @pytest.mark.asyncio
+    async def test_download_file_416_keeps_complete_part(self, client, mock_session, tmp_path):
+        """Test that a 416 for a .part already as large as the file moves it into place."""
+        mock_resp = mock_session.get.return_value.__aenter__.return_value
+        mock_resp.status = 416
+        mock_resp.headers = {"Content-Range": "bytes */12"}
+
+        filepath = tmp_path / "file.jpg"
+        (tmp_path / "file.jpg.part").write_bytes(b"full_content")
+
+        assert await client.download_file(mock_session, "http://example.com/file.jpg", filepath) is True
+        assert filepath.read_bytes() == b"full_content"
+        assert not (tmp_path / "file.jpg.part").exists()
+
+    @pytest.mark.asyncio
+    async def test_download_file_416_drops_mismatched_part(self, client, mock_session, tmp_path):
+        """Test that a 416 for a .part of the wrong size deletes it so the next attempt starts over."""
+        mock_resp = mock_session.get.return_value.__aenter__.return_value
+        mock_resp.status = 416
+        mock_resp.headers = {"Content-Range": "bytes */12"}
+
+        filepath = tmp_path / "file.jpg"
+        (tmp_path / "file.jpg.part").write_bytes(b"much_too_long_content")
+
+        assert await client.download_file(mock_session, "http://example.com/file.jpg", filepath) is False
+        assert not filepath.exists()
+        assert not (tmp_path / "file.jpg.part").exists()
 
 
 class TestClientGetMessages:
@@ -372,6 +596,78 @@ class TestClientGetMessages:
         assert len(messages) == 1
         assert messages[0]["id"] == 100
 
+    @pytest.mark.asyncio
+    async def test_get_messages_sorts_by_id_and_dedupes_pages(self, client, mock_session):
+        """Test that messages ordered by published_at come back deduped and sorted by id."""
+        mock_resp = mock_session.get.return_value.__aenter__.return_value
+        mock_resp.status = 200
+        mock_resp.json = AsyncMock(side_effect=[
+            {
+                "messages": [
+                    {"id": 200005, "published_at": "2024-01-05"},
+                    {"id": 200007, "published_at": "2024-01-04"},
+                    {"id": 200003, "published_at": "2024-01-03"},
+                ],
+                "continuation": "next",
+            },
+            {
+                "messages": [
+                    {"id": 200003, "published_at": "2024-01-03"},  # Overlaps the first page
+                    {"id": 200004, "published_at": "2024-01-02"},
+                ],
+                "continuation": None,
+            },
+        ])
+
+        messages = await client.get_messages(mock_session, group_id=1)
+
+        assert [m["id"] for m in messages] == [200003, 200004, 200005, 200007]
+
+    @pytest.mark.asyncio
+    async def test_get_messages_page_params(self, client, mock_session):
+        """Test max_id is sent on the first page only and a repeated continuation stops paging."""
+        pages = iter([
+            {"messages": [{"id": 200003}], "continuation": "c1"},
+            {"messages": [{"id": 200002}], "continuation": "c2"},
+            {"messages": [{"id": 200001}], "continuation": "c2"},
+        ])
+        sent = []
+
+        async def fake_fetch(session, endpoint, params):
+            sent.append((endpoint, dict(params)))
+            return next(pages)
+
+        client.fetch_json = fake_fetch
+
+        messages = await client.get_messages(mock_session, group_id=7, max_id=999999)
+
+        assert [m["id"] for m in messages] == [200001, 200002, 200003]
+        assert sent == [
+            ("/groups/7/timeline", {"count": 200, "order": "desc", "max_id": 999999}),
+            ("/groups/7/timeline", {"count": 200, "order": "desc", "continuation": "c1"}),
+            ("/groups/7/timeline", {"count": 200, "order": "desc", "continuation": "c2"}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_messages_paces_each_timeline_separately(self, client, mock_session, monkeypatch):
+        """Test that concurrent get_messages calls don't share one page rate bucket."""
+        import pyhako.client as client_module
+
+        limiters = []
+
+        class RecordingLimiter(client_module.RateLimiter):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                limiters.append(self)
+
+        monkeypatch.setattr(client_module, "RateLimiter", RecordingLimiter)
+        client.fetch_json = AsyncMock(return_value={"messages": [], "continuation": None})
+
+        await asyncio.gather(*(client.get_messages(mock_session, group_id=g) for g in (1, 2, 3)))
+
+        assert len(limiters) == 3
+        assert all(limiter.rate == client_module.TIMELINE_PAGE_RATE for limiter in limiters)
+
     @pytest.mark.asyncio
     async def test_get_messages_with_progress_callback(self, client, mock_session):
         """Test that progress callback is called."""
@@ -446,3 +742,33 @@ class TestClientGetNews:
 
         call_kwargs = mock_session.get.call_args[1]
         assert call_kwargs["params"]["count"] == 50
+
+
+class TestClientOwnSession:
+    """Tests for the session Client creates when none is passed in."""
+
+    @pytest.mark.asyncio
+    async def test_session_created_once_and_closed(self):
+        """Test that the own session is pooled, reused and closed by the context manager."""
+        async with Client(group=Group.NOGIZAKA46) as client:
+            session = client.session
+            assert session is client.session
+            assert session.connector.limit_per_host == CONNECTOR_LIMIT_PER_HOST
+            assert session.timeout.total is None
+        assert session.closed
+        assert client._session is None
+
+    @pytest.mark.asyncio
+    async def test_none_session_uses_own_session(self):
+        """Test that passing session=None routes the request through the client's session."""
+        client = Client(group=Group.NOGIZAKA46, access_token="test")
+        own = MagicMock()
+        mock_resp = AsyncMock()
+        mock_resp.status = 200
+        mock_resp.json = AsyncMock(return_value={"ok": True})
+        own.get.return_value.__aenter__.return_value = mock_resp
+        own.closed = False
+        client._session = own
+
+        assert await client.fetch_json(None, "/profile") == {"ok": True}
+        own.get.assert_called_once()
@@ -1,6 +1,7 @@
 import asyncio
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import urlparse
 
 import pytest
 from aiohttp import ClientError
@@ -14,28 +15,34 @@ from pyhako.credentials import KeyringStore, TokenManager
 @pytest.mark.asyncio
 async def test_client_download_file_success(client, mock_session):
     """Test file download with aiofiles mocking."""
+    async def chunks(size):
+        yield b"file_"
+        yield b"content"
+
     mock_resp = mock_session.get.return_value.__aenter__.return_value
     mock_resp.status = 200
-    mock_resp.read = AsyncMock(return_value=b"file_content")
+    mock_resp.content.iter_chunked = chunks
 
     # Needs a Path object
     dest = Path("/tmp/file.jpg")
 
     with patch("aiofiles.open", new_callable=MagicMock) as mock_file_open_ctx, \
          patch("pathlib.Path.exists", return_value=False), \
-         patch("pathlib.Path.mkdir"): # Mock mkdir to avoid file ops
+         patch("pathlib.Path.mkdir"), \
+         patch("pyhako.client.os.replace") as mock_replace: # Mock file ops
 
         # aiofiles.open returns an AsyncContextManager
         # So calling it returns a context manager whose __aenter__ returns the file handle
         mock_file_handle = AsyncMock()
         mock_file_open_ctx.return_value.__aenter__.return_value = mock_file_handle
 
-        await client.download_file(mock_session, "http://example.com/file.jpg", dest)
+        assert await client.download_file(mock_session, "http://example.com/file.jpg", dest) is True
 
-        # We can't assert_called_with on the ContextManager easily if it's async?
-        # Actually aiofiles.open(...) returns the CM.
-        mock_file_open_ctx.assert_called_with(dest, "wb")
-        mock_file_handle.write.assert_called_with(b"file_content")
+        # Chunks go to a .part file that is then moved over the destination
+        part = Path("/tmp/file.jpg.part")
+        mock_file_open_ctx.assert_called_with(part, "wb")
+        assert [c.args[0] for c in mock_file_handle.write.call_args_list] == [b"file_", b"content"]
+        mock_replace.assert_called_once_with(part, dest)
 
 @pytest.mark.asyncio
 async def test_client_download_message_media(client, mock_session):
@@ -52,6 +59,90 @@ async def test_client_download_message_media(client, mock_session):
         assert path == output / "picture" / "100.jpg"
         client.download_file.assert_called()
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("raw_type,subdir", [("movie", "video"), ("voice", "voice"), ("text", None)])
+async def test_client_download_message_media_type_dirs(client, mock_session, raw_type, subdir):
+    """Test message types map to their media subdirectory and text is skipped."""
+    msg = {"id": 100, "type": raw_type, "file": "http://media.mp4"}
+    output = Path("/tmp/out")
+
+    client.download_file = AsyncMock(return_value=True)
+
+    with patch("pyhako.client.get_media_extension", return_value="mp4"):
+        path = await client.download_message_media(mock_session, msg, output)
+
+    if subdir is None:
+        assert path is None
+        client.download_file.assert_not_called()
+    else:
+        assert path == output / subdir / "100.mp4"
+
+
+@pytest.mark.asyncio
+async def test_client_download_messages_media_bounded(client, mock_session):
+    """Bulk download keeps input order and never exceeds the concurrency cap."""
+    messages = [{"id": i, "type": "image", "file": f"http://img/{i}.jpg"} for i in range(40)]
+    in_flight = 0
+    peak = 0
+
+    async def fake_download(session, message, output_dir):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return Path(f"/tmp/out/{message['id']}.jpg")
+
+    client.download_message_media = fake_download
+    results = await client.download_messages_media(mock_session, messages, Path("/tmp/out"), concurrency=8)
+
+    assert results == [Path(f"/tmp/out/{i}.jpg") for i in range(40)]
+    # Grew past the initial window, never past the cap (end game included)
+    assert 4 < peak <= 8
+
+
+@pytest.mark.asyncio
+async def test_client_download_messages_media_end_game_respects_cap(client, mock_session):
+    """The end game never starts more downloads than the concurrency cap."""
+    messages = [{"id": i, "type": "image", "file": f"http://img/{i}.jpg"} for i in range(6)]
+    in_flight = 0
+    peak = 0
+
+    async def fake_download(session, message, output_dir):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Path(f"/tmp/out/{message['id']}.jpg")
+
+    client.download_message_media = fake_download
+    await client.download_messages_media(mock_session, messages, Path("/tmp/out"), concurrency=2)
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_client_download_messages_media_failures_hold_window(client, mock_session):
+    """Failed downloads keep the window at its starting size."""
+    messages = [{"id": i, "type": "image", "file": f"http://img/{i}.jpg"} for i in range(30)]
+    in_flight = 0
+    peak = 0
+
+    async def fake_download(session, message, output_dir):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return None
+
+    client.download_message_media = fake_download
+    results = await client.download_messages_media(mock_session, messages, Path("/tmp/out"))
+
+    assert results == [None] * 30
+    assert peak <= 8  # initial window of 4 plus at most 4 end-game releases, under the cap of 16
+
 
 # ... (existing tests)
 
@@ -150,7 +241,7 @@ def test_token_manager_keyring_fallback():
 
 
 @pytest.mark.asyncio
-async def test_login_successful_flow_with_handler():
+async def test_login_successful_flow_with_handler(header_value):
     """Test a successful login interception via Playwright mock with response handler."""
     with patch("pyhako.auth.async_playwright") as mock_pw:
         # 1. Setup Mock Hierarchy with AsyncMocks
@@ -168,11 +259,18 @@ async def test_login_successful_flow_with_handler():
 
         # add_init_script must be awaitable
         mock_context.add_init_script = AsyncMock()
-        # Mock cookies with a 'session' cookie for the target domain
-        mock_context.cookies = AsyncMock(return_value=[
+        # Mock cookies with a 'session' cookie for the target domain.
+        # Like the browser, only return cookies that apply to the requested URLs.
+        all_cookies = [
             {'name': 'session', 'value': 'sess_val', 'domain': 'message.nogizaka46.com'},
             {'name': 'tracking', 'value': 'ignored', 'domain': 'google.com'}
-        ])
+        ]
+
+        async def scoped_cookies(urls=None):
+            hosts = [urlparse(u).hostname for u in urls]
+            return [c for c in all_cookies if any(h.endswith(c['domain']) for h in hosts)]
+
+        mock_context.cookies = AsyncMock(side_effect=scoped_cookies)
         mock_context.close = AsyncMock()
 
         mock_page = AsyncMock()
@@ -180,6 +278,7 @@ async def test_login_successful_flow_with_handler():
 
         mock_page.goto = AsyncMock()
         mock_page.close = AsyncMock()
+        mock_page.remove_listener = MagicMock()
 
         # 2. Start login in background task
         login_task = asyncio.create_task(BrowserAuth.login(Group.NOGIZAKA46))
@@ -201,6 +300,7 @@ async def test_login_successful_flow_with_handler():
             "x-talk-app-id": "app_id",
             "user-agent": "ua"
         }
+        mock_request.header_value = header_value(mock_request.headers)
 
         mock_response = AsyncMock()
         mock_response.status = 200
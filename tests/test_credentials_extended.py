@@ -1,10 +1,14 @@
 """Extended tests for pyhako.credentials module to improve coverage."""
 
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from pyhako.credentials import (
+    COMPRESSION_MIN_SIZE,
+    CREDENTIAL_CACHE_TTL,
+    ZSTD_PREFIX,
     KeyringStore,
     TokenManager,
     _compress_data,
@@ -12,6 +16,7 @@ from pyhako.credentials import (
     get_auth_dir,
     get_user_data_dir,
     is_windows,
+    reset_keyring_cache,
 )
 from pyhako.exceptions import HakoError
 
@@ -34,6 +39,27 @@ class TestCompressionFunctions:
         # Compressed should be shorter for repetitive data
         assert len(compressed) < len(original)
 
+    def test_compress_stores_short_json_as_is(self):
+        """Test that payloads under COMPRESSION_MIN_SIZE skip compression and still round-trip."""
+        short = '{"access_token": "secret123"}'
+        assert _compress_data(short) == short
+        assert _decompress_data(_compress_data(short)) == short
+
+        long = '{"access_token": "' + "x" * COMPRESSION_MIN_SIZE + '"}'
+        assert _compress_data(long) != long
+        assert _decompress_data(_compress_data(long)) == long
+
+    def test_decompress_reads_legacy_zlib_data(self):
+        """Test that credentials written by older zlib-based releases still load."""
+        import base64
+        import zlib
+
+        original = '{"access_token": "' + "z" * COMPRESSION_MIN_SIZE + '"}'
+        legacy = base64.b64encode(zlib.compress(original.encode("utf-8"), level=9)).decode("ascii")
+
+        assert _compress_data(original).startswith(ZSTD_PREFIX)
+        assert _decompress_data(legacy) == original
+
     def test_decompress_handles_uncompressed_data(self):
         """Test that decompress falls back to returning data as-is if not compressed."""
         raw_json = '{"token": "value"}'
@@ -140,6 +166,31 @@ class TestKeyringStore:
             store = KeyringStore()
             assert store._keyring is not None
 
+    def test_keyring_store_probes_backend_once(self):
+        """Test that later KeyringStores reuse the first store's probe result."""
+        with patch("keyring.set_password") as mock_set, \
+             patch("keyring.delete_password"):
+            first = KeyringStore()
+            second = KeyringStore()
+
+            assert mock_set.call_count == 1
+            assert first._keyring is second._keyring
+
+            reset_keyring_cache()
+            KeyringStore()
+            assert mock_set.call_count == 2
+
+    def test_keyring_store_remembers_failed_probe(self):
+        """Test that a broken backend is not probed again on the next construction."""
+        with patch("keyring.set_password", side_effect=Exception("broken")) as mock_set, \
+             patch("keyring.delete_password"), \
+             patch.dict("sys.modules", {"keyrings.alt.file": None}):
+            with pytest.raises(Exception, match="broken"):
+                KeyringStore()
+            with pytest.raises(HakoError, match="unavailable"):
+                KeyringStore()
+            assert mock_set.call_count == 1
+
     def test_keyring_store_init_fallback_to_plaintext(self):
         """Test fallback to PlaintextKeyring when default fails."""
         call_count = {"set": 0}
@@ -176,7 +227,8 @@ class TestKeyringStore:
              patch("keyring.delete_password"):
             store = KeyringStore()
 
-            token_data = {"access_token": "test", "cookies": {"s": "v"}}
+            # Realistically sized (JWT + session cookie) payloads get compressed
+            token_data = {"access_token": "t" * COMPRESSION_MIN_SIZE, "cookies": {"s": "v"}}
             store.save("group1", token_data)
 
             # Data should be compressed (base64 encoded)
@@ -186,6 +238,25 @@ class TestKeyringStore:
             raw_json = json.dumps(token_data)
             assert stored_data["group1"] != raw_json
 
+    def test_keyring_store_save_many_serializes_before_writing(self):
+        """Test that save_many writes nothing if any entry fails to serialize."""
+        stored_data = {}
+
+        def mock_set(service, key, val):
+            stored_data[key] = val
+
+        with patch("keyring.set_password", side_effect=mock_set), \
+             patch("keyring.delete_password"):
+            store = KeyringStore()
+            stored_data.clear()
+
+            with pytest.raises(HakoError):
+                store.save_many({"group1": {"access_token": "a"}, "group2": {"bad": object()}})
+            assert stored_data == {}
+
+            store.save_many({"group1": {"access_token": "a"}, "group2": {"access_token": "b"}})
+            assert set(stored_data) == {"group1", "group2"}
+
     def test_keyring_store_load_decompresses_data(self):
         """Test that load decompresses data."""
         import json
@@ -200,6 +271,47 @@ class TestKeyringStore:
 
             assert result["access_token"] == "test123"
 
+    def test_keyring_store_load_caches_decoded_data(self):
+        """Test that repeat loads skip the keyring until a delete or the TTL expires."""
+        import json
+        compressed = _compress_data(json.dumps({"access_token": "test123", "cookies": {"s": "v"}}))
+
+        with patch("keyring.set_password"), \
+             patch("keyring.delete_password"), \
+             patch("keyring.get_password", return_value=compressed) as mock_get:
+            store = KeyringStore()
+            first = store.load("group1")
+            first["cookies"]["s"] = "mutated"
+            second = store.load("group1")
+
+            assert mock_get.call_count == 1
+            assert second["cookies"]["s"] == "v"
+
+            store.delete("group1")
+            store.load("group1")
+            assert mock_get.call_count == 2
+
+            # fresh=True always asks the backend (and refreshes the cached copy)
+            store.load("group1", fresh=True)
+            assert mock_get.call_count == 3
+            store.load("group1")
+            assert mock_get.call_count == 3
+
+            with patch("pyhako.credentials.time.monotonic", return_value=time.monotonic() + CREDENTIAL_CACHE_TTL + 1):
+                store.load("group1")
+            assert mock_get.call_count == 4
+
+    def test_keyring_store_save_updates_cache(self):
+        """Test that a saved session is served from memory on the next load."""
+        with patch("keyring.set_password"), \
+             patch("keyring.delete_password"), \
+             patch("keyring.get_password") as mock_get:
+            store = KeyringStore()
+            store.save("group1", {"access_token": "fresh"})
+
+            assert store.load("group1") == {"access_token": "fresh"}
+            mock_get.assert_not_called()
+
     def test_keyring_store_load_returns_none_on_error(self):
         """Test that load returns None if get_password fails."""
         with patch("keyring.set_password"), \
@@ -254,6 +366,23 @@ class TestTokenManager:
             assert call_args[1]["refresh_token"] == "refresh"
             assert call_args[1]["cookies"] == {"c": "v"}
 
+    def test_token_manager_save_sessions(self):
+        """Test save_sessions batches all groups into one store call."""
+        mock_store = MagicMock()
+
+        with patch("pyhako.credentials.KeyringStore", return_value=mock_store):
+            tm = TokenManager()
+            tm.save_sessions([
+                ("group1", "token1", None, {"c": "1"}),
+                ("group2", "token2", "refresh2", None),
+            ])
+            tm.save_sessions([])
+
+            mock_store.save_many.assert_called_once()
+            entries = mock_store.save_many.call_args[0][0]
+            assert entries["group1"] == {"access_token": "token1", "refresh_token": None, "cookies": {"c": "1"}}
+            assert entries["group2"]["refresh_token"] == "refresh2"
+
     def test_token_manager_load_session(self):
         """Test load_session method."""
         mock_store = MagicMock()
@@ -264,7 +393,7 @@ class TestTokenManager:
             result = tm.load_session("group1")
 
             assert result["access_token"] == "loaded"
-            mock_store.load.assert_called_once_with("group1")
+            mock_store.load.assert_called_once_with("group1", fresh=False)
 
     def test_token_manager_delete_session(self):
         """Test delete_session method."""
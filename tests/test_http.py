@@ -0,0 +1,76 @@
+"""Tests for pyhako.http shared session helpers."""
+
+import pytest
+
+from pyhako import close_sessions, get_session
+from pyhako.http import CONNECTOR_LIMIT_PER_HOST, create_connector
+
+
+@pytest.mark.asyncio
+async def test_get_session_reuses_per_host():
+    try:
+        a = await get_session("https://api.message.hinatazaka46.com/v2")
+        b = await get_session("https://api.message.hinatazaka46.com/v2/groups")
+        c = await get_session("https://www.hinatazaka46.com/s/official/")
+
+        assert a is b
+        assert a is not c
+        assert not a.closed
+    finally:
+        await close_sessions()
+
+    assert a.closed and c.closed
+
+
+@pytest.mark.asyncio
+async def test_get_session_replaces_closed_session():
+    try:
+        first = await get_session("https://example.com")
+        await first.close()
+
+        second = await get_session("https://example.com")
+        assert second is not first
+        assert not second.closed
+    finally:
+        await close_sessions()
+
+
+@pytest.mark.asyncio
+async def test_create_connector_overrides():
+    tuned = create_connector(limit_per_host=4)
+    default = create_connector()
+    try:
+        assert tuned.limit_per_host == 4
+        assert default.limit_per_host == CONNECTOR_LIMIT_PER_HOST
+    finally:
+        await tuned.close()
+        await default.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_burst_then_paces(monkeypatch):
+    from pyhako import http
+
+    clock = [100.0]
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        clock[0] += delay
+
+    monkeypatch.setattr(http.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(http.asyncio, "sleep", fake_sleep)
+
+    limiter = http.RateLimiter(4, period=1.0)
+    for _ in range(4):
+        async with limiter:
+            pass
+    assert sleeps == []
+
+    await limiter.acquire()
+    assert sleeps == [pytest.approx(0.25)]
+
+    # Idle time refills the bucket, so no wait after a pause
+    clock[0] += 10
+    await limiter.acquire()
+    assert len(sleeps) == 1
@@ -4,6 +4,8 @@ import logging
 import os
 from unittest.mock import patch
 
+import structlog
+
 from pyhako.logging import _redact_secrets, configure_logging
 
 
@@ -79,6 +81,19 @@ class TestConfigureLogging:
         root.handlers = original_handlers
 
 
+    def test_configure_logging_filters_by_level_first(self):
+        """Test that records below the logger level are dropped before redaction runs."""
+        root = logging.getLogger()
+        original_handlers = list(root.handlers)
+
+        configure_logging()
+        processors = structlog.get_config()["processors"]
+
+        assert processors[0] is structlog.stdlib.filter_by_level
+        assert processors.index(structlog.stdlib.filter_by_level) < processors.index(_redact_secrets)
+
+        root.handlers = original_handlers
+
 class TestRedactSecrets:
     """Tests for _redact_secrets processor."""
 
@@ -174,3 +189,12 @@ class TestRedactSecrets:
         result = _redact_secrets(None, "info", event_dict)
         assert result["items"] == ["a", "b", "c"]
         assert result["count"] == 42
+
+    def test_redact_sensitive_key_holding_dict(self):
+        """Test that a sensitive key is replaced whole rather than descended into."""
+        event_dict = {"cookies": {"session": "abc"}, "params": {"Secret": "x", "page": 2}}
+
+        result = _redact_secrets(None, "info", event_dict)
+
+        assert result["cookies"] == "***REDACTED***"
+        assert result["params"] == {"Secret": "***REDACTED***", "page": 2}
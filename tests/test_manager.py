@@ -1,8 +1,9 @@
 
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 
 from pyhako.client import Client, Group
@@ -34,6 +35,25 @@ async def test_load_save_sync_state(sync_manager):
     new_manager = SyncManager(sync_manager.client, sync_manager.output_dir)
     assert new_manager.sync_state["test_key"]["data"] == 123
 
+def test_batch_state_updates_saves_once(sync_manager, monkeypatch):
+    saves = []
+    real_save = sync_manager.save_sync_state
+    monkeypatch.setattr(sync_manager, "save_sync_state", lambda: saves.append(1) or real_save())
+
+    with sync_manager.batch_state_updates():
+        for member_id in range(5):
+            sync_manager.update_sync_state(1, member_id, 100 + member_id, 1)
+        assert saves == []
+        assert not sync_manager.state_file.exists()
+
+    assert saves == [1]
+    reloaded = SyncManager(sync_manager.client, sync_manager.output_dir)
+    assert reloaded.get_last_id(1, 4) == 104
+
+    # Nothing changed since, so flushing again does not rewrite the file
+    sync_manager.flush()
+    assert saves == [1]
+
 @pytest.mark.asyncio
 async def test_update_sync_state(sync_manager):
     sync_manager.update_sync_state(1, 100, 500, 10)
@@ -91,6 +111,90 @@ async def test_sync_member_flow(sync_manager):
         assert data['messages'][0]['content'] == 'Hello'
         assert data['messages'][1]['type'] == 'picture'
 
+@pytest.mark.asyncio
+async def test_sync_member_skips_rewrite_when_unchanged(sync_manager):
+    group = {'id': 1, 'name': 'Grp'}
+    member = {'id': 10, 'name': 'Mem'}
+    sync_manager.client.get_messages.return_value = [
+        {'id': 101, 'type': 'text', 'text': 'Hello', 'member_id': 10, 'published_at': '2023-01-01T10:00:00Z'},
+    ]
+    json_path = sync_manager.output_dir / "messages" / "1 Grp" / "10 Mem" / "messages.json"
+
+    await sync_manager.sync_member(AsyncMock(), group, member, [])
+    first = json_path.read_bytes()
+
+    # Same page again (overlapping since_id): file is left alone
+    await sync_manager.sync_member(AsyncMock(), group, member, [])
+    assert json_path.read_bytes() == first
+
+    sync_manager.client.get_messages.return_value.append(
+        {'id': 102, 'type': 'text', 'text': 'Bye', 'member_id': 10, 'published_at': '2023-01-01T11:00:00Z'}
+    )
+    assert await sync_manager.sync_member(AsyncMock(), group, member, []) == 2
+    data = json.loads(json_path.read_text(encoding='utf-8'))
+    assert [m['id'] for m in data['messages']] == [101, 102]
+    assert data['total_messages'] == 2
+
+@pytest.mark.asyncio
+async def test_sync_member_upserts_into_sorted_history(sync_manager):
+    group = {'id': 1, 'name': 'Grp'}
+    member = {'id': 10, 'name': 'Mem'}
+    sync_manager.client.get_messages.return_value = [
+        {'id': 1, 'type': 'text', 'text': 'a', 'member_id': 10, 'published_at': '2023-01-01T10:00:00Z'},
+        {'id': 3, 'type': 'text', 'text': 'c', 'member_id': 10, 'published_at': '2023-01-03T10:00:00Z'},
+    ]
+    await sync_manager.sync_member(AsyncMock(), group, member, [])
+
+    # An edited old message plus one that arrives late with an earlier timestamp
+    sync_manager.client.get_messages.return_value = [
+        {'id': 1, 'type': 'text', 'text': 'a (edited)', 'member_id': 10, 'published_at': '2023-01-01T10:00:00Z'},
+        {'id': 2, 'type': 'text', 'text': 'b', 'member_id': 10, 'published_at': '2023-01-02T10:00:00Z'},
+    ]
+    await sync_manager.sync_member(AsyncMock(), group, member, [])
+
+    json_path = sync_manager.output_dir / "messages" / "1 Grp" / "10 Mem" / "messages.json"
+    data = json.loads(json_path.read_text(encoding='utf-8'))
+    assert [m['id'] for m in data['messages']] == [1, 2, 3]
+    assert data['messages'][0]['content'] == 'a (edited)'
+    assert data['total_messages'] == 3
+
+@pytest.mark.asyncio
+async def test_sync_member_scans_only_overlapping_history(sync_manager):
+    group = {'id': 1, 'name': 'Grp'}
+    member = {'id': 10, 'name': 'Mem'}
+    sync_manager.client.get_messages.return_value = [
+        {'id': i, 'type': 'text', 'text': str(i), 'member_id': 10, 'published_at': f'2023-01-{i:02d}T10:00:00Z'}
+        for i in range(1, 21)
+    ]
+    await sync_manager.sync_member(AsyncMock(), group, member, [])
+
+    class CountingList(list):
+        reads = 0
+
+        def __getitem__(self, index):
+            CountingList.reads += 1
+            return super().__getitem__(index)
+
+    real_loads = orjson.loads
+
+    def loads(data):
+        parsed = real_loads(data)
+        if isinstance(parsed, dict) and 'messages' in parsed:
+            parsed['messages'] = CountingList(parsed['messages'])
+        return parsed
+
+    sync_manager.client.get_messages.return_value = [
+        {'id': 21, 'type': 'text', 'text': 'new', 'member_id': 10, 'published_at': '2023-01-21T10:00:00Z'},
+    ]
+    with patch("pyhako.manager.orjson.loads", loads):
+        await sync_manager.sync_member(AsyncMock(), group, member, [])
+
+    # Only the newest stored message is looked at before the scan stops
+    assert CountingList.reads <= 3
+    json_path = sync_manager.output_dir / "messages" / "1 Grp" / "10 Mem" / "messages.json"
+    data = json.loads(json_path.read_text(encoding='utf-8'))
+    assert [m['id'] for m in data['messages']] == list(range(1, 22))
+
 @pytest.mark.asyncio
 async def test_process_media_queue(sync_manager):
     session = AsyncMock()
@@ -105,3 +209,47 @@ async def test_process_media_queue(sync_manager):
 
     assert sync_manager.client.download_file.call_count == 2
     assert callback.call_count == 2
+
+@pytest.mark.asyncio
+async def test_update_message_metadata_keeps_utf8_json(sync_manager, tmp_path):
+    messages_file = tmp_path / "messages.json"
+    messages_file.write_text(
+        json.dumps({"messages": [{"id": 1, "content": "おはよう"}, {"id": 2}]}, ensure_ascii=False),
+        encoding='utf-8',
+    )
+
+    await sync_manager.update_message_metadata(messages_file, {1: {"width": 640, "height": None}})
+
+    text = messages_file.read_text(encoding='utf-8')
+    assert "おはよう" in text
+    assert "\n" not in text
+    data = json.loads(text)
+    assert data["messages"][0] == {"id": 1, "content": "おはよう", "width": 640}
+
+def test_pretty_json_indents_sync_state(sync_manager, tmp_path):
+    manager = SyncManager(sync_manager.client, tmp_path, pretty_json=True)
+    manager.sync_state = {"1_10": {"last_message_id": 5}}
+    manager.save_sync_state()
+
+    assert '\n  "1_10": {' in manager.state_file.read_text(encoding='utf-8')
+
+def test_prepare_messages_lists_media_dirs_once(sync_manager, tmp_path, monkeypatch):
+    member_dir = tmp_path / "member"
+    (member_dir / "picture").mkdir(parents=True)
+    (member_dir / "picture" / "1.jpg").write_bytes(b"")
+    messages = [
+        {'id': i, 'type': 'image', 'file': f'http://img/{i}.jpg', 'published_at': '2023-01-01T10:00:00Z'}
+        for i in (1, 2, 3)
+    ]
+
+    def no_stat(self):
+        raise AssertionError("prepare_messages should not stat media files")
+
+    monkeypatch.setattr(Path, "exists", no_stat)
+    monkeypatch.setattr("pyhako.manager.get_media_dimensions", lambda path, mtype: (640, 480))
+    queue = []
+    processed = sync_manager.prepare_messages(messages, member_dir, queue)
+
+    assert [item['message_id'] for item in queue] == [2, 3]
+    assert processed[0]['width'] == 640
+    assert 'width' not in processed[1]